@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Backtest every alert in alerts.json against historical data."""
+
+import argparse
+from pathlib import Path
+
+from stotify.backtest import backtest_alerts
+from stotify.main import load_config
+
+ALERTS_FILE = Path(__file__).parent.parent / "alerts.json"
+
+
+def main() -> None:
+    """Run each alert's strategy over history and print summary metrics."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("config", nargs="?", default=str(ALERTS_FILE))
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--exit-mode", choices=["fixed", "cross"], default="cross")
+    parser.add_argument("--hold-days", type=int, default=30)
+    args = parser.parse_args()
+
+    results = backtest_alerts(
+        load_config(args.config),
+        start=args.start,
+        end=args.end,
+        interval=args.interval,
+        exit_mode=args.exit_mode,
+        hold_days=args.hold_days,
+        period=args.period,
+    )
+    for item in results:
+        metrics = item.result.metrics
+        print(
+            "- "
+            f"group={item.group_name} "
+            f"ticker={item.ticker} "
+            f"strategy={item.strategy} "
+            f"params={item.params} "
+            f"trades={int(metrics.get('total_trades', 0))} "
+            f"total_return={metrics.get('total_return', 0):.2f}% "
+            f"max_drawdown={metrics.get('max_drawdown', 0):.2f}% "
+            f"sharpe={metrics.get('sharpe', 0):.2f} "
+            f"buy_hold={metrics.get('buy_hold_return', 0):.2f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""List moving average crossovers for a ticker from the persistent signal index."""
+
+import argparse
+from pathlib import Path
+
+from stotify.signal_index import CrossoverIndex
+from stotify.stock import get_history
+
+INDEX_FILE = Path(__file__).parent.parent / ".stotify" / "crossovers.json"
+
+
+def main() -> None:
+    """Update the index with the latest history and print crossovers in range."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("ticker")
+    parser.add_argument("--fast", type=int, default=50)
+    parser.add_argument("--slow", type=int, default=200)
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--period", default="max")
+    parser.add_argument("--since", default=None)
+    parser.add_argument("--until", default=None)
+    parser.add_argument("--index", default=str(INDEX_FILE))
+    args = parser.parse_args()
+
+    index = CrossoverIndex(args.index)
+    history = get_history(args.ticker, period=args.period, interval=args.interval)
+    if history is not None:
+        index.update(args.ticker, history, args.fast, args.slow, args.interval)
+        index.save()
+
+    events = index.crossovers(
+        args.ticker,
+        args.fast,
+        args.slow,
+        args.interval,
+        start=args.since,
+        end=args.until,
+    )
+    for event in events.itertuples():
+        print(f"- {event.timestamp.isoformat()} {event.direction}")
+    print(f"{len(events)} crossover(s)")
+
+
+if __name__ == "__main__":
+    main()
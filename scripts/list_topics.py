@@ -4,8 +4,8 @@
 import json
 from pathlib import Path
 
-from stotify.main import extract_tickers
 from stotify.notifier import get_channel
+from stotify.validation import extract_tickers
 
 ALERTS_FILE = Path(__file__).parent.parent / "alerts.json"
 
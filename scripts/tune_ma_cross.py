@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Tune ma_cross alert windows in alerts.json with walk-forward optimization."""
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+
+from stotify.backtest import walk_forward_ma_cross
+from stotify.validation import extract_tickers
+
+ALERTS_FILE = Path(__file__).parent.parent / "alerts.json"
+
+
+def parse_windows(value: str) -> list[int]:
+    """Parse a comma-separated list of window lengths."""
+    return [int(part) for part in value.split(",") if part]
+
+
+def main() -> None:
+    """Walk-forward every ma_cross alert and report (or write) the best windows."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("config", nargs="?", default=str(ALERTS_FILE))
+    parser.add_argument("--fast", type=parse_windows, default="10,20,50")
+    parser.add_argument("--slow", type=parse_windows, default="50,100,150,200")
+    parser.add_argument("--train-bars", type=int, default=504)
+    parser.add_argument("--test-bars", type=int, default=126)
+    parser.add_argument("--objective", default="sharpe")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--write",
+        action="store_true",
+        help="Update the alert params in place with the recommended windows",
+    )
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        data = json.load(f)
+
+    changed = False
+    for group_name, alerts in data["groups"].items():
+        for alert in alerts:
+            if alert.get("strategy") != "ma_cross":
+                continue
+            picks: Counter[tuple[int, int]] = Counter()
+            for ticker in extract_tickers(alert, group_name):
+                result = walk_forward_ma_cross(
+                    ticker,
+                    fast_windows=args.fast,
+                    slow_windows=args.slow,
+                    train_bars=args.train_bars,
+                    test_bars=args.test_bars,
+                    objective=args.objective,
+                    workers=args.workers,
+                )
+                if result.best_params is None:
+                    print(f"- group={group_name} ticker={ticker} no data")
+                    continue
+                picks[result.best_params] += 1
+                fast, slow = result.best_params
+                print(
+                    "- "
+                    f"group={group_name} "
+                    f"ticker={ticker} "
+                    f"best={fast}/{slow} "
+                    f"oos_return={result.metrics.get('total_return', 0):.2f}% "
+                    f"oos_sharpe={result.metrics.get('sharpe', 0):.2f} "
+                    f"folds={len(result.folds)}"
+                )
+            if args.write and picks:
+                fast, slow = picks.most_common(1)[0][0]
+                params = alert["params"]
+                if (params["fast_window"], params["slow_window"]) != (fast, slow):
+                    params["fast_window"] = fast
+                    params["slow_window"] = slow
+                    changed = True
+
+    if changed:
+        with open(args.config, "w") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        print(f"Updated {args.config}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,21 @@
 from __future__ import annotations
 
 import datetime as dt
+import tempfile
+from pathlib import Path
 
 import altair as alt
 import pandas as pd
 import streamlit as st
 
-from stotify.backtest import backtest_ma_cross
+from stotify.backtest import backtest_ma_cross, backtest_ma_cross_many
+from stotify.downsample import downsample
+from stotify.profiling import MODES as PROFILE_MODES
+
+# Roughly the pixel width of a wide-layout chart.
+CHART_POINTS = 1200
+OVERVIEW_POINTS = 400
+SPARKLINE_POINTS = 60
 
 
 def _trade_table(trades):
@@ -29,6 +38,214 @@ def _trade_table(trades):
     )
 
 
+def _series_data(frame, labels):
+    """Melt a wide frame of lines into the long Date/Series/Value layout."""
+    return (
+        frame[list(labels)]
+        .rename(columns=labels)
+        .rename_axis("Date")
+        .reset_index()
+        .melt(id_vars="Date", var_name="Series", value_name="Value")
+        .dropna()
+    )
+
+
+def _zoom_bounds(event, index):
+    """Return the (start, end) dates brushed on the overview chart, if any."""
+    selected = event.selection.get("zoom", {}).get("Date") if event else None
+    if not selected or len(selected) != 2:
+        return None
+    bounds = []
+    for value in selected:
+        if isinstance(value, int | float):
+            value = pd.Timestamp(value, unit="ms", tz="UTC")
+        else:
+            value = pd.Timestamp(value)
+        if index.tz is None:
+            value = value.tz_localize(None) if value.tzinfo else value
+        elif value.tzinfo is None:
+            value = value.tz_localize(index.tz)
+        bounds.append(value)
+    return min(bounds), max(bounds)
+
+
+def _render_result(result, fast_window, slow_window, key="single"):
+    """Show the price/MA chart, summary metrics, equity curve and trades.
+
+    Lines are downsampled to about the chart width with LTTB, keeping every
+    trade entry and exit. Brushing the overview below the chart zooms the
+    main chart, which is re-sampled from the full-resolution history.
+    """
+    history = result.history
+    price_label = "Price"
+    fast_label = f"{fast_window}-day MA"
+    slow_label = f"{slow_window}-day MA"
+    labels = {"Close": price_label, "fast_ma": fast_label, "slow_ma": slow_label}
+
+    entries = [
+        {"Date": trade.entry_date, "Price": trade.entry_price, "Type": "Entry"}
+        for trade in result.trades
+    ]
+    exits = [
+        {"Date": trade.exit_date, "Price": trade.exit_price, "Type": "Exit"}
+        for trade in result.trades
+    ]
+    markers = pd.DataFrame(entries + exits, columns=["Date", "Price", "Type"])
+
+    st.subheader("Price with Moving Averages")
+    detail = st.empty()
+    zoom = alt.selection_interval(encodings=["x"], name="zoom")
+    overview = downsample(history, OVERVIEW_POINTS, column="Close")
+    overview_chart = (
+        alt.Chart(_series_data(overview, {"Close": ""}))
+        .mark_area(opacity=0.3, line=True)
+        .encode(
+            x=alt.X("Date:T", title=None),
+            y=alt.Y("Value:Q", title=None, axis=None),
+        )
+        .properties(height=60)
+        .add_params(zoom)
+    )
+    event = st.altair_chart(
+        overview_chart,
+        use_container_width=True,
+        on_select="rerun",
+        key=f"zoom-{key}",
+    )
+
+    bounds = _zoom_bounds(event, history.index)
+    window = history
+    if bounds is not None and not history.loc[bounds[0] : bounds[1]].empty:
+        window = history.loc[bounds[0] : bounds[1]]
+        markers = markers[
+            (markers["Date"] >= window.index[0])
+            & (markers["Date"] <= window.index[-1])
+        ]
+    sampled = downsample(window, CHART_POINTS, column="Close", keep=markers["Date"])
+    series_data = _series_data(sampled, labels)
+
+    line_chart = (
+        alt.Chart(series_data)
+        .mark_line(strokeWidth=2)
+        .encode(
+            x=alt.X("Date:T", title="Date"),
+            y=alt.Y("Value:Q", title="Price", scale=alt.Scale(zero=False)),
+            color=alt.Color(
+                "Series:N",
+                legend=alt.Legend(orient="bottom"),
+                scale=alt.Scale(
+                    domain=[price_label, fast_label, slow_label],
+                    range=["#1f77b4", "#ff7f0e", "#9467bd"],
+                ),
+            ),
+        )
+    )
+
+    if not markers.empty:
+        marker_chart = (
+            alt.Chart(markers)
+            .mark_point(filled=True, size=80)
+            .encode(
+                x=alt.X("Date:T", title="Date"),
+                y=alt.Y("Price:Q", title="Price"),
+                color=alt.Color(
+                    "Type:N",
+                    scale=alt.Scale(domain=["Entry", "Exit"], range=["#ff0000", "#00ff00"]),
+                    legend=alt.Legend(orient="bottom"),
+                ),
+                tooltip=["Type", "Date", "Price"],
+            )
+        )
+        combined_chart = (line_chart + marker_chart).resolve_scale(
+            color="independent"
+        )
+        detail.altair_chart(combined_chart, use_container_width=True)
+    else:
+        detail.altair_chart(line_chart, use_container_width=True)
+
+    st.subheader("Backtest Summary")
+    metrics = result.metrics
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Trades", int(metrics.get("total_trades", 0)))
+    col2.metric("Win rate", f"{metrics.get('win_rate', 0):.1f}%")
+    col3.metric("Avg return", f"{metrics.get('avg_return', 0):.2f}%")
+    col4.metric("Total return", f"{metrics.get('total_return', 0):.2f}%")
+    col5, col6, col7, col8 = st.columns(4)
+    col5.metric("Max drawdown", f"{metrics.get('max_drawdown', 0):.2f}%")
+    col6.metric("Sharpe", f"{metrics.get('sharpe', 0):.2f}")
+    col7.metric("Exposure", f"{metrics.get('exposure', 0):.1f}%")
+    col8.metric("Buy & hold", f"{metrics.get('buy_hold_return', 0):.2f}%")
+
+    st.subheader("Equity Curve")
+    st.line_chart(
+        downsample(
+            pd.DataFrame({"Strategy": result.equity, "Buy & hold": result.benchmark}),
+            CHART_POINTS,
+        )
+    )
+
+    st.subheader("Trades")
+    st.dataframe(_trade_table(result.trades), use_container_width=True)
+
+
+def _leaderboard(results):
+    """Return one row of summary metrics per ticker, with an equity sparkline."""
+    rows = []
+    for ticker, result in results.items():
+        metrics = result.metrics
+        equity = downsample(result.equity, SPARKLINE_POINTS)
+        rows.append(
+            {
+                "Ticker": ticker,
+                "Equity": equity.tolist(),
+                "Trades": int(metrics.get("total_trades", 0)),
+                "Total return %": metrics.get("total_return", 0.0),
+                "Sharpe": metrics.get("sharpe", 0.0),
+                "Max drawdown %": metrics.get("max_drawdown", 0.0),
+                "Win rate %": metrics.get("win_rate", 0.0),
+                "Exposure %": metrics.get("exposure", 0.0),
+                "Buy & hold %": metrics.get("buy_hold_return", 0.0),
+            }
+        )
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return frame
+    return frame.sort_values("Total return %", ascending=False, ignore_index=True)
+
+
+def _show_leaderboard(container, results):
+    container.dataframe(
+        _leaderboard(results),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Equity": st.column_config.LineChartColumn("Equity", width="small"),
+            "Total return %": st.column_config.NumberColumn(format="%.2f"),
+            "Sharpe": st.column_config.NumberColumn(format="%.2f"),
+            "Max drawdown %": st.column_config.NumberColumn(format="%.2f"),
+            "Win rate %": st.column_config.NumberColumn(format="%.1f"),
+            "Exposure %": st.column_config.NumberColumn(format="%.1f"),
+            "Buy & hold %": st.column_config.NumberColumn(format="%.2f"),
+        },
+    )
+
+
+def _show_profile(directory: Path) -> None:
+    """Offer the files of a profiled run for download, with section timings."""
+    with st.expander("Profile"):
+        sections = directory / "backtest.sections.json"
+        if sections.exists():
+            timings = pd.read_json(sections, orient="index")
+            st.dataframe(timings.rename_axis("Section"), use_container_width=True)
+        for path in sorted(directory.iterdir()):
+            st.download_button(
+                f"Download {path.name}",
+                path.read_bytes(),
+                file_name=path.name,
+                key=f"profile-{path.name}",
+            )
+
+
 st.set_page_config(page_title="ST Backtest App", layout="wide")
 st.title("ST Backtest App")
 st.write(
@@ -37,7 +254,11 @@ st.write(
 
 with st.sidebar:
     st.header("Strategy Inputs")
-    ticker = st.text_input("Ticker", value="AAPL")
+    mode = st.radio("Mode", ["Single ticker", "Compare tickers"], index=0)
+    if mode == "Single ticker":
+        ticker = st.text_input("Ticker", value="AAPL")
+    else:
+        ticker_list = st.text_area("Tickers", value="AAPL, MSFT, NVDA, AMZN, GOOGL")
     start_date = st.date_input("Start date", value=dt.date(2021, 1, 1))
     end_date = st.date_input("End date", value=dt.date.today())
     fast_window = st.number_input("Fast MA window", min_value=2, value=50)
@@ -46,111 +267,91 @@ with st.sidebar:
     hold_days = st.number_input(
         "Hold days (fixed exit only)", min_value=1, value=30
     )
+    profile_mode = None
+    if mode == "Single ticker" and st.checkbox("Profile run"):
+        profile_mode = st.radio("Profiler", PROFILE_MODES, index=0, horizontal=True)
     run_backtest = st.button("Run backtest")
 
-if run_backtest:
-    with st.spinner("Running backtest..."):
-        result = backtest_ma_cross(
-            ticker.strip().upper(),
-            start=str(start_date),
-            end=str(end_date),
-            fast_window=int(fast_window),
-            slow_window=int(slow_window),
-            exit_mode=exit_mode,
-            hold_days=int(hold_days),
+if mode == "Compare tickers":
+    if run_backtest:
+        tickers = list(
+            dict.fromkeys(
+                part.strip().upper()
+                for part in ticker_list.replace("\n", ",").split(",")
+                if part.strip()
+            )
         )
+        progress = st.progress(0.0, text="Fetching histories...")
+        table = st.empty()
+        results = {}
+        for done, (ticker, result) in enumerate(
+            backtest_ma_cross_many(
+                tickers,
+                start=str(start_date),
+                end=str(end_date),
+                fast_window=int(fast_window),
+                slow_window=int(slow_window),
+                exit_mode=exit_mode,
+                hold_days=int(hold_days),
+            ),
+            start=1,
+        ):
+            if not result.history.empty:
+                results[ticker] = result
+                _show_leaderboard(table, results)
+            progress.progress(done / len(tickers), text=f"Backtested {ticker}")
+        progress.empty()
+        missing = [ticker for ticker in tickers if ticker not in results]
+        if missing:
+            st.warning(f"No historical data found for: {', '.join(missing)}")
+        st.session_state["comparison"] = (results, int(fast_window), int(slow_window))
+    elif "comparison" in st.session_state:
+        _show_leaderboard(st.empty(), st.session_state["comparison"][0])
 
-    if result.history.empty:
-        st.warning("No historical data found for that input.")
-    else:
-        history = result.history.copy()
-        price_label = "Price"
-        fast_label = f"{fast_window}-day MA"
-        slow_label = f"{slow_window}-day MA"
-
-        price_series = (
-            history[["Close"]]
-            .rename(columns={"Close": "Value"})
-            .dropna()
-            .reset_index(names="Date")
-        )
-        price_series["Series"] = price_label
-        fast_series = (
-            history[["fast_ma"]]
-            .rename(columns={"fast_ma": "Value"})
-            .dropna()
-            .reset_index(names="Date")
-        )
-        fast_series["Series"] = fast_label
-        slow_series = (
-            history[["slow_ma"]]
-            .rename(columns={"slow_ma": "Value"})
-            .dropna()
-            .reset_index(names="Date")
+    if "comparison" in st.session_state:
+        results, compared_fast, compared_slow = st.session_state["comparison"]
+        if results:
+            ranked = _leaderboard(results)["Ticker"].tolist()
+            selected = st.selectbox("Drill into ticker", ranked)
+            _render_result(
+                results[selected], compared_fast, compared_slow, key=selected
+            )
+    elif not run_backtest:
+        st.info("Enter tickers in the sidebar and click 'Run backtest'.")
+else:
+    if run_backtest:
+        profile_path = (
+            Path(tempfile.mkdtemp(prefix="stotify-profile-")) / "backtest"
+            if profile_mode
+            else None
         )
-        slow_series["Series"] = slow_label
-
-        series_data = pd.concat([price_series, fast_series, slow_series], ignore_index=True)
-
-        st.subheader("Price with Moving Averages")
-        line_chart = (
-            alt.Chart(series_data)
-            .mark_line(strokeWidth=2)
-            .encode(
-                x=alt.X("Date:T", title="Date"),
-                y=alt.Y("Value:Q", title="Price"),
-                color=alt.Color(
-                    "Series:N",
-                    legend=alt.Legend(orient="bottom"),
-                    scale=alt.Scale(
-                        domain=[price_label, fast_label, slow_label],
-                        range=["#1f77b4", "#ff7f0e", "#9467bd"],
-                    ),
-                ),
+        with st.spinner("Running backtest..."):
+            result = backtest_ma_cross(
+                ticker.strip().upper(),
+                start=str(start_date),
+                end=str(end_date),
+                fast_window=int(fast_window),
+                slow_window=int(slow_window),
+                exit_mode=exit_mode,
+                hold_days=int(hold_days),
+                profile=profile_path,
+                profile_mode=profile_mode or "cprofile",
             )
+        # Kept for reruns, e.g. when brushing the overview to zoom.
+        st.session_state["single"] = (
+            result,
+            int(fast_window),
+            int(slow_window),
+            profile_path.parent if profile_path is not None else None,
         )
 
-        entries = [
-            {"Date": trade.entry_date, "Price": trade.entry_price, "Type": "Entry"}
-            for trade in result.trades
-        ]
-        exits = [
-            {"Date": trade.exit_date, "Price": trade.exit_price, "Type": "Exit"}
-            for trade in result.trades
-        ]
-        markers = pd.DataFrame(entries + exits)
-
-        if not markers.empty:
-            marker_chart = (
-                alt.Chart(markers)
-                .mark_point(filled=True, size=80)
-                .encode(
-                    x=alt.X("Date:T", title="Date"),
-                    y=alt.Y("Price:Q", title="Price"),
-                    color=alt.Color(
-                        "Type:N",
-                        scale=alt.Scale(domain=["Entry", "Exit"], range=["#ff0000", "#00ff00"]),
-                        legend=alt.Legend(orient="bottom"),
-                    ),
-                    tooltip=["Type", "Date", "Price"],
-                )
-            )
-            combined_chart = (line_chart + marker_chart).resolve_scale(
-                color="independent"
-            )
-            st.altair_chart(combined_chart, use_container_width=True)
+    if "single" in st.session_state:
+        result, run_fast, run_slow, profile_directory = st.session_state["single"]
+        if profile_directory is not None:
+            _show_profile(profile_directory)
+        if result.history.empty:
+            st.warning("No historical data found for that input.")
         else:
-            st.altair_chart(line_chart, use_container_width=True)
-
-        st.subheader("Backtest Summary")
-        metrics = result.metrics
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Trades", int(metrics.get("total_trades", 0)))
-        col2.metric("Win rate", f"{metrics.get('win_rate', 0):.1f}%")
-        col3.metric("Avg return", f"{metrics.get('avg_return', 0):.2f}%")
-        col4.metric("Total return", f"{metrics.get('total_return', 0):.2f}%")
-
-        st.subheader("Trades")
-        st.dataframe(_trade_table(result.trades), use_container_width=True)
-else:
-    st.info("Set your inputs in the sidebar and click 'Run backtest'.")
+            _render_result(result, run_fast, run_slow)
+    else:
+        st.info("Set your inputs in the sidebar and click 'Run backtest'.")
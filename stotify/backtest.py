@@ -2,15 +2,36 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+import os
+import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 
-from stotify.stock import get_history
+from stotify.indicators import RollingMeans, rolling_means
+from stotify.profiling import profiled, section
+from stotify.result_cache import (
+    CachedRun,
+    ResultCache,
+    get_result_cache,
+    result_key,
+)
+from stotify.signal_index import CrossoverIndex
+from stotify.stock import get_histories, get_history
+from stotify.strategies import get_series, signal_columns
+from stotify.validation import extract_tickers
 
 ExitMode = Literal["fixed", "cross"]
 
+TRADING_DAYS_PER_YEAR = 252
+TRADING_MINUTES_PER_DAY = 390
+INTERVAL_PATTERN = re.compile(r"^(\d+)(m|h|d|wk|mo)$")
+
 
 @dataclass(frozen=True)
 class Trade:
@@ -26,11 +47,55 @@ class Trade:
 
 @dataclass(frozen=True)
 class BacktestResult:
-    """Backtest output with trades and summary metrics."""
+    """Backtest output with trades, per-bar curves and summary metrics."""
 
     history: pd.DataFrame
     trades: list[Trade]
     metrics: dict[str, float]
+    equity: pd.Series = field(default_factory=lambda: pd.Series(dtype=float))
+    benchmark: pd.Series = field(default_factory=lambda: pd.Series(dtype=float))
+    exposure: pd.Series = field(default_factory=lambda: pd.Series(dtype=bool))
+
+
+@dataclass(frozen=True)
+class WalkForwardFold:
+    """One in-sample sweep and its out-of-sample evaluation."""
+
+    train_start: pd.Timestamp
+    train_end: pd.Timestamp
+    test_start: pd.Timestamp
+    test_end: pd.Timestamp
+    fast_window: int
+    slow_window: int
+    in_sample_score: float
+    out_of_sample_metrics: dict[str, float]
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    """Walk-forward output with per-fold picks and stitched out-of-sample equity."""
+
+    folds: list[WalkForwardFold]
+    equity: pd.Series
+    metrics: dict[str, float]
+
+    @property
+    def best_params(self) -> tuple[int, int] | None:
+        """Return the (fast, slow) pair picked by the most recent fold."""
+        if not self.folds:
+            return None
+        return self.folds[-1].fast_window, self.folds[-1].slow_window
+
+
+@dataclass(frozen=True)
+class AlertBacktest:
+    """Backtest of one ticker of one configured alert."""
+
+    group_name: str
+    strategy: str
+    ticker: str
+    params: dict
+    result: BacktestResult
 
 
 def backtest_ma_cross(
@@ -44,8 +109,155 @@ def backtest_ma_cross(
     exit_mode: ExitMode = "fixed",
     hold_days: int = 30,
     period: str = "5y",
+    signal_index: CrossoverIndex | None = None,
+    profile: str | os.PathLike | None = None,
+    profile_mode: str = "cprofile",
+    cache: ResultCache | None = None,
+) -> BacktestResult:
+    """Backtest a simple moving average crossover strategy.
+
+    With a signal_index, the index is brought up to date with the fetched
+    history and trades are read from its crossover events instead of
+    recomputing the moving averages; the history then has no MA columns.
+    With `profile`, the run is profiled and written next to that path (see
+    stotify.profiling.profiled). Results come from `cache`, by default the
+    shared stotify.result_cache cache, whenever the same bars were already
+    backtested with the same windows and exit rule.
+    """
+    with profiled(profile, profile_mode):
+        if signal_index is not None:
+            history = get_history(
+                ticker,
+                period=period,
+                interval=interval,
+                start=start,
+                end=end,
+            )
+            if history is None or history.empty:
+                return BacktestResult(history=pd.DataFrame(), trades=[], metrics={})
+            history = history.loc[history["Close"].dropna().index].copy()
+            signal_index.update(ticker, history, fast_window, slow_window, interval)
+            signal = signal_index.signal(
+                ticker, fast_window, slow_window, interval, history.index
+            )
+            # The in-memory path has no averages until slow_window bars are fetched.
+            signal[: slow_window - 1] = False
+            return _run_backtest(
+                history,
+                signal,
+                exit_mode=exit_mode,
+                hold_days=hold_days,
+                interval=interval,
+            )
+
+        return backtest_strategy(
+            ticker,
+            "ma_cross",
+            {"fast_window": fast_window, "slow_window": slow_window},
+            start=start,
+            end=end,
+            interval=interval,
+            exit_mode=exit_mode,
+            hold_days=hold_days,
+            period=period,
+            cache=cache,
+        )
+
+
+def backtest_ma_cross_many(
+    tickers: list[str],
+    *,
+    start: str | None = None,
+    end: str | None = None,
+    fast_window: int = 50,
+    slow_window: int = 200,
+    interval: str = "1d",
+    exit_mode: ExitMode = "fixed",
+    hold_days: int = 30,
+    period: str = "5y",
+    workers: int | None = None,
+) -> Iterator[tuple[str, BacktestResult]]:
+    """Backtest an MA crossover on several tickers, yielding results as they finish.
+
+    Histories are fetched with one bulk request. The NumPy-bound backtests
+    then run in a thread pool.
+    """
+    histories = get_histories(
+        tickers, period=period, interval=interval, start=start, end=end
+    )
+    params = {"fast_window": fast_window, "slow_window": slow_window}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                _backtest_history,
+                history,
+                "ma_cross",
+                params,
+                exit_mode=exit_mode,
+                hold_days=hold_days,
+                interval=interval,
+            ): ticker
+            for ticker, history in histories.items()
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def backtest_strategy(
+    ticker: str,
+    strategy: str,
+    params: dict,
+    *,
+    start: str | None = None,
+    end: str | None = None,
+    interval: str = "1d",
+    exit_mode: ExitMode = "fixed",
+    hold_days: int = 30,
+    period: str = "5y",
+    cache: ResultCache | None = None,
 ) -> BacktestResult:
-    """Backtest a simple moving average crossover strategy."""
+    """Backtest any registered strategy that exposes a series function.
+
+    A trade opens whenever one of the strategy's signals turns on. With the
+    "cross" exit rule it closes once no signal is on any more.
+    """
+    history = get_history(
+        ticker,
+        period=period,
+        interval=interval,
+        start=start,
+        end=end,
+    )
+    return _backtest_history(
+        history,
+        strategy,
+        params,
+        exit_mode=exit_mode,
+        hold_days=hold_days,
+        interval=interval,
+        cache=cache,
+    )
+
+
+def backtest_metrics(
+    ticker: str,
+    strategy: str,
+    params: dict,
+    *,
+    start: str | None = None,
+    end: str | None = None,
+    interval: str = "1d",
+    exit_mode: ExitMode = "fixed",
+    hold_days: int = 30,
+    period: str = "5y",
+    cache: ResultCache | None = None,
+) -> dict[str, float]:
+    """Return the metrics of backtest_strategy without its trades or curves.
+
+    A cached result is answered without building Trade objects, equity
+    curves or a copy of the history.
+    """
+    get_series(strategy)
     history = get_history(
         ticker,
         period=period,
@@ -54,71 +266,664 @@ def backtest_ma_cross(
         end=end,
     )
     if history is None or history.empty:
-        return BacktestResult(history=pd.DataFrame(), trades=[], metrics={})
+        return {}
+    run = _cached_run(
+        history.loc[history["Close"].dropna().index],
+        strategy,
+        params,
+        exit_mode=exit_mode,
+        hold_days=hold_days,
+        interval=interval,
+        cache=cache,
+    )
+    return dict(run.metrics)
+
+
+def backtest_alerts(
+    config: dict,
+    *,
+    start: str | None = None,
+    end: str | None = None,
+    interval: str = "1d",
+    exit_mode: ExitMode = "fixed",
+    hold_days: int = 30,
+    period: str = "5y",
+) -> list[AlertBacktest]:
+    """Backtest every alert in a loaded config, fetching each ticker once."""
+    histories: dict[str, pd.DataFrame | None] = {}
+    results: list[AlertBacktest] = []
+    for group_name, alerts in config["groups"].items():
+        for alert in alerts:
+            for ticker in extract_tickers(alert, group_name):
+                if ticker not in histories:
+                    histories[ticker] = get_history(
+                        ticker,
+                        period=period,
+                        interval=interval,
+                        start=start,
+                        end=end,
+                    )
+                result = _backtest_history(
+                    histories[ticker],
+                    alert["strategy"],
+                    alert["params"],
+                    exit_mode=exit_mode,
+                    hold_days=hold_days,
+                    interval=interval,
+                )
+                results.append(
+                    AlertBacktest(
+                        group_name=group_name,
+                        strategy=alert["strategy"],
+                        ticker=ticker,
+                        params=alert["params"],
+                        result=result,
+                    )
+                )
+    return results
 
-    closes = history["Close"].dropna()
-    history = history.loc[closes.index].copy()
-    history["fast_ma"] = closes.rolling(window=fast_window).mean()
-    history["slow_ma"] = closes.rolling(window=slow_window).mean()
 
-    signal = history["fast_ma"] > history["slow_ma"]
-    cross_up = signal & ~signal.shift(1, fill_value=False)
-    cross_down = ~signal & signal.shift(1, fill_value=False)
+def backtest_ma_cross_chunks(
+    chunks: Iterable[pd.DataFrame],
+    *,
+    fast_window: int = 50,
+    slow_window: int = 200,
+    interval: str = "1d",
+    exit_mode: ExitMode = "fixed",
+    hold_days: int = 30,
+) -> BacktestResult:
+    """Backtest a moving average crossover over history streamed in chunks.
 
+    `chunks` yields consecutive bar frames, e.g. history_chunks() or
+    pd.read_csv(..., chunksize=n). Only the rolling-window tail, open trades
+    and running metric sums are carried between chunks, so memory is bounded
+    by the chunk size. Trades and metrics match backtest_ma_cross over the
+    concatenated history; per-bar history and curves are not kept.
+    """
+    means = RollingMeans([fast_window, slow_window])
+    stats = _EquityStats()
     trades: list[Trade] = []
-    index = history.index
+    # (entry position, entry date, entry price) of trades still open.
+    open_trades: list[tuple[int, pd.Timestamp, float]] = []
+    previous_signal = False
+    position = 0
+    first_close: float | None = None
+    last_close = math.nan
+    last_date = None
+
+    for chunk in chunks:
+        series = chunk["Close"].dropna()
+        if series.empty:
+            continue
+        closes = series.to_numpy(dtype=float)
+        index = series.index
+        length = len(closes)
+        averages = means.update(closes)
+        signal = averages[fast_window] > averages[slow_window]
+        previous = np.concatenate(([previous_signal], signal[:-1]))
+        entries = np.flatnonzero(signal & ~previous)
+        downs = np.flatnonzero(~signal & previous)
 
-    entry_dates = index[cross_up.fillna(False)]
-    for entry_date in entry_dates:
-        entry_pos = index.get_loc(entry_date)
-        entry_price = float(history.at[entry_date, "Close"])
-
-        if exit_mode == "cross":
-            future_cross = cross_down.iloc[entry_pos + 1 :]
-            if future_cross.any():
-                exit_pos = future_cross.idxmax()
-                exit_date = exit_pos
-                exit_index_pos = index.get_loc(exit_date)
+        delta = np.zeros(length, dtype=np.int64)
+        np.add.at(delta, entries, 1)
+        held_before = len(open_trades)
+        candidates = open_trades + [
+            (position + entry, index[entry], float(closes[entry])) for entry in entries
+        ]
+        open_trades = []
+        for entry, entry_date, entry_price in candidates:
+            local = entry - position
+            if exit_mode == "cross":
+                next_down = np.searchsorted(downs, local, side="right")
+                exit_ = downs[next_down] if next_down < len(downs) else length
             else:
-                exit_index_pos = len(index) - 1
-                exit_date = index[exit_index_pos]
-        else:
-            exit_index_pos = min(entry_pos + hold_days, len(index) - 1)
-            exit_date = index[exit_index_pos]
+                exit_ = local + hold_days
+            if exit_ >= length:
+                open_trades.append((entry, entry_date, entry_price))
+                continue
+            delta[exit_] -= 1
+            trades.append(
+                _closed_trade(
+                    entry,
+                    entry_date,
+                    entry_price,
+                    position + exit_,
+                    index[exit_],
+                    float(closes[exit_]),
+                )
+            )
 
-        exit_price = float(history.at[exit_date, "Close"])
-        return_pct = ((exit_price - entry_price) / entry_price) * 100
-        hold_length = exit_index_pos - entry_pos
+        open_after = held_before + np.cumsum(delta)
+        held = np.concatenate(([held_before], open_after[:-1])) > 0
+        bar_returns = closes / np.concatenate(([last_close], closes[:-1])) - 1
+        if first_close is None:
+            first_close = float(closes[0])
+            bar_returns, held = bar_returns[1:], held[1:]
+        stats.update(np.where(held, bar_returns, 0.0), held)
 
+        previous_signal = bool(signal[-1])
+        position += length
+        last_close = float(closes[-1])
+        last_date = index[-1]
+
+    for entry, entry_date, entry_price in open_trades:
         trades.append(
-            Trade(
-                entry_date=entry_date,
-                entry_price=entry_price,
-                exit_date=exit_date,
-                exit_price=exit_price,
-                return_pct=return_pct,
-                hold_days=hold_length,
+            _closed_trade(
+                entry, entry_date, entry_price, position - 1, last_date, last_close
             )
         )
 
-    metrics = _summarize_trades(trades)
-    return BacktestResult(history=history, trades=trades, metrics=metrics)
+    if first_close is None:
+        return BacktestResult(history=pd.DataFrame(), trades=[], metrics={})
+    metrics = _summarize_trades(np.array([trade.return_pct for trade in trades]))
+    metrics.update(stats.metrics(last_close / first_close, _periods_per_year(interval)))
+    return BacktestResult(history=pd.DataFrame(), trades=trades, metrics=metrics)
+
+
+def history_chunks(
+    ticker: str,
+    *,
+    start: str,
+    end: str,
+    interval: str = "1d",
+    chunk_days: int = 365,
+) -> Iterator[pd.DataFrame]:
+    """Yield a ticker's history page by page, one provider request per page."""
+    page_start = pd.Timestamp(start)
+    stop = pd.Timestamp(end)
+    while page_start < stop:
+        page_end = min(page_start + pd.Timedelta(days=chunk_days), stop)
+        history = get_history(
+            ticker,
+            interval=interval,
+            start=str(page_start.date()),
+            end=str(page_end.date()),
+        )
+        if history is not None and not history.empty:
+            yield history
+        page_start = page_end
+
 
+def _closed_trade(
+    entry: int,
+    entry_date: pd.Timestamp,
+    entry_price: float,
+    exit_: int,
+    exit_date: pd.Timestamp,
+    exit_price: float,
+) -> Trade:
+    return Trade(
+        entry_date=entry_date,
+        entry_price=entry_price,
+        exit_date=exit_date,
+        exit_price=exit_price,
+        return_pct=(exit_price - entry_price) / entry_price * 100,
+        hold_days=exit_ - entry,
+    )
+
+
+class _EquityStats:
+    """Running equity metrics over strategy bar returns, fed chunk by chunk."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.downside = 0.0
+        self.held = 0
+        self.level = 1.0
+        self.peak = 1.0
+        self.max_drawdown = 0.0
+
+    def update(self, returns: np.ndarray, held: np.ndarray) -> None:
+        if len(returns) == 0:
+            return
+        equity = self.level * np.cumprod(1 + returns)
+        peaks = np.maximum(self.peak, np.maximum.accumulate(equity))
+        self.max_drawdown = min(self.max_drawdown, float((equity / peaks - 1).min()))
+        self.level = float(equity[-1])
+        self.peak = float(peaks[-1])
+
+        # Merge the chunk's mean and squared deviations (Chan et al.).
+        count = len(returns)
+        mean = float(returns.mean())
+        total = self.count + count
+        difference = mean - self.mean
+        self.m2 += float(((returns - mean) ** 2).sum())
+        self.m2 += difference**2 * self.count * count / total
+        self.mean += difference * count / total
+        self.count = total
+        self.downside += float((np.minimum(returns, 0.0) ** 2).sum())
+        self.held += int(np.count_nonzero(held))
+
+    def metrics(self, buy_hold: float, periods_per_year: float) -> dict[str, float]:
+        """Return the same equity metrics as _summarize_equity."""
+        if self.count == 0:
+            return {}
+        years = self.count / periods_per_year
+        volatility = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+        downside = math.sqrt(self.downside / self.count)
+        scale = math.sqrt(periods_per_year)
+        return {
+            "max_drawdown": self.max_drawdown * 100,
+            "annualized_return": (self.level ** (1 / years) - 1) * 100,
+            "annualized_volatility": volatility * scale * 100,
+            "sharpe": self.mean / volatility * scale if volatility > 0 else 0.0,
+            "sortino": self.mean / downside * scale if downside > 0 else 0.0,
+            "exposure": self.held / self.count * 100,
+            "buy_hold_return": (buy_hold - 1) * 100,
+        }
+
+
+def _backtest_history(
+    history: pd.DataFrame | None,
+    strategy: str,
+    params: dict,
+    *,
+    exit_mode: ExitMode,
+    hold_days: int,
+    interval: str,
+    cache: ResultCache | None = None,
+) -> BacktestResult:
+    """Evaluate a strategy's series function over history and simulate trades."""
+    get_series(strategy)
+    if history is None or history.empty:
+        return BacktestResult(history=pd.DataFrame(), trades=[], metrics={})
+
+    closes = history["Close"].dropna()
+    history = history.loc[closes.index].copy()
+    run = _cached_run(
+        history,
+        strategy,
+        params,
+        exit_mode=exit_mode,
+        hold_days=hold_days,
+        interval=interval,
+        cache=cache,
+    )
+    for column, values in run.columns.items():
+        history[column] = values.copy()
+    return _build_result(history, run.entries, run.exits, run.metrics)
+
+
+def _cached_run(
+    history: pd.DataFrame,
+    strategy: str,
+    params: dict,
+    *,
+    exit_mode: ExitMode,
+    hold_days: int,
+    interval: str,
+    cache: ResultCache | None,
+) -> CachedRun:
+    """Return the run of a strategy over clean history, from cache if possible."""
+    if cache is None:
+        cache = get_result_cache()
+    key = result_key(
+        history,
+        strategy,
+        params,
+        exit_mode=exit_mode,
+        hold_days=hold_days,
+        interval=interval,
+    )
+    return cache.get_or_run(
+        key,
+        lambda: _evaluate(
+            history,
+            strategy,
+            params,
+            exit_mode=exit_mode,
+            hold_days=hold_days,
+            interval=interval,
+        ),
+    )
+
+
+def _evaluate(
+    history: pd.DataFrame,
+    strategy: str,
+    params: dict,
+    *,
+    exit_mode: ExitMode,
+    hold_days: int,
+    interval: str,
+) -> CachedRun:
+    """Run a strategy's series function and simulate trades on its signal."""
+    with section(f"strategy:{strategy}"):
+        frame = get_series(strategy)(history, params)
+    columns = signal_columns(frame)
+    signal = frame[columns].to_numpy(dtype=bool).any(axis=1)
+    closes = history["Close"].to_numpy(dtype=float)
+    entry_pos, exit_pos = _trade_positions(signal, exit_mode, hold_days)
+    return CachedRun(
+        metrics=_run_metrics(closes, entry_pos, exit_pos, interval),
+        entries=entry_pos,
+        exits=exit_pos,
+        columns={
+            column: values.to_numpy()
+            for column, values in frame.items()
+            if column not in columns
+        },
+    )
+
+
+def _run_backtest(
+    history: pd.DataFrame,
+    signal: np.ndarray,
+    *,
+    exit_mode: ExitMode,
+    hold_days: int,
+    interval: str,
+) -> BacktestResult:
+    """Simulate trades for a boolean signal and compute curves and metrics."""
+    closes = history["Close"].to_numpy(dtype=float)
+    entry_pos, exit_pos = _trade_positions(signal, exit_mode, hold_days)
+    metrics = _run_metrics(closes, entry_pos, exit_pos, interval)
+    return _build_result(history, entry_pos, exit_pos, metrics)
+
+
+def _run_metrics(
+    closes: np.ndarray, entry_pos: np.ndarray, exit_pos: np.ndarray, interval: str
+) -> dict[str, float]:
+    """Return trade and equity metrics of trades entered and exited at positions."""
+    entry_prices = closes[entry_pos]
+    returns = (closes[exit_pos] - entry_prices) / entry_prices * 100
+    held = _held_mask(len(closes), entry_pos, exit_pos)
+    equity, benchmark = _equity_curves(closes, held)
+    metrics = _summarize_trades(returns)
+    metrics.update(
+        _summarize_equity(equity, benchmark, held, _periods_per_year(interval))
+    )
+    return metrics
+
+
+def _build_result(
+    history: pd.DataFrame,
+    entry_pos: np.ndarray,
+    exit_pos: np.ndarray,
+    metrics: dict[str, float],
+) -> BacktestResult:
+    """Return the trades and per-bar curves of a run over history."""
+    index = history.index
+    closes = history["Close"].to_numpy(dtype=float)
+    entry_prices = closes[entry_pos]
+    exit_prices = closes[exit_pos]
+    returns = (exit_prices - entry_prices) / entry_prices * 100
+    trades = [
+        Trade(
+            entry_date=index[entry],
+            entry_price=float(entry_price),
+            exit_date=index[exit_],
+            exit_price=float(exit_price),
+            return_pct=float(return_pct),
+            hold_days=int(exit_ - entry),
+        )
+        for entry, exit_, entry_price, exit_price, return_pct in zip(
+            entry_pos, exit_pos, entry_prices, exit_prices, returns
+        )
+    ]
+
+    held = _held_mask(len(closes), entry_pos, exit_pos)
+    equity, benchmark = _equity_curves(closes, held)
+    return BacktestResult(
+        history=history,
+        trades=trades,
+        metrics=dict(metrics),
+        equity=pd.Series(equity, index=index, name="equity"),
+        benchmark=pd.Series(benchmark, index=index, name="benchmark"),
+        exposure=pd.Series(held, index=index, name="exposure"),
+    )
+
+
+def _trade_positions(
+    signal: np.ndarray, exit_mode: ExitMode, hold_days: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return entry and exit bar positions for every rising edge of signal."""
+    signal = np.asarray(signal, dtype=bool)
+    previous = np.concatenate(([False], signal[:-1]))
+    entries = np.flatnonzero(signal & ~previous)
+    last = len(signal) - 1
+
+    if exit_mode == "cross":
+        downs = np.flatnonzero(~signal & previous)
+        next_down = np.searchsorted(downs, entries, side="right")
+        found = next_down < len(downs)
+        exits = np.full(len(entries), last, dtype=np.intp)
+        exits[found] = downs[next_down[found]]
+    else:
+        exits = np.minimum(entries + hold_days, last)
+    return entries, exits
+
+
+def _held_mask(length: int, entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    """Mark bars whose close-to-close return is earned by an open trade."""
+    depth = np.zeros(length + 1, dtype=np.int64)
+    np.add.at(depth, entries + 1, 1)
+    np.add.at(depth, exits + 1, -1)
+    return np.cumsum(depth[:length]) > 0
+
+
+def _equity_curves(
+    closes: np.ndarray, held: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the strategy and buy-and-hold equity curves, both starting at 1."""
+    if len(closes) == 0:
+        return np.empty(0), np.empty(0)
+    bar_returns = np.zeros(len(closes))
+    bar_returns[1:] = closes[1:] / closes[:-1] - 1
+    equity = np.cumprod(1 + np.where(held, bar_returns, 0.0))
+    benchmark = closes / closes[0]
+    return equity, benchmark
 
-def _summarize_trades(trades: list[Trade]) -> dict[str, float]:
-    if not trades:
+
+def _periods_per_year(interval: str) -> float:
+    """Return the number of bars per trading year for a yfinance interval."""
+    match = INTERVAL_PATTERN.match(interval)
+    if not match:
+        return float(TRADING_DAYS_PER_YEAR)
+    count = int(match.group(1))
+    unit = match.group(2)
+    if unit == "m":
+        return TRADING_DAYS_PER_YEAR * TRADING_MINUTES_PER_DAY / count
+    if unit == "h":
+        return TRADING_DAYS_PER_YEAR * TRADING_MINUTES_PER_DAY / (60 * count)
+    if unit == "wk":
+        return 52 / count
+    if unit == "mo":
+        return 12 / count
+    return TRADING_DAYS_PER_YEAR / count
+
+
+def _summarize_trades(returns: np.ndarray) -> dict[str, float]:
+    returns = np.asarray(returns, dtype=float)
+    if returns.size == 0:
         return {}
 
-    returns = [trade.return_pct for trade in trades]
-    wins = [ret for ret in returns if ret > 0]
-    total_return = 1.0
-    for ret in returns:
-        total_return *= 1 + (ret / 100)
-    total_return_pct = (total_return - 1) * 100
+    gains = returns[returns > 0].sum()
+    losses = -returns[returns < 0].sum()
+    if losses > 0:
+        profit_factor = gains / losses
+    else:
+        profit_factor = float("inf") if gains > 0 else 0.0
 
     return {
-        "total_trades": float(len(trades)),
-        "win_rate": (len(wins) / len(returns)) * 100,
-        "avg_return": sum(returns) / len(returns),
-        "total_return": total_return_pct,
+        "total_trades": float(returns.size),
+        "win_rate": float(np.count_nonzero(returns > 0) / returns.size * 100),
+        "avg_return": float(returns.mean()),
+        "total_return": float((np.prod(1 + returns / 100) - 1) * 100),
+        "profit_factor": float(profit_factor),
     }
+
+
+def _summarize_equity(
+    equity: np.ndarray,
+    benchmark: np.ndarray,
+    held: np.ndarray,
+    periods_per_year: float,
+) -> dict[str, float]:
+    if len(equity) < 2:
+        return {}
+
+    bar_returns = equity[1:] / equity[:-1] - 1
+    years = (len(equity) - 1) / periods_per_year
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    volatility = bar_returns.std(ddof=1) if len(bar_returns) > 1 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(bar_returns, 0.0) ** 2))
+    mean_return = bar_returns.mean()
+    scale = np.sqrt(periods_per_year)
+
+    return {
+        "max_drawdown": float(drawdown.min() * 100),
+        "annualized_return": float((equity[-1] ** (1 / years) - 1) * 100),
+        "annualized_volatility": float(volatility * scale * 100),
+        "sharpe": float(mean_return / volatility * scale) if volatility > 0 else 0.0,
+        "sortino": float(mean_return / downside * scale) if downside > 0 else 0.0,
+        "exposure": float(held[1:].mean() * 100),
+        "buy_hold_return": float((benchmark[-1] - 1) * 100),
+    }
+
+
+def walk_forward_ma_cross(
+    ticker: str,
+    *,
+    fast_windows: list[int],
+    slow_windows: list[int],
+    train_bars: int = 504,
+    test_bars: int = 126,
+    objective: str = "sharpe",
+    start: str | None = None,
+    end: str | None = None,
+    interval: str = "1d",
+    exit_mode: ExitMode = "cross",
+    hold_days: int = 30,
+    period: str = "max",
+    workers: int | None = None,
+) -> WalkForwardResult:
+    """Optimize MA windows on rolling in-sample windows and test out-of-sample.
+
+    Rolling means for every candidate window are computed once over the full
+    history and shared by all folds; folds run in parallel across processes.
+    """
+    empty = WalkForwardResult(folds=[], equity=pd.Series(dtype=float), metrics={})
+    history = get_history(
+        ticker,
+        period=period,
+        interval=interval,
+        start=start,
+        end=end,
+    )
+    if history is None or history.empty:
+        return empty
+
+    closes = history["Close"].dropna()
+    pairs = [
+        (fast, slow) for fast in fast_windows for slow in slow_windows if fast < slow
+    ]
+    bounds = [
+        (test_start - train_bars, test_start, min(test_start + test_bars, len(closes)))
+        for test_start in range(train_bars, len(closes), test_bars)
+    ]
+    if not pairs or not bounds:
+        return empty
+
+    windows = sorted({window for pair in pairs for window in pair})
+    values = closes.to_numpy(dtype=float)
+    shared = (values, rolling_means(values, windows), _periods_per_year(interval))
+    options = (pairs, objective, exit_mode, hold_days, bounds[0][1])
+
+    if workers == 1 or len(bounds) == 1:
+        _init_walk_forward(shared)
+        outcomes = [_walk_forward_fold(bound, options) for bound in bounds]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_walk_forward,
+            initargs=(shared,),
+        ) as pool:
+            outcomes = list(
+                pool.map(_walk_forward_fold, bounds, [options] * len(bounds))
+            )
+
+    index = closes.index
+    folds: list[WalkForwardFold] = []
+    equity_parts: list[np.ndarray] = []
+    held_parts: list[np.ndarray] = []
+    trade_returns: list[np.ndarray] = []
+    level = 1.0
+    for (train_start, test_start, test_end), outcome in zip(bounds, outcomes):
+        (fast, slow), score, metrics, equity, held, returns = outcome
+        folds.append(
+            WalkForwardFold(
+                train_start=index[train_start],
+                train_end=index[test_start - 1],
+                test_start=index[test_start],
+                test_end=index[test_end - 1],
+                fast_window=fast,
+                slow_window=slow,
+                in_sample_score=score,
+                out_of_sample_metrics=metrics,
+            )
+        )
+        equity_parts.append(equity * level)
+        held_parts.append(held)
+        trade_returns.append(returns)
+        level = equity_parts[-1][-1]
+
+    first_test = bounds[0][1]
+    equity = np.concatenate(equity_parts)
+    oos_closes = shared[0][first_test:]
+    metrics = _summarize_trades(np.concatenate(trade_returns))
+    metrics.update(
+        _summarize_equity(
+            equity, oos_closes / oos_closes[0], np.concatenate(held_parts), shared[2]
+        )
+    )
+    return WalkForwardResult(
+        folds=folds,
+        equity=pd.Series(equity, index=index[first_test:], name="equity"),
+        metrics=metrics,
+    )
+
+
+_WALK_FORWARD_SHARED: tuple[np.ndarray, dict[int, np.ndarray], float] | None = None
+
+
+def _init_walk_forward(shared: tuple[np.ndarray, dict[int, np.ndarray], float]):
+    """Install the shared closes and rolling means for this process."""
+    global _WALK_FORWARD_SHARED
+    _WALK_FORWARD_SHARED = shared
+
+
+def _walk_forward_fold(bounds: tuple[int, int, int], options: tuple):
+    """Sweep every pair in-sample, then evaluate the winner out-of-sample."""
+    closes, means, periods_per_year = _WALK_FORWARD_SHARED
+    pairs, objective, exit_mode, hold_days, first_test = options
+    train_start, test_start, test_end = bounds
+
+    def evaluate(fast: int, slow: int, start: int, stop: int):
+        signal = means[fast][start:stop] > means[slow][start:stop]
+        window = closes[start:stop]
+        entries, exits = _trade_positions(signal, exit_mode, hold_days)
+        returns = (window[exits] - window[entries]) / window[entries] * 100
+        held = _held_mask(len(window), entries, exits)
+        equity, benchmark = _equity_curves(window, held)
+        metrics = _summarize_trades(returns)
+        metrics.update(_summarize_equity(equity, benchmark, held, periods_per_year))
+        return metrics, equity, held, returns
+
+    best_pair = pairs[0]
+    best_score = float("-inf")
+    for fast, slow in pairs:
+        score = evaluate(fast, slow, train_start, test_start)[0].get(objective)
+        if score is not None and not math.isnan(score) and score > best_score:
+            best_pair, best_score = (fast, slow), float(score)
+
+    if test_start == first_test:
+        return best_pair, best_score, *evaluate(*best_pair, test_start, test_end)
+
+    # Later folds trade from the close their parameters were chosen at, so the
+    # return into the first test bar carries across the fold boundary.
+    metrics, equity, held, returns = evaluate(*best_pair, test_start - 1, test_end)
+    return best_pair, best_score, metrics, equity[1:], held[1:], returns
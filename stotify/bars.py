@@ -0,0 +1,130 @@
+"""Bar intervals: provider intervals, resampling and bar completion times."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from stotify.market_hours import ET, MARKET_CLOSE, MARKET_OPEN
+
+# Intraday intervals Yahoo Finance serves directly, in minutes.
+PROVIDER_INTERVALS = {
+    "1m": 1,
+    "2m": 2,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "1h": 60,
+    "60m": 60,
+}
+INTRADAY_PATTERN = re.compile(r"^(\d+)(m|h)$")
+
+_AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+
+def is_intraday(interval: str | None) -> bool:
+    """Check whether an interval/timeframe is shorter than a day (e.g. 15m, 6h)."""
+    return bool(interval) and bool(INTRADAY_PATTERN.match(interval))
+
+
+def interval_minutes(interval: str) -> int:
+    """Return the length of an intraday interval in minutes."""
+    match = INTRADAY_PATTERN.match(interval)
+    if not match:
+        raise ValueError(f"Invalid intraday interval '{interval}'")
+    return int(match.group(1)) * (60 if match.group(2) == "h" else 1)
+
+
+def provider_interval(interval: str) -> str:
+    """Return the interval to request so that bars of `interval` can be built.
+
+    Unsupported intraday intervals (e.g. 6h) are resampled from the longest
+    provider interval that divides them.
+    """
+    if not is_intraday(interval) or interval in PROVIDER_INTERVALS:
+        return interval
+    minutes = interval_minutes(interval)
+    for name, length in sorted(
+        PROVIDER_INTERVALS.items(), key=lambda item: item[1], reverse=True
+    ):
+        if minutes % length == 0:
+            return name
+    raise ValueError(f"Unsupported interval '{interval}'")
+
+
+def intraday_period(interval: str) -> str:
+    """Return a default lookback that stays within Yahoo's intraday limits."""
+    source = provider_interval(interval)
+    if source == "1m":
+        return "5d"
+    if PROVIDER_INTERVALS[source] < 60:
+        return "1mo"
+    return "6mo"
+
+
+def resample_bars(history: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """Aggregate intraday bars into `interval` bars anchored at the session open."""
+    index = pd.DatetimeIndex(history.index)
+    local = index.tz_convert(ET) if index.tz is not None else index
+    session_open = local.normalize() + pd.Timedelta(
+        hours=MARKET_OPEN.hour, minutes=MARKET_OPEN.minute
+    )
+    length = pd.Timedelta(minutes=interval_minutes(interval))
+    starts = session_open + (local - session_open) // length * length
+    if index.tz is not None:
+        starts = starts.tz_convert(index.tz)
+    aggregations = {
+        column: _AGGREGATIONS.get(column, "last") for column in history.columns
+    }
+    return history.groupby(starts).agg(aggregations)
+
+
+def load_bars(
+    fetch: Callable, ticker: str, interval: str, **kwargs
+) -> pd.DataFrame | None:
+    """Fetch bars of `interval` with non-missing closes, resampling if needed."""
+    source = provider_interval(interval)
+    history = fetch(ticker, interval=source, **kwargs)
+    if history is None or history.empty:
+        return None
+    history = history.dropna(subset=["Close"])
+    if source != interval:
+        history = resample_bars(history, interval)
+    return history
+
+
+def bar_end_times(index: pd.Index, interval: str) -> np.ndarray:
+    """Return bar completion times (UTC nanoseconds) for a bar index.
+
+    Intraday bars complete one interval after they open, or at the session
+    close if that is earlier; daily and longer bars are treated as complete
+    at the regular session close of their date.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize(ET)
+    close = index.tz_convert(ET).normalize() + pd.Timedelta(
+        hours=MARKET_CLOSE.hour, minutes=MARKET_CLOSE.minute
+    )
+    if is_intraday(interval):
+        opened = index + pd.Timedelta(minutes=interval_minutes(interval))
+        ends = opened.where(opened <= close, close)
+    else:
+        ends = close
+    return ends.tz_convert("UTC").as_unit("ns").asi8
+
+
+def completed_bars(history: pd.DataFrame, interval: str, now: datetime) -> pd.DataFrame:
+    """Drop bars that have not completed by `now` (e.g. the forming bar)."""
+    ends = bar_end_times(history.index, interval)
+    return history[ends <= pd.Timestamp(now).value]
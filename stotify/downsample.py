@@ -0,0 +1,71 @@
+"""Shape-preserving downsampling of time series for charting."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Pick `points` indices with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Every point in between comes
+    from its own bucket, chosen to form the largest triangle with the point
+    kept in the previous bucket and the mean of the next bucket, so peaks and
+    troughs survive. Returns every index when there are no more than `points`.
+    """
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+    if points < 3:
+        raise ValueError("LTTB needs at least 3 points")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(points - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            following = slice(hi, edges[bucket + 2])
+            next_x, next_y = x[following].mean(), y[following].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        px, py = x[previous], y[previous]
+        areas = np.abs(
+            (px - next_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (next_y - py)
+        )
+        previous = lo + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def downsample(
+    frame: pd.DataFrame | pd.Series,
+    points: int,
+    column: str | None = None,
+    keep: Iterable = (),
+) -> pd.DataFrame | pd.Series:
+    """Reduce a time-indexed frame to about `points` rows for plotting.
+
+    Rows are chosen with LTTB on `column` (the first column by default) and
+    applied to every column, so lines sharing an axis stay aligned. Rows
+    whose index is in `keep` (e.g. trade entries and exits) are always
+    retained, even if that exceeds `points`.
+    """
+    if len(frame) <= points:
+        return frame
+    if isinstance(frame, pd.DataFrame):
+        values = frame[column or frame.columns[0]]
+    else:
+        values = frame
+    index = pd.DatetimeIndex(frame.index)
+    rows = lttb_indices(index.as_unit("ns").asi8, values.to_numpy(dtype=float), points)
+    kept = index.get_indexer(pd.DatetimeIndex(list(keep)).as_unit(index.unit))
+    kept = kept[kept >= 0]
+    if len(kept):
+        rows = np.union1d(rows, kept)
+    return frame.iloc[rows]
@@ -0,0 +1,369 @@
+"""Incremental technical indicators with resumable state."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from stotify.profiling import section
+from stotify.stock import Quote
+
+STATE_PATH_ENV = "STOTIFY_STATE_PATH"
+
+
+class EMA:
+    """Exponential moving average seeded with the first value (adjust=False)."""
+
+    def __init__(self, span: int | None = None, alpha: float | None = None, state=None):
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.value: float | None = (state or {}).get("value")
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+    def to_state(self) -> dict:
+        return {"value": self.value}
+
+
+class WilderRSI:
+    """Relative strength index with Wilder smoothing."""
+
+    def __init__(self, period: int, state=None):
+        state = state or {}
+        self.previous: float | None = state.get("previous")
+        self.gain = EMA(alpha=1 / period, state=state.get("gain"))
+        self.loss = EMA(alpha=1 / period, state=state.get("loss"))
+
+    @property
+    def value(self) -> float | None:
+        if self.gain.value is None:
+            return None
+        if self.loss.value == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.gain.value / self.loss.value)
+
+    def update(self, close: float) -> float | None:
+        if self.previous is not None:
+            delta = close - self.previous
+            self.gain.update(max(delta, 0.0))
+            self.loss.update(max(-delta, 0.0))
+        self.previous = close
+        return self.value
+
+    def to_state(self) -> dict:
+        return {
+            "previous": self.previous,
+            "gain": self.gain.to_state(),
+            "loss": self.loss.to_state(),
+        }
+
+
+class RollingStats:
+    """Mean and population standard deviation over a fixed trailing window."""
+
+    def __init__(self, window: int, state=None):
+        self.window = window
+        self.values: deque[float] = deque((state or {}).get("values", []), window)
+        self.total = math.fsum(self.values)
+        self.total_sq = math.fsum(v * v for v in self.values)
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.window if self.full else None
+
+    @property
+    def std(self) -> float | None:
+        if not self.full:
+            return None
+        mean = self.total / self.window
+        return math.sqrt(max(self.total_sq / self.window - mean * mean, 0.0))
+
+    def update(self, x: float) -> None:
+        if self.full:
+            dropped = self.values[0]
+            self.total -= dropped
+            self.total_sq -= dropped * dropped
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+
+    def to_state(self) -> dict:
+        return {"values": list(self.values)}
+
+
+class SessionAnchor:
+    """Track the open price and VWAP of the current trading session."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.session: str | None = state.get("session")
+        self.open: float | None = state.get("open")
+        self.price_volume: float = state.get("price_volume", 0.0)
+        self.volume: float = state.get("volume", 0.0)
+
+    @property
+    def vwap(self) -> float | None:
+        return self.price_volume / self.volume if self.volume else None
+
+    def update(self, session: str, open_: float, typical: float, volume: float):
+        if session != self.session:
+            self.session = session
+            self.open = open_
+            self.price_volume = 0.0
+            self.volume = 0.0
+        self.price_volume += typical * volume
+        self.volume += volume
+
+    def to_state(self) -> dict:
+        return {
+            "session": self.session,
+            "open": self.open,
+            "price_volume": self.price_volume,
+            "volume": self.volume,
+        }
+
+
+class RollingMeans:
+    """Simple moving averages for several windows over a stream of chunks.
+
+    Prefix sums are built with NumPy cumulative sums over blocks of
+    `block_size` values, and block totals are carried in a compensated
+    (two-sum) running sum. Every prefix is kept as a (high, low) pair and values
+    are shifted by the first value of the stream. As a result, the rounding
+    error of a window mean does not grow with the length of the stream. Only
+    the last `max(windows)` prefix pairs are kept between chunks. Values must
+    be finite.
+    """
+
+    def __init__(self, windows, block_size: int = 4096):
+        self.windows = sorted({int(window) for window in windows})
+        if not self.windows or self.windows[0] < 1:
+            raise ValueError("windows must be positive")
+        self.block_size = block_size
+        self.reference: float | None = None
+        self._high = 0.0
+        self._low = 0.0
+        self._tail = np.zeros((2, 1))
+
+    def update(self, chunk) -> dict[int, np.ndarray]:
+        """Return the means ending at each value of chunk (NaN until filled)."""
+        values = np.asarray(chunk, dtype=np.float64)
+        prefixes = self.prefixes(values)
+        means = {
+            window: self.window_means(prefixes, len(values), window)
+            for window in self.windows
+        }
+        self._tail = prefixes[:, -self.windows[-1] :].copy()
+        return means
+
+    def prefixes(self, values: np.ndarray) -> np.ndarray:
+        """Return the kept prefix pairs followed by those ending at each value."""
+        if self.reference is None and len(values):
+            self.reference = float(values[0])
+        offset = self._tail.shape[1]
+        prefixes = np.empty((2, offset + len(values)))
+        prefixes[:, :offset] = self._tail
+
+        for start in range(0, len(values), self.block_size):
+            stop = min(start + self.block_size, len(values))
+            block = np.cumsum(values[start:stop] - self.reference)
+            high = self._high + block
+            # Two-sum: the exact rounding error of high = self._high + block.
+            virtual = high - self._high
+            error = (self._high - (high - virtual)) + (block - virtual)
+            prefixes[0, offset + start : offset + stop] = high
+            prefixes[1, offset + start : offset + stop] = self._low + error
+            self._high = float(high[-1])
+            self._low = float(prefixes[1, offset + stop - 1])
+        return prefixes
+
+    def window_means(self, prefixes: np.ndarray, count: int, window: int) -> np.ndarray:
+        """Return the means ending at each of the last `count` prefixes."""
+        offset = prefixes.shape[1] - count
+        out = np.full(count, np.nan)
+        first = max(window - offset, 0)
+        if first < count:
+            upper = prefixes[:, offset + first :]
+            lower = prefixes[:, offset + first - window : -window]
+            sums = (upper[0] - lower[0]) + (upper[1] - lower[1])
+            out[first:] = sums / window + self.reference
+        return out
+
+
+class WindowMeans:
+    """Simple moving averages of one series for any window.
+
+    The compensated prefix sums are built once; each window's means are
+    then a single vectorized difference of them.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.count = len(values)
+        self._kernel = RollingMeans([1])
+        self._prefixes = self._kernel.prefixes(values)
+
+    def mean(self, window: int) -> np.ndarray:
+        """Return the means of `window` values (NaN until the window fills)."""
+        if window < 1:
+            raise ValueError("windows must be positive")
+        return self._kernel.window_means(self._prefixes, self.count, window)
+
+
+def rolling_means(values, windows) -> dict[int, np.ndarray]:
+    """Return simple moving averages of finite values for several windows."""
+    with section("indicators:rolling_means"):
+        return RollingMeans(windows).update(values)
+
+
+class IndicatorCache:
+    """Per-run cache of fetched data and derived indicator series.
+
+    Histories are fetched once per (ticker, request) and the compensated
+    prefix sums of their closes are built once, so several alerts on the
+    same ticker share a single fetch and every SMA window is one difference.
+    """
+
+    def __init__(self):
+        self._quotes: dict[str, Quote | None] = {}
+        self._histories: dict[tuple, object] = {}
+        self._indicators: dict[tuple, np.ndarray] = {}
+        self._means: dict[tuple, WindowMeans] = {}
+
+    def quote(self, ticker: str, fetch: Callable[[str], Quote | None]) -> Quote | None:
+        """Return the quote for ticker, fetching it on first use."""
+        if ticker not in self._quotes:
+            self._quotes[ticker] = fetch(ticker)
+        return self._quotes[ticker]
+
+    def prefetch_quotes(
+        self, tickers: list[str], fetch: Callable[[list[str]], dict]
+    ) -> None:
+        """Fetch the quotes of tickers not cached yet with one fetch call.
+
+        Tickers left without a quote are fetched on their own by quote(), so
+        a failed request is counted against the alert that needs it.
+        """
+        missing = [
+            ticker for ticker in dict.fromkeys(tickers) if ticker not in self._quotes
+        ]
+        if missing:
+            for ticker, quote in fetch(missing).items():
+                if quote is not None:
+                    self._quotes[ticker] = quote
+
+    def history(self, ticker: str, fetch: Callable, **kwargs):
+        """Return fetch(ticker, **kwargs), calling it once per distinct request."""
+        key = (ticker, tuple(sorted(kwargs.items())))
+        if key not in self._histories:
+            self._histories[key] = fetch(ticker, **kwargs)
+        return self._histories[key]
+
+    def closes(
+        self, ticker: str, period: str, interval: str, fetch: Callable
+    ) -> np.ndarray | None:
+        """Return the non-missing closes of a cached history as float64."""
+        history = self.history(ticker, fetch, period=period, interval=interval)
+        if history is None or history.empty:
+            return None
+        key = (ticker, period, interval, "close")
+        if key not in self._indicators:
+            self._indicators[key] = history["Close"].dropna().to_numpy(dtype=float)
+        return self._indicators[key]
+
+    def sma(
+        self, ticker: str, period: str, interval: str, window: int, fetch: Callable
+    ) -> np.ndarray | None:
+        """Return the simple moving average series (NaN until the window fills)."""
+        key = (ticker, period, interval, "sma", window)
+        if key not in self._indicators:
+            means = self._window_means(ticker, period, interval, fetch)
+            if means is None:
+                return None
+            self._indicators[key] = means.mean(window)
+        return self._indicators[key]
+
+    def _window_means(
+        self, ticker: str, period: str, interval: str, fetch: Callable
+    ) -> WindowMeans | None:
+        key = (ticker, period, interval)
+        if key not in self._means:
+            closes = self.closes(ticker, period, interval, fetch)
+            if closes is None:
+                return None
+            with section("indicators:prefix_sums"):
+                self._means[key] = WindowMeans(closes)
+        return self._means[key]
+
+
+class StateStore:
+    """JSON file of persisted incremental strategy state keyed by alert."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._states: dict[str, dict] | None = None
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        if self._states is None:
+            try:
+                with open(self.path) as f:
+                    self._states = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._states = {}
+        return self._states
+
+    def get(self, key: str) -> dict | None:
+        return self._load().get(key)
+
+    def set(self, key: str, state: dict) -> None:
+        self._load()[key] = state
+        self._dirty = True
+
+    def retain(self, keep: Callable[[str], bool]) -> int:
+        """Drop states whose key fails `keep`. Returns how many were dropped."""
+        states = self._load()
+        stale = [key for key in states if not keep(key)]
+        for key in stale:
+            del states[key]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def save(self) -> None:
+        """Write the store to disk if anything changed."""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp, "w") as f:
+            json.dump(self._states, f, separators=(",", ":"))
+        os.replace(temp, self.path)
+        self._dirty = False
+
+
+_STORES: dict[str, StateStore] = {}
+
+
+def get_state_store() -> StateStore | None:
+    """Return the store configured by STOTIFY_STATE_PATH, if any."""
+    path = os.environ.get(STATE_PATH_ENV)
+    if not path:
+        return None
+    if path not in _STORES:
+        _STORES[path] = StateStore(path)
+    return _STORES[path]
@@ -0,0 +1,168 @@
+"""End-to-end notifier load test against the local ntfy stub.
+
+run_load_test() writes a config whose threshold alerts fire for every
+ticker, routes it to an ntfy notifier pointed at an NtfyStub, and runs
+stotify.main.main on it with quotes served by a constant-price feed. The
+result compares what main reported sending with what the stub accepted,
+along with notifications per second and notify latency percentiles.
+
+    python -m stotify.loadtest --signals 5000 --rate-limit 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from stotify.main import main as run_main
+from stotify.ntfy_stub import NtfyStub
+from stotify.strategies import get_series, use_feed
+
+PRICE = 100.0
+TOPIC_PREFIX = "load"
+
+
+class ConstantFeed:
+    """Feed quoting every ticker at one price."""
+
+    def __init__(self, price: float = PRICE):
+        self.price = price
+
+    def latest(
+        self, strategy: str, ticker: str, params: dict, interval: str | None
+    ) -> tuple[float, dict]:
+        frame = pd.DataFrame({"Close": [self.price]})
+        return self.price, get_series(strategy)(frame, params).iloc[-1].to_dict()
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    """Delivery counts and throughput of one load test run."""
+
+    signals: int
+    sent: int
+    failed: int
+    accepted: int
+    statuses: dict[int, int]
+    seconds: float
+    per_second: float
+    p50: float
+    p99: float
+
+
+def load_config(signals: int, groups: int, base_url: str) -> dict:
+    """Return a config firing one threshold signal per ticker, `signals` in all."""
+    tickers = [f"T{index:05d}" for index in range(signals)]
+    return {
+        "groups": {
+            f"load-{group}": [
+                {
+                    "tickers": tickers[group::groups],
+                    "strategy": "threshold",
+                    "timeframe": "1d",
+                    "params": {"high": PRICE / 2},
+                }
+            ]
+            for group in range(groups)
+            if tickers[group::groups]
+        },
+        "notifiers": {
+            "stub": {"type": "ntfy", "base_url": base_url, "prefix": TOPIC_PREFIX}
+        },
+    }
+
+
+def run_load_test(
+    signals: int = 1000,
+    groups: int = 4,
+    latency: float = 0.0,
+    rate_limit: int | None = None,
+    window: float = 1.0,
+    error_every: int = 0,
+) -> LoadResult:
+    """Send `signals` notifications through stotify.main to a fresh stub."""
+    with (
+        NtfyStub(
+            latency=latency,
+            rate_limit=rate_limit,
+            window=window,
+            error_every=error_every,
+        ) as stub,
+        tempfile.TemporaryDirectory() as workdir,
+    ):
+        config_path = Path(workdir) / "alerts.json"
+        report_path = Path(workdir) / "report.json"
+        config_path.write_text(json.dumps(load_config(signals, groups, stub.url)))
+        # Failed sends are counted in the report; don't log each one.
+        notifier_logger = logging.getLogger("stotify.notifier")
+        level = notifier_logger.level
+        notifier_logger.setLevel(logging.CRITICAL)
+        try:
+            with (
+                use_feed(ConstantFeed()),
+                open(os.devnull, "w") as devnull,
+                redirect_stdout(devnull),
+            ):
+                exit_code = run_main(
+                    str(config_path),
+                    skip_market_check=True,
+                    report_path=str(report_path),
+                )
+        finally:
+            notifier_logger.setLevel(level)
+        if exit_code != 0:
+            raise RuntimeError(f"stotify.main exited with {exit_code}")
+        report = json.loads(report_path.read_text())
+        accepted = len(stub.messages)
+        statuses = dict(stub.statuses)
+
+    seconds = report["duration"]
+    latency_stats = report["notify_latency"]
+    return LoadResult(
+        signals=signals,
+        sent=report["sent"],
+        failed=signals - report["sent"],
+        accepted=accepted,
+        statuses=statuses,
+        seconds=seconds,
+        per_second=round(report["sent"] / seconds, 1) if seconds else 0.0,
+        p50=latency_stats.get("p50", 0.0),
+        p99=latency_stats.get("p99", 0.0),
+    )
+
+
+def main(args: list[str] | None = None) -> int:
+    """Print a load test result as JSON. Exits 1 if deliveries went missing."""
+    parser = argparse.ArgumentParser(description="Load test notification delivery.")
+    parser.add_argument("--signals", type=int, default=1000)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int)
+    parser.add_argument("--window", type=float, default=1.0)
+    parser.add_argument("--error-every", type=int, default=0)
+    parsed = parser.parse_args(args)
+
+    result = run_load_test(
+        signals=parsed.signals,
+        groups=parsed.groups,
+        latency=parsed.latency,
+        rate_limit=parsed.rate_limit,
+        window=parsed.window,
+        error_every=parsed.error_every,
+    )
+    print(json.dumps(asdict(result)))
+    # Every send main counted as delivered must have reached the server.
+    return 0 if result.sent == result.accepted else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
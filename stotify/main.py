@@ -3,204 +3,359 @@
 import argparse
 import json
 import os
-import re
 import sys
-from pathlib import Path
-
-from stotify.market_hours import is_market_open
-from stotify.notifier import send_alert
-from stotify.strategies import get_strategy
-
-TIMEFRAME_PATTERN = re.compile(r"^\d+(m|h|d)$")
-
-
-def is_valid_group_name(name: str) -> bool:
-    """Check if group name is valid ntfy.sh channel name."""
-    if not name:
-        return False
-    if len(name) > 100:
-        return False
-    return bool(re.match(r"^[a-zA-Z0-9_-]+$", name))
-
-
-def is_valid_timeframe(timeframe: str) -> bool:
-    """Check if timeframe matches supported patterns (e.g., 15m, 6h, 1d)."""
-    return bool(TIMEFRAME_PATTERN.match(timeframe))
-
-
-def extract_tickers(alert: dict, group_name: str) -> list[str]:
-    """Return a list of tickers for an alert, validating the input."""
-    if "tickers" in alert and "ticker" in alert:
-        raise ValueError(
-            f"Alert in group '{group_name}' cannot define both 'ticker' and 'tickers'"
-        )
-    if "tickers" in alert:
-        tickers = alert["tickers"]
-        if not isinstance(tickers, list) or not tickers:
-            raise ValueError(f"Alert in group '{group_name}' has invalid 'tickers'")
-        if not all(isinstance(t, str) and t for t in tickers):
-            raise ValueError(f"Alert in group '{group_name}' has invalid 'tickers'")
-        return tickers
-    if "ticker" in alert:
-        ticker = alert["ticker"]
-        if not isinstance(ticker, str) or not ticker:
-            raise ValueError(f"Alert in group '{group_name}' has invalid 'ticker'")
-        return [ticker]
-    raise ValueError(f"Alert in group '{group_name}' missing 'ticker' or 'tickers'")
-
-
-def validate_alert(alert: dict, group_name: str) -> None:
-    """Validate a single alert configuration."""
-    if "strategy" not in alert:
-        raise ValueError(f"Alert in group '{group_name}' missing 'strategy'")
-    if "timeframe" not in alert:
-        raise ValueError(f"Alert in group '{group_name}' missing 'timeframe'")
-    if not isinstance(alert["timeframe"], str) or not is_valid_timeframe(
-        alert["timeframe"]
-    ):
-        raise ValueError(f"Alert in group '{group_name}' has invalid timeframe")
-
-    tickers = extract_tickers(alert, group_name)
-
-    if "params" not in alert or not isinstance(alert["params"], dict):
-        raise ValueError(f"Alert in group '{group_name}' missing 'params'")
-
-    strategy_name = alert["strategy"]
-    try:
-        get_strategy(strategy_name)
-    except ValueError as exc:
-        raise ValueError(
-            f"Alert in group '{group_name}' has invalid strategy '{strategy_name}'"
-        ) from exc
-
-    params = alert["params"]
-    if strategy_name == "threshold":
-        if "high" not in params and "low" not in params:
-            ticker_label = ", ".join(tickers)
-            raise ValueError(
-                f"Alert for {ticker_label} in group '{group_name}' must have "
-                "'high' or 'low' in params"
-            )
-    elif strategy_name == "ma_cross":
-        for key in ("fast_window", "slow_window"):
-            if key not in params:
-                raise ValueError(
-                    f"Alert in group '{group_name}' missing '{key}' in params"
-                )
-            if not isinstance(params[key], int) or params[key] <= 0:
-                raise ValueError(
-                    f"Alert in group '{group_name}' has invalid '{key}' value"
-                )
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from contextlib import nullcontext, redirect_stdout
+from datetime import datetime
+
+from stotify.bars import is_intraday
+from stotify.indicators import IndicatorCache
+from stotify.market_hours import ET, is_market_open
+from stotify.notifier import Dispatcher, send_alert
+from stotify.price_matrix import PriceMatrices
+from stotify.profiling import MODES as PROFILE_MODES
+from stotify.profiling import profiled, section
+from stotify.replay import NotificationRecorder, RecordedNotification, ReplayFeed
+from stotify.report import (
+    FIRED,
+    NO_DATA,
+    NOT_MET,
+    NOTIFY_FAILED,
+    SKIPPED_MARKET_HOURS,
+    SKIPPED_SCHEDULE,
+    SKIPPED_TIMEFRAME,
+    AlertOutcome,
+    RunReport,
+    data_freshness,
+)
+from stotify.schedule import NOTHING_DUE_EXIT_CODE, due_timeframes, plan_run
+from stotify.shard import parse_shard, shard_config
+from stotify.stock import cache_stats, failure_count, last_failure, quote_stats
+from stotify.strategies import (
+    SIGNAL_MATRIX,
+    get_strategy,
+    prefetch_quotes,
+    save_state,
+    track_data_times,
+    use_feed,
+    use_indicator_cache,
+    use_price_matrices,
+    use_timeframe,
+    uses_quotes,
+)
+from stotify.validation import extract_tickers, is_valid_timeframe, load_config
+
+SKIP_MESSAGES = {
+    SKIPPED_MARKET_HOURS: "market hours",
+    SKIPPED_TIMEFRAME: "timeframe mismatch",
+    SKIPPED_SCHEDULE: "schedule",
+}
+
+
+def _outcome(
+    group_name: str, alert: dict, tickers: list[str], outcome: str, **details
+) -> AlertOutcome:
+    return AlertOutcome(
+        group=group_name,
+        strategy=alert["strategy"],
+        timeframe=alert["timeframe"],
+        tickers=tuple(tickers),
+        outcome=outcome,
+        **details,
+    )
 
 
-def load_config(path: str | Path) -> dict:
-    """Load and validate alerts.json config."""
-    with open(path) as f:
-        config = json.load(f)
+def _timed(future: Future, report: RunReport, started: float) -> Future:
+    """Return a future resolving like `future` once its notify latency is recorded."""
+    timed = Future()
 
-    if "groups" not in config or not isinstance(config["groups"], dict):
-        raise ValueError("Config must have 'groups' object")
+    def done(sent: Future) -> None:
+        report.notify_seconds.append(time.perf_counter() - started)
+        error = sent.exception()
+        if error is not None:
+            timed.set_exception(error)
+        else:
+            timed.set_result(sent.result())
 
-    for group_name, alerts in config["groups"].items():
-        # Validate group name
-        if not group_name:
-            raise ValueError("Group name cannot be empty")
-        if len(group_name) > 100:
-            raise ValueError(f"Group name '{group_name}' exceeds 100 characters")
-        if not is_valid_group_name(group_name):
-            raise ValueError(
-                f"Group name '{group_name}' contains invalid characters "
-                "(only a-z, A-Z, 0-9, -, _ allowed)"
-            )
+    future.add_done_callback(done)
+    return timed
 
-        # Validate group has alerts
-        if not alerts or not isinstance(alerts, list):
-            raise ValueError(f"Group '{group_name}' has no alerts")
 
-        # Validate each alert
-        for alert in alerts:
-            validate_alert(alert, group_name)
-
-    return config
+def _matrix_tickers(config: dict) -> list[str]:
+    """Return the tickers of alerts that can be evaluated from price matrices."""
+    return [
+        ticker
+        for group_name, alerts in config["groups"].items()
+        for alert in alerts
+        if alert["strategy"] in SIGNAL_MATRIX
+        and not is_intraday(alert["params"].get("interval", alert["timeframe"]))
+        for ticker in extract_tickers(alert, group_name)
+    ]
 
 
 def check_alerts(
     config: dict,
     skip_market_check: bool = False,
     timeframe_filter: str | None = None,
+    now: datetime | None = None,
+    send: Callable[..., bool] | None = None,
+    cadence: str | None = None,
+    report: RunReport | None = None,
+    matrix: bool = False,
 ) -> int:
-    """Process all alerts. Returns count of notifications sent."""
-    market_open = is_market_open()
+    """Process all alerts. Returns count of notifications sent.
+
+    `now` overrides the clock used for the market hours check and `send`
+    replaces send_alert (e.g. with a recorder during a replay); otherwise
+    alerts go to the notifiers the config routes each group to. With a
+    scheduler `cadence` (e.g. 15m), only timeframes due at `now` are evaluated.
+    Each alert's outcome is recorded in `report` if one is given. With
+    `matrix`, strategies that support it evaluate daily bars from one aligned
+    price matrix per bar request, fetched in bulk for every such alert.
+    An alert's signals are all queued on the notifiers before any result is
+    awaited, so each backend delivers them over its own worker pool.
+    """
+    dispatcher = None
+    if send is None and config.get("notifiers"):
+        dispatcher = Dispatcher.from_config(config)
+    send = send or send_alert
+
+    def submit(*args, **kwargs) -> Future:
+        if dispatcher is not None:
+            return dispatcher.submit_alert(*args, **kwargs)
+        future = Future()
+        future.set_result(send(*args, **kwargs))
+        return future
+
+    report = report if report is not None else RunReport()
+    market_open = is_market_open(now)
     if not skip_market_check and not market_open:
         print("Market is closed; skipping non-1d alerts")
+    due = None
+    if cadence:
+        timeframes = {
+            alert["timeframe"]
+            for alerts in config["groups"].values()
+            for alert in alerts
+        }
+        due = set(due_timeframes(timeframes, now, cadence, skip_market_check))
+
+    def skip_reason(alert: dict) -> str | None:
+        if not skip_market_check and not market_open and alert["timeframe"] != "1d":
+            return SKIPPED_MARKET_HOURS
+        if timeframe_filter and alert["timeframe"] != timeframe_filter:
+            return SKIPPED_TIMEFRAME
+        if due is not None and alert["timeframe"] not in due:
+            return SKIPPED_SCHEDULE
+        return None
+
+    matrices = PriceMatrices(_matrix_tickers(config)) if matrix else None
 
     sent = 0
-    for group_name, alerts in config["groups"].items():
-        for alert in alerts:
-            if not skip_market_check and not market_open and alert["timeframe"] != "1d":
-                print(
-                    "Skipping alert due to market hours: "
-                    f"group={group_name} "
-                    f"strategy={alert['strategy']} "
-                    f"timeframe={alert['timeframe']}"
-                )
-                continue
-
-            if timeframe_filter and alert["timeframe"] != timeframe_filter:
-                print(
-                    "Skipping alert due to timeframe mismatch: "
-                    f"group={group_name} "
-                    f"strategy={alert['strategy']} "
-                    f"timeframe={alert['timeframe']}"
-                )
-                continue
-
-            strategy = get_strategy(alert["strategy"])
-            tickers = extract_tickers(alert, group_name)
-            signals = strategy(tickers, alert["params"])
-            if not signals:
-                print(
-                    "No notification sent: "
-                    f"group={group_name} "
-                    f"strategy={alert['strategy']} "
-                    f"tickers={','.join(tickers)} "
-                    "reason=conditions not met"
-                )
-            for signal in signals:
-                if send_alert(
-                    signal.ticker,
-                    signal.price,
-                    signal.alert_type,
-                    signal.threshold,
-                    group_name,
-                    message=signal.message,
-                ):
-                    sent += 1
-                    details = (
-                        signal.message
-                        if signal.message
-                        else f"price=${signal.price:.2f} threshold={signal.threshold}"
+    with (
+        use_indicator_cache(IndicatorCache()),
+        use_price_matrices(matrices) if matrices else nullcontext(),
+        dispatcher or nullcontext(),
+    ):
+        prefetch_quotes(
+            [
+                ticker
+                for group_name, alerts in config["groups"].items()
+                for alert in alerts
+                if skip_reason(alert) is None and uses_quotes(alert)
+                for ticker in extract_tickers(alert, group_name)
+            ]
+        )
+        for group_name, alerts in config["groups"].items():
+            for alert in alerts:
+                tickers = extract_tickers(alert, group_name)
+                reason = skip_reason(alert)
+                if reason is not None:
+                    print(
+                        f"Skipping alert due to {SKIP_MESSAGES[reason]}: "
+                        f"group={group_name} "
+                        f"strategy={alert['strategy']} "
+                        f"timeframe={alert['timeframe']}"
                     )
+                    report.add(_outcome(group_name, alert, tickers, reason))
+                    continue
+
+                strategy = get_strategy(alert["strategy"])
+                failures_before = failure_count()
+                started = time.perf_counter()
+                with (
+                    use_timeframe(alert["timeframe"]),
+                    track_data_times() as times,
+                    section(f"strategy:{alert['strategy']}"),
+                ):
+                    signals = strategy(tickers, alert["params"])
+                data_as_of, staleness = data_freshness(times, now or datetime.now(ET))
+                if failure_count() > failures_before:
                     print(
-                        "Notification sent: "
+                        "Data unavailable: "
                         f"group={group_name} "
-                        f"timeframe={alert['timeframe']} "
-                        f"ticker={signal.ticker} "
                         f"strategy={alert['strategy']} "
-                        f"details={details}"
+                        f"tickers={','.join(tickers)} "
+                        f"error={last_failure()}"
+                    )
+                if not signals:
+                    reason = (
+                        "data unavailable"
+                        if failure_count() > failures_before
+                        else "conditions not met"
                     )
-                else:
                     print(
-                        "Notification failed: "
+                        "No notification sent: "
                         f"group={group_name} "
-                        f"timeframe={alert['timeframe']} "
-                        f"ticker={signal.ticker} "
-                        f"strategy={alert['strategy']}"
+                        f"strategy={alert['strategy']} "
+                        f"tickers={','.join(tickers)} "
+                        f"reason={reason}"
+                    )
+                    report.add(
+                        _outcome(
+                            group_name,
+                            alert,
+                            tickers,
+                            NO_DATA if reason == "data unavailable" else NOT_MET,
+                            data_as_of=data_as_of,
+                            staleness=staleness,
+                            seconds=round(time.perf_counter() - started, 4),
+                        )
                     )
+                    continue
+                # Queue every signal before waiting on any, so each backend's
+                # pool delivers them concurrently.
+                pending = []
+                for signal in signals:
+                    send_started = time.perf_counter()
+                    with section("notify"):
+                        future = submit(
+                            signal.ticker,
+                            signal.price,
+                            signal.alert_type,
+                            signal.threshold,
+                            group_name,
+                            message=signal.message,
+                        )
+                    pending.append((signal, _timed(future, report, send_started)))
+                delivered = 0
+                for signal, future in pending:
+                    ok = future.result()
+                    if ok:
+                        delivered += 1
+                        details = (
+                            signal.message
+                            if signal.message
+                            else (
+                                f"price=${signal.price:.2f} "
+                                f"threshold={signal.threshold}"
+                            )
+                        )
+                        print(
+                            "Notification sent: "
+                            f"group={group_name} "
+                            f"timeframe={alert['timeframe']} "
+                            f"ticker={signal.ticker} "
+                            f"strategy={alert['strategy']} "
+                            f"details={details}"
+                        )
+                    else:
+                        print(
+                            "Notification failed: "
+                            f"group={group_name} "
+                            f"timeframe={alert['timeframe']} "
+                            f"ticker={signal.ticker} "
+                            f"strategy={alert['strategy']}"
+                        )
+                sent += delivered
+                report.add(
+                    _outcome(
+                        group_name,
+                        alert,
+                        tickers,
+                        FIRED if delivered == len(signals) else NOTIFY_FAILED,
+                        signals=len(signals),
+                        sent=delivered,
+                        data_as_of=data_as_of,
+                        staleness=staleness,
+                        seconds=round(time.perf_counter() - started, 4),
+                    )
+                )
 
+    save_state()
     return sent
 
 
+def _with_timeframes(config: dict, timeframes: set[str]) -> dict:
+    """Return config with only the alerts of the given timeframes."""
+    groups = {}
+    for group_name, alerts in config["groups"].items():
+        kept = [alert for alert in alerts if alert["timeframe"] in timeframes]
+        if kept:
+            groups[group_name] = kept
+    return {**config, "groups": groups}
+
+
+def replay_alerts(
+    config: dict,
+    start: datetime,
+    end: datetime,
+    interval: str = "15m",
+    timeframe_filter: str | None = None,
+) -> list[RecordedNotification]:
+    """Replay check_alerts bar by bar over a date range.
+
+    The clock steps through `interval` bars and check_alerts runs at each step
+    with `interval` as its scheduler cadence, so every alert is evaluated once
+    per bar of its own timeframe, as the scheduled runs would. Strategies only
+    see bars completed by the simulated time, the market hours check follows
+    the simulated clock, and notifications are recorded instead of sent.
+    """
+    if start.tzinfo is None:
+        start = ET.localize(start)
+    if end.tzinfo is None:
+        end = ET.localize(end)
+
+    feed = ReplayFeed(start, end, interval)
+    feed.preload(
+        sorted(
+            {
+                ticker
+                for group_name, alerts in config["groups"].items()
+                for alert in alerts
+                for ticker in extract_tickers(alert, group_name)
+            }
+        )
+    )
+    recorder = NotificationRecorder(feed)
+
+    timeframes = {
+        alert["timeframe"] for alerts in config["groups"].values() for alert in alerts
+    }
+    # Steps only pass check_alerts the alerts due then; skipping the rest
+    # would just fill a discarded report with schedule skips.
+    due_configs: dict[tuple[str, ...], dict] = {}
+    with use_feed(feed), open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for now in feed.clock():
+            due = tuple(due_timeframes(timeframes, now, interval))
+            if not due:
+                continue
+            if due not in due_configs:
+                due_configs[due] = _with_timeframes(config, set(due))
+            feed.advance(now)
+            check_alerts(
+                due_configs[due],
+                timeframe_filter=timeframe_filter,
+                now=now,
+                send=recorder,
+                cadence=interval,
+            )
+
+    return recorder.notifications
+
+
 def parse_args(args: list[str]) -> argparse.Namespace:
     """Parse CLI arguments."""
     parser = argparse.ArgumentParser(description="Run stock alert checks.")
@@ -220,6 +375,58 @@ def parse_args(args: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Skip market hours check",
     )
+    parser.add_argument(
+        "--cadence",
+        default=os.environ.get("STOTIFY_CADENCE"),
+        help="How often the scheduler runs (e.g., 15m); only due timeframes run",
+    )
+    parser.add_argument(
+        "--shard",
+        default=os.environ.get("STOTIFY_SHARD"),
+        help="Only evaluate this runner's share of tickers (e.g., 2/4)",
+    )
+    parser.add_argument(
+        "--report",
+        default=os.environ.get("STOTIFY_REPORT"),
+        help="Write a run report to this path (.json or .parquet)",
+    )
+    parser.add_argument(
+        "--history",
+        default=os.environ.get("STOTIFY_HISTORY"),
+        help="Append the run summary to this rolling JSON-lines history file",
+    )
+    parser.add_argument(
+        "--profile",
+        default=os.environ.get("STOTIFY_PROFILE"),
+        help="Profile the run and write it next to this path (e.g., profiles/run)",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=PROFILE_MODES,
+        default=os.environ.get("STOTIFY_PROFILE_MODE", "cprofile"),
+        help="cprofile writes .pstats; sample writes flamegraph .collapsed stacks",
+    )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help="Evaluate daily bars of all tickers at once from shared price matrices",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the timeframes due now and exit 3 if nothing is due",
+    )
+    parser.add_argument(
+        "--replay",
+        nargs=2,
+        metavar=("START", "END"),
+        help="Replay alerts over historical bars between two dates (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--replay-interval",
+        default="15m",
+        help="Bar size used to step the replay clock (e.g., 15m, 1d)",
+    )
     return parser.parse_args(args)
 
 
@@ -227,8 +434,26 @@ def main(
     config_path: str = "alerts.json",
     timeframe_filter: str | None = None,
     skip_market_check: bool = False,
+    replay: tuple[str, str] | None = None,
+    replay_interval: str = "15m",
+    cadence: str | None = None,
+    plan: bool = False,
+    shard: str | None = None,
+    report_path: str | None = None,
+    history_path: str | None = None,
+    profile_path: str | None = None,
+    profile_mode: str = "cprofile",
+    matrix: bool = False,
 ) -> int:
-    """Entry point. Returns 0 on success, 1 on config error."""
+    """Entry point. Returns 0 on success, 1 on config error.
+
+    With `plan`, returns NOTHING_DUE_EXIT_CODE when no timeframe is due.
+    With `shard` (e.g. 2/4), only that shard's tickers are evaluated. A run
+    report is written to `report_path` (JSON, or Parquet for .parquet) and its
+    summary appended to the rolling `history_path`. With `profile_path`, the
+    alert checks are profiled (see stotify.profiling.profiled). `matrix`
+    turns on price matrix evaluation (see check_alerts).
+    """
     try:
         config = load_config(config_path)
     except (json.JSONDecodeError, ValueError, FileNotFoundError) as e:
@@ -239,15 +464,118 @@ def main(
         print("Config error: Invalid timeframe filter", file=sys.stderr)
         return 1
 
-    sent = check_alerts(
-        config,
-        skip_market_check=skip_market_check,
-        timeframe_filter=timeframe_filter,
-    )
+    if cadence and not is_valid_timeframe(cadence):
+        print("Config error: Invalid cadence", file=sys.stderr)
+        return 1
+
+    if shard:
+        try:
+            config = shard_config(config, *parse_shard(shard))
+        except ValueError:
+            print("Config error: Invalid shard", file=sys.stderr)
+            return 1
+
+    if plan:
+        result = plan_run(
+            config,
+            cadence=cadence or "15m",
+            skip_market_check=skip_market_check,
+            timeframe_filter=timeframe_filter,
+        )
+        print(json.dumps(result))
+        return 0 if result["due"] else NOTHING_DUE_EXIT_CODE
+
+    if replay:
+        try:
+            start, end = (datetime.fromisoformat(value) for value in replay)
+        except ValueError:
+            print("Config error: Invalid replay date range", file=sys.stderr)
+            return 1
+        notifications = replay_alerts(
+            config,
+            start,
+            end,
+            interval=replay_interval,
+            timeframe_filter=timeframe_filter,
+        )
+        for notification in notifications:
+            details = (
+                notification.message
+                if notification.message
+                else (
+                    f"price=${notification.price:.2f} "
+                    f"threshold={notification.threshold}"
+                )
+            )
+            print(
+                "Would notify: "
+                f"time={notification.timestamp.isoformat()} "
+                f"group={notification.group_name} "
+                f"ticker={notification.ticker} "
+                f"details={details}"
+            )
+        print(f"Replay produced {len(notifications)} alert(s)")
+        return 0
+
+    report = RunReport()
+    started = time.perf_counter()
+    with profiled(profile_path, profile_mode) as profile:
+        sent = check_alerts(
+            config,
+            skip_market_check=skip_market_check,
+            timeframe_filter=timeframe_filter,
+            cadence=cadence,
+            report=report,
+            matrix=matrix,
+        )
     print(f"Sent {sent} alert(s)")
+    for path in profile.files:
+        print(f"Profile written: {path}")
+    stats = cache_stats()
+    report.summary = {
+        "shard": shard or "1/1",
+        "duration": round(time.perf_counter() - started, 3),
+        "alerts": len(report.outcomes),
+        "tickers": len(
+            {ticker for outcome in report.outcomes for ticker in outcome.tickers}
+        ),
+        "sent": sent,
+        "notify_latency": report.notify_latency(),
+        "data_failures": failure_count(),
+        "cache": stats,
+        "quotes": quote_stats(),
+    }
+    if report_path:
+        report.write(report_path)
+    if history_path:
+        report.append_history(history_path)
+    print(
+        "Data cache: "
+        f"hits={stats['hits']} "
+        f"misses={stats['misses']} "
+        f"coalesced={stats['coalesced']}"
+    )
+    if failure_count():
+        print(f"Data requests failed: {failure_count()}", file=sys.stderr)
     return 0
 
 
 if __name__ == "__main__":
     parsed = parse_args(sys.argv[1:])
-    sys.exit(main(parsed.config, parsed.timeframe, parsed.skip_market_check))
+    sys.exit(
+        main(
+            parsed.config,
+            parsed.timeframe,
+            parsed.skip_market_check,
+            parsed.replay,
+            parsed.replay_interval,
+            parsed.cadence,
+            parsed.plan,
+            parsed.shard,
+            parsed.report,
+            parsed.history,
+            parsed.profile,
+            parsed.profile_mode,
+            parsed.matrix,
+        )
+    )
@@ -1,25 +1,56 @@
 """Trading hours detection for US stock market."""
 
-from datetime import datetime, time
+import re
+from datetime import datetime, time, timedelta
 
 import pytz
 
 ET = pytz.timezone("America/New_York")
 MARKET_OPEN = time(9, 30)
 MARKET_CLOSE = time(16, 0)
+INTRADAY_INTERVAL_PATTERN = re.compile(r"^(\d+)(m|h)$")
+
+
+def _to_et(dt: datetime | None) -> datetime:
+    if dt is None:
+        return datetime.now(ET)
+    if dt.tzinfo is None:
+        return ET.localize(dt)
+    return dt.astimezone(ET)
 
 
 def is_market_open(dt: datetime | None = None) -> bool:
     """Check if US stock market is open. Does not account for holidays."""
-    if dt is None:
-        dt = datetime.now(ET)
-    elif dt.tzinfo is None:
-        dt = ET.localize(dt)
-    else:
-        dt = dt.astimezone(ET)
+    dt = _to_et(dt)
 
     # Weekday check (Mon=0, Fri=4)
     if dt.weekday() > 4:
         return False
 
     return MARKET_OPEN <= dt.time() < MARKET_CLOSE
+
+
+def next_bar_close(interval: str, dt: datetime | None = None) -> datetime:
+    """Return when the bar containing dt completes. Does not account for holidays.
+
+    Intraday bars are anchored at the session open; daily and longer bars
+    complete at the session close. Outside the session this is the close of
+    the next session's first bar (or the next session close).
+    """
+    dt = _to_et(dt)
+    match = INTRADAY_INTERVAL_PATTERN.match(interval)
+    day = dt.date()
+    while True:
+        if day.weekday() <= 4:
+            session_open = ET.localize(datetime.combine(day, MARKET_OPEN))
+            session_close = ET.localize(datetime.combine(day, MARKET_CLOSE))
+            if dt < session_close:
+                if not match:
+                    return session_close
+                minutes = int(match.group(1)) * (60 if match.group(2) == "h" else 1)
+                length = timedelta(minutes=minutes)
+                elapsed = max(dt - session_open, -length)
+                bars = elapsed // length + 1
+                return min(session_open + bars * length, session_close)
+        day += timedelta(days=1)
+        dt = ET.localize(datetime.combine(day, time(0, 0)))
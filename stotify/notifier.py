@@ -1,12 +1,40 @@
-"""ntfy.sh notification sending."""
+"""Alert notification backends: ntfy, webhooks, Slack, SMTP email and a file sink.
 
+send_alert() posts to ntfy.sh, which is all a config without notifiers uses.
+Configs can declare named backends and route groups to them:
+
+    "notifiers": {
+        "phone": {"type": "ntfy", "base_url": "https://ntfy.example.com"},
+        "team": {"type": "slack", "url": "${SLACK_WEBHOOK_URL}"}
+    },
+    "routes": {"portfolio": ["phone", "team"], "*": ["phone"]}
+
+Groups without a route use the "*" route, or every backend if there is
+none. `${VAR}` in option values is read from the environment. A Dispatcher
+sends each alert to all of its group's backends at once, so delivery takes
+as long as the slowest backend; every backend has its own worker pool and,
+for HTTP backends, a connection pool of the same size. submit_alert()
+queues an alert without waiting, so a batch of alerts fills those pools.
+"""
+
+import inspect
+import json
 import logging
 import os
+import smtplib
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from email.message import EmailMessage
+from typing import Self
 
 import requests
+from requests.adapters import HTTPAdapter
 
 NTFY_BASE_URL = "https://ntfy.sh"
 DEFAULT_PREFIX = "stotify"
+DEFAULT_ROUTE = "*"
 
 logger = logging.getLogger(__name__)
 
@@ -18,31 +46,375 @@ def get_channel(group_name: str, prefix: str | None = None) -> str:
     return f"{prefix}-{group_name}"
 
 
-def send_alert(
+def format_message(
     ticker: str,
     price: float,
     alert_type: str | None,
     threshold: float | None,
     group_name: str,
     message: str | None = None,
-) -> bool:
-    """Send price alert to ntfy.sh. Returns True on success, logs errors."""
-    channel = get_channel(group_name)
-    url = f"{NTFY_BASE_URL}/{channel}"
-
+) -> str:
+    """Return the text of an alert, prefixed with its group."""
     if message is None:
         direction = "above" if alert_type == "high" else "below"
-        message = (
-            f"[{group_name}] {ticker} is ${price:.2f} "
-            f"({direction} ${threshold:.2f})"
-        )
-    else:
-        message = f"[{group_name}] {message}"
-
-    try:
-        response = requests.post(url, data=message, timeout=10)
+        return f"[{group_name}] {ticker} is ${price:.2f} ({direction} ${threshold:.2f})"
+    return f"[{group_name}] {message}"
+
+
+@dataclass(frozen=True)
+class Notification:
+    """One alert message on its way to a group's backends."""
+
+    group_name: str
+    ticker: str
+    message: str
+    price: float | None = None
+
+
+class Backend:
+    """A notification destination. send() raises on failure."""
+
+    pool_size = 1
+
+    def send(self, notification: Notification) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class _HTTPBackend(Backend):
+    """Base for backends that POST to a URL over a pooled session."""
+
+    def __init__(self, pool_size: int = 4, timeout: float = 10.0):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, url: str, **kwargs) -> None:
+        response = self.session.post(url, timeout=self.timeout, **kwargs)
         response.raise_for_status()
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send alert to {channel}: {e}")
-        return False
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class NtfyBackend(_HTTPBackend):
+    """ntfy.sh or a self-hosted ntfy server; one topic per group."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        prefix: str | None = None,
+        token: str | None = None,
+        pool_size: int = 4,
+        timeout: float = 10.0,
+    ):
+        super().__init__(pool_size, timeout)
+        self.base_url = (
+            base_url or os.environ.get("NTFY_BASE_URL") or NTFY_BASE_URL
+        ).rstrip("/")
+        self.prefix = prefix
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def send(self, notification: Notification) -> None:
+        channel = get_channel(notification.group_name, self.prefix)
+        self.post(f"{self.base_url}/{channel}", data=notification.message)
+
+
+class WebhookBackend(_HTTPBackend):
+    """Generic webhook receiving the notification as a JSON object."""
+
+    def __init__(
+        self,
+        url: str,
+        headers: dict | None = None,
+        pool_size: int = 4,
+        timeout: float = 10.0,
+    ):
+        super().__init__(pool_size, timeout)
+        self.url = url
+        self.session.headers.update(headers or {})
+
+    def send(self, notification: Notification) -> None:
+        self.post(self.url, json=asdict(notification))
+
+
+class SlackBackend(_HTTPBackend):
+    """Slack-compatible incoming webhook (Slack, Mattermost, Rocket.Chat)."""
+
+    def __init__(self, url: str, pool_size: int = 4, timeout: float = 10.0):
+        super().__init__(pool_size, timeout)
+        self.url = url
+
+    def send(self, notification: Notification) -> None:
+        self.post(self.url, json={"text": notification.message})
+
+
+class EmailBackend(Backend):
+    """Email over SMTP, reusing one connection across messages."""
+
+    def __init__(
+        self,
+        host: str,
+        sender: str,
+        recipients: list[str],
+        port: int = 587,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = recipients
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._smtp: smtplib.SMTP | None = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        return smtp
+
+    def send(self, notification: Notification) -> None:
+        email = EmailMessage()
+        email["Subject"] = f"[{notification.group_name}] {notification.ticker} alert"
+        email["From"] = self.sender
+        email["To"] = ", ".join(self.recipients)
+        email.set_content(notification.message)
+        with self._lock:
+            reused = self._smtp is not None
+            if not reused:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(email)
+            except smtplib.SMTPServerDisconnected:
+                self._smtp = None
+                if not reused:
+                    raise
+                # The server closed an idle connection; reconnect once.
+                self._smtp = self._connect()
+                self._smtp.send_message(email)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._smtp is not None:
+                try:
+                    self._smtp.quit()
+                except smtplib.SMTPException:
+                    pass
+                self._smtp = None
+
+
+class FileBackend(Backend):
+    """Appends notifications as JSON lines to a file, or stdout for '-'."""
+
+    def __init__(self, path: str = "-"):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, notification: Notification) -> None:
+        line = json.dumps(asdict(notification)) + "\n"
+        with self._lock:
+            if self.path == "-":
+                sys.stdout.write(line)
+                sys.stdout.flush()
+                return
+            with open(self.path, "a") as f:
+                f.write(line)
+
+
+BACKENDS: dict[str, type[Backend]] = {
+    "ntfy": NtfyBackend,
+    "webhook": WebhookBackend,
+    "slack": SlackBackend,
+    "email": EmailBackend,
+    "file": FileBackend,
+}
+
+
+def backend_options(kind: str) -> tuple[set[str], set[str]]:
+    """Return the (required, accepted) option names of a backend type."""
+    parameters = inspect.signature(BACKENDS[kind]).parameters
+    accepted = set(parameters)
+    required = {
+        name
+        for name, parameter in parameters.items()
+        if parameter.default is inspect.Parameter.empty
+    }
+    return required, accepted
+
+
+def _expand(value):
+    if isinstance(value, str):
+        return os.path.expandvars(value)
+    if isinstance(value, list):
+        return [_expand(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _expand(item) for key, item in value.items()}
+    return value
+
+
+def create_backend(options: dict) -> Backend:
+    """Build a backend from its alerts.json options."""
+    options = _expand(options)
+    return BACKENDS[options.pop("type")](**options)
+
+
+class Dispatcher:
+    """Delivers alerts to the backends their group is routed to, concurrently."""
+
+    def __init__(
+        self,
+        backends: dict[str, Backend],
+        routes: dict[str, list[str]] | None = None,
+    ):
+        self.backends = backends
+        self.routes = routes or {}
+        self._executors = {
+            name: ThreadPoolExecutor(
+                max_workers=backend.pool_size, thread_name_prefix=f"notify-{name}"
+            )
+            for name, backend in backends.items()
+        }
+
+    @classmethod
+    def from_config(cls, config: dict) -> Self:
+        """Build the backends and routes declared in a validated config."""
+        backends = {
+            name: create_backend(options)
+            for name, options in config.get("notifiers", {}).items()
+        }
+        return cls(backends, config.get("routes"))
+
+    def route(self, group_name: str) -> list[str]:
+        """Return the names of the backends a group's alerts go to."""
+        if group_name in self.routes:
+            return self.routes[group_name]
+        return self.routes.get(DEFAULT_ROUTE, list(self.backends))
+
+    def deliver(self, notification: Notification) -> dict[str, bool]:
+        """Send a notification to every backend of its group; report each result."""
+        names = self.route(notification.group_name)
+        if len(names) == 1:
+            # Nothing to fan out; skip the hop to a worker thread.
+            return {names[0]: self._send(names[0], notification)}
+        futures = {
+            name: self._executors[name].submit(self._send, name, notification)
+            for name in names
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+    def _send(self, name: str, notification: Notification) -> bool:
+        try:
+            self.backends[name].send(notification)
+            return True
+        except Exception as e:  # noqa: BLE001 - pluggable backends may raise anything
+            logger.error(
+                f"Failed to send alert to {name} "
+                f"for group {notification.group_name}: {e}"
+            )
+            return False
+
+    def send_alert(
+        self,
+        ticker: str,
+        price: float,
+        alert_type: str | None,
+        threshold: float | None,
+        group_name: str,
+        message: str | None = None,
+    ) -> bool:
+        """Send an alert to its group's backends. True if all delivered it."""
+        text = format_message(ticker, price, alert_type, threshold, group_name, message)
+        results = self.deliver(Notification(group_name, ticker, text, price))
+        return bool(results) and all(results.values())
+
+    def submit_alert(
+        self,
+        ticker: str,
+        price: float,
+        alert_type: str | None,
+        threshold: float | None,
+        group_name: str,
+        message: str | None = None,
+    ) -> Future:
+        """Queue an alert on its backends' pools without waiting for delivery.
+
+        The returned future resolves to what send_alert would have returned,
+        once the last backend has finished.
+        """
+        text = format_message(ticker, price, alert_type, threshold, group_name, message)
+        notification = Notification(group_name, ticker, text, price)
+        futures = [
+            self._executors[name].submit(self._send, name, notification)
+            for name in self.route(group_name)
+        ]
+        delivered: Future = Future()
+        if not futures:
+            delivered.set_result(False)
+            return delivered
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def finished(_future: Future) -> None:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            delivered.set_result(all(future.result() for future in futures))
+
+        for future in futures:
+            future.add_done_callback(finished)
+        return delivered
+
+    def close(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown()
+        for backend in self.backends.values():
+            backend.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+_default: Dispatcher | None = None
+_default_lock = threading.Lock()
+
+
+def default_dispatcher() -> Dispatcher:
+    """Return the shared dispatcher posting every group to ntfy."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Dispatcher({"ntfy": NtfyBackend()})
+        return _default
+
+
+def send_alert(
+    ticker: str,
+    price: float,
+    alert_type: str | None,
+    threshold: float | None,
+    group_name: str,
+    message: str | None = None,
+) -> bool:
+    """Send price alert to ntfy.sh. Returns True on success, logs errors."""
+    return default_dispatcher().send_alert(
+        ticker, price, alert_type, threshold, group_name, message
+    )
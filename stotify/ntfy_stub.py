@@ -0,0 +1,223 @@
+"""ntfy-compatible HTTP stub server for notifier tests and load tests.
+
+Messages are published with `POST /<topic>` (or PUT) as on ntfy, and
+`GET /<topic>/json?poll=1` returns those recorded for a topic as JSON
+lines. The stub can add latency to every request, answer every Nth
+request with a 5xx error, and throttle with 429s beyond `rate_limit`
+messages per `window` seconds.
+
+Run one for manual testing with `python -m stotify.ntfy_stub --port 8080`
+and point an ntfy notifier's base_url (or NTFY_BASE_URL) at it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+
+
+@dataclass(frozen=True)
+class StubMessage:
+    """A message the stub accepted."""
+
+    id: str
+    time: float
+    topic: str
+    message: str
+    title: str | None = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle and
+    # delayed ACKs add ~40ms to every keep-alive response.
+    disable_nagle_algorithm = True
+    server: _Server
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", errors="replace")
+        status, payload, headers = self.server.stub.publish(
+            self.path.partition("?")[0].strip("/"), body, self.headers.get("Title")
+        )
+        self._respond(status, json.dumps(payload) + "\n", headers)
+
+    do_PUT = do_POST
+
+    def do_GET(self) -> None:
+        topic, _, rest = self.path.strip("/").partition("/")
+        if not rest.startswith("json"):
+            self._respond(404, json.dumps({"error": "not found"}) + "\n")
+            return
+        lines = [
+            json.dumps({"event": "message", **asdict(message)}) + "\n"
+            for message in self.server.stub.topic_messages(topic)
+        ]
+        self._respond(200, "".join(lines))
+
+    def _respond(self, status: int, body: str, headers: dict | None = None) -> None:
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    stub: NtfyStub
+
+
+class NtfyStub:
+    """A local ntfy server that records messages and injects faults."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limit: int | None = None,
+        window: float = 1.0,
+        error_every: int = 0,
+        error_status: int = 503,
+    ):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.window = window
+        self.error_every = error_every
+        self.error_status = error_status
+        self.messages: list[StubMessage] = []
+        self.statuses: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._server = _Server((host, port), _Handler)
+        self._server.stub = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def publish(
+        self, topic: str, body: str, title: str | None = None
+    ) -> tuple[int, dict, dict]:
+        """Handle one publish; return (status, JSON payload, extra headers)."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self._requests += 1
+            now = time.monotonic()
+            if self.error_every and self._requests % self.error_every == 0:
+                status = self.error_status
+            elif self.rate_limit is not None and self._throttled(now):
+                status = 429
+            else:
+                status = 200
+                message = StubMessage(
+                    uuid.uuid4().hex[:12], time.time(), topic, body, title
+                )
+                self.messages.append(message)
+            self.statuses[status] += 1
+        if status == 429:
+            retry_after = max(1, round(self._window_start + self.window - now))
+            headers = {"Retry-After": str(retry_after)}
+            return status, {"error": "limit reached"}, headers
+        if status != 200:
+            return status, {"error": "injected failure"}, {}
+        return status, {"event": "message", **asdict(message)}, {}
+
+    def _throttled(self, now: float) -> bool:
+        if now - self._window_start >= self.window:
+            self._window_start = now
+            self._window_count = 0
+        if self._window_count >= self.rate_limit:
+            return True
+        self._window_count += 1
+        return False
+
+    def topic_messages(self, topic: str) -> list[StubMessage]:
+        """Return the messages accepted for a topic, oldest first."""
+        with self._lock:
+            return [message for message in self.messages if message.topic == topic]
+
+    def start(self) -> Self:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="ntfy-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main(args: list[str] | None = None) -> int:
+    """Serve until interrupted, printing each accepted message."""
+    parser = argparse.ArgumentParser(description="Run a local ntfy stub server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to each request"
+    )
+    parser.add_argument(
+        "--rate-limit", type=int, help="Messages accepted per window before 429s"
+    )
+    parser.add_argument(
+        "--window", type=float, default=1.0, help="Rate limit window in seconds"
+    )
+    parser.add_argument(
+        "--error-every", type=int, default=0, help="Fail every Nth request with a 5xx"
+    )
+    parsed = parser.parse_args(args)
+
+    stub = NtfyStub(
+        parsed.host,
+        parsed.port,
+        latency=parsed.latency,
+        rate_limit=parsed.rate_limit,
+        window=parsed.window,
+        error_every=parsed.error_every,
+    )
+    print(f"ntfy stub listening on {stub.url}")
+    seen = 0
+    with stub:
+        try:
+            while True:
+                time.sleep(0.5)
+                for message in stub.messages[seen:]:
+                    print(f"{message.topic}: {message.message}")
+                seen = len(stub.messages)
+        except KeyboardInterrupt:
+            pass
+    print(f"Responses: {dict(stub.statuses)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Aligned time × ticker close matrices for evaluating a whole config at once.
+
+PriceMatrices builds one matrix per bar request (period, interval) over a
+ticker universe, from a single bulk get_histories() call, the first time a
+strategy asks for it. Rows are the union of all tickers' bar times, in ET,
+and a ticker's missing bars are NaN. Strategies read array views of their
+tickers' columns and compute signals for all of them in one NumPy
+operation instead of one pandas call per ticker.
+
+Columns are in universe order, so an alert's tickers are adjacent and
+columns() returns a view rather than a copy unless the alert repeats
+tickers listed earlier in the config.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from stotify.market_hours import ET
+from stotify.stock import get_histories
+
+
+@dataclass(frozen=True)
+class PriceMatrix:
+    """Closes of several tickers on one shared bar index."""
+
+    index: pd.DatetimeIndex
+    tickers: tuple[str, ...]
+    closes: np.ndarray
+
+    @cached_property
+    def _positions(self) -> dict[str, int]:
+        return {ticker: position for position, ticker in enumerate(self.tickers)}
+
+    def columns(self, tickers: list[str]) -> np.ndarray:
+        """Return the (bars × tickers) closes of tickers, as a view when adjacent."""
+        positions = [self._positions[ticker] for ticker in tickers]
+        if not positions:
+            return self.closes[:, :0]
+        first = positions[0]
+        if positions == list(range(first, first + len(positions))):
+            return self.closes[:, first : first + len(positions)]
+        return self.closes[:, positions]
+
+
+def build_price_matrix(
+    tickers: Iterable[str],
+    *,
+    period: str,
+    interval: str,
+    fetch: Callable[..., dict] | None = None,
+) -> PriceMatrix:
+    """Fetch tickers with one bulk request and align their closes by bar time.
+
+    `fetch` defaults to get_histories.
+    """
+    tickers = tuple(dict.fromkeys(tickers))
+    fetch = fetch or get_histories
+    histories = fetch(list(tickers), period=period, interval=interval)
+    closes = {
+        ticker: _in_et(history["Close"])
+        for ticker, history in histories.items()
+        if history is not None and not history.empty
+    }
+    frame = pd.DataFrame(closes, columns=list(tickers), dtype=float)
+    frame = frame.dropna(how="all").sort_index()
+    return PriceMatrix(
+        index=pd.DatetimeIndex(frame.index),
+        tickers=tickers,
+        closes=frame.to_numpy(dtype=float),
+    )
+
+
+def _in_et(closes: pd.Series) -> pd.Series:
+    """Index closes in ET so tickers fetched by different paths align."""
+    index = pd.DatetimeIndex(closes.index)
+    if index.tz is None:
+        return closes.set_axis(index.tz_localize(ET))
+    return closes.set_axis(index.tz_convert(ET))
+
+
+def last_valid(closes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the row of each column's last non-NaN value and its count of them.
+
+    Columns without values get row -1.
+    """
+    valid = ~np.isnan(closes)
+    counts = valid.sum(axis=0)
+    rows = len(closes) - 1 - np.argmax(valid[::-1], axis=0)
+    return np.where(counts > 0, rows, -1), counts
+
+
+def right_align(closes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Move each column's non-NaN values, in order, to the bottom of the column.
+
+    Returns the aligned matrix (NaN above the values) and the number of
+    values per column, so `aligned[-n:]` holds every column's last n closes
+    whichever bars the ticker was missing.
+    """
+    valid = ~np.isnan(closes)
+    order = np.argsort(valid, axis=0, kind="stable")
+    return np.take_along_axis(closes, order, axis=0), valid.sum(axis=0)
+
+
+class PriceMatrices:
+    """Price matrices of one ticker universe, built once per bar request."""
+
+    def __init__(
+        self, tickers: Iterable[str], fetch: Callable[..., dict] | None = None
+    ):
+        self.tickers = tuple(dict.fromkeys(tickers))
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._matrices: dict[tuple[str, str], PriceMatrix] = {}
+
+    def get(self, period: str, interval: str) -> PriceMatrix:
+        """Return the matrix of every universe ticker for a bar request."""
+        with self._lock:
+            key = (period, interval)
+            if key not in self._matrices:
+                self._matrices[key] = build_price_matrix(
+                    self.tickers, period=period, interval=interval, fetch=self._fetch
+                )
+            return self._matrices[key]
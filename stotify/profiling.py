@@ -0,0 +1,177 @@
+"""Opt-in profiling of a run with cProfile or a low-overhead stack sampler.
+
+profiled() captures a profile of the code inside it. The cProfile mode
+writes `<path>.pstats` (for pstats, snakeviz, ...); the sample mode polls
+the calling thread's stack every few milliseconds and writes
+`<path>.collapsed`, one `frame;frame;... count` line per stack, ready for
+flamegraph.pl or speedscope. Both modes write `<path>.sections.json` with
+the time spent in each named section.
+
+Code marks its own work with section(name), e.g. in a custom strategy:
+
+    with section("my_strategy:fit"):
+        ...
+
+Sections cost one global check when no profile is running. In sampled
+stacks they appear as a `[name]` frame under the code that opened them.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.005
+
+_lock = threading.Lock()
+_timings: dict[str, list] | None = None
+_open: dict[int, list] = {}
+
+
+@dataclass
+class ProfileResult:
+    """Files written by a profiled run and its section timings."""
+
+    files: list[Path] = field(default_factory=list)
+    sections: dict[str, dict] = field(default_factory=dict)
+
+
+@contextmanager
+def section(name: str) -> Iterator[None]:
+    """Mark a named section of work so it shows up in the active profile."""
+    if _timings is None:
+        yield
+        return
+    # Frames: 0 is this generator, 1 is contextlib's __enter__, 2 the caller.
+    opened = (name, sys._getframe(2))
+    stack = _open.setdefault(threading.get_ident(), [])
+    stack.append(opened)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stack.remove(opened)
+        with _lock:
+            if _timings is not None:
+                timing = _timings.setdefault(name, [0, 0.0])
+                timing[0] += 1
+                timing[1] += elapsed
+
+
+def frame_label(frame) -> str:
+    """Return the flamegraph label of a stack frame."""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def collapse(frame, marks: dict[int, str] | None = None) -> str:
+    """Return the stack ending at frame, outermost first, joined with ';'.
+
+    `marks` maps id(frame) to the section opened in that frame.
+    """
+    marks = marks or {}
+    labels = []
+    while frame is not None:
+        name = marks.get(id(frame))
+        if name is not None:
+            labels.append(f"[{name}]")
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class _Sampler(threading.Thread):
+    """Records the stack of one thread every `interval` seconds."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(name="stotify-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            opened = list(_open.get(self.thread_id, ()))
+            marks = {id(caller): name for name, caller in opened}
+            self.stacks[collapse(frame, marks)] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+@contextmanager
+def profiled(
+    path: str | Path | None,
+    mode: str = "cprofile",
+    interval: float = SAMPLE_INTERVAL,
+) -> Iterator[ProfileResult]:
+    """Profile the code inside the block and write the profile next to `path`.
+
+    Does nothing when path is None or another profile is already running,
+    so profiled entry points can be nested freely.
+    """
+    global _timings
+    if mode not in MODES:
+        raise ValueError(f"Unknown profile mode '{mode}'")
+    result = ProfileResult()
+    with _lock:
+        active = path is None or _timings is not None
+        if not active:
+            _timings = {}
+    if active:
+        yield result
+        return
+
+    base = Path(path)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    profiler = sampler = None
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        sampler = _Sampler(threading.get_ident(), interval)
+        sampler.start()
+    try:
+        yield result
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            pstats_path = base.with_suffix(".pstats")
+            profiler.dump_stats(pstats_path)
+            result.files.append(pstats_path)
+        if sampler is not None:
+            sampler.stop()
+            collapsed_path = base.with_suffix(".collapsed")
+            with open(collapsed_path, "w") as f:
+                f.writelines(
+                    f"{stack} {count}\n"
+                    for stack, count in sorted(sampler.stacks.items())
+                )
+            result.files.append(collapsed_path)
+        with _lock:
+            timings, _timings = _timings, None
+        result.sections = {
+            name: {"calls": calls, "seconds": round(seconds, 6)}
+            for name, (calls, seconds) in sorted(
+                timings.items(), key=lambda item: -item[1][1]
+            )
+        }
+        sections_path = base.with_suffix(".sections.json")
+        with open(sections_path, "w") as f:
+            json.dump(result.sections, f, indent=2)
+        result.files.append(sections_path)
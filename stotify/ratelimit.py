@@ -0,0 +1,177 @@
+"""Adaptive rate limiting, circuit breaking and retries for data providers."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Callable
+
+
+class ProviderError(Exception):
+    """A data provider request failed after retries."""
+
+
+class RateLimitedError(ProviderError):
+    """The provider rejected a request with HTTP 429 (Too Many Requests)."""
+
+
+class CircuitOpenError(ProviderError):
+    """Requests are short-circuited after repeated provider failures."""
+
+
+class AdaptiveTokenBucket:
+    """Token bucket whose refill rate backs off on 429s and recovers on success.
+
+    The rate is halved (down to `min_rate`) on every rate-limit response and
+    grows back additively by `recovery` tokens/second per success, up to
+    `max_rate`.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        capacity: float = 10.0,
+        min_rate: float = 0.5,
+        recovery: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.recovery = recovery
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0
+
+
+class CircuitBreaker:
+    """Stop calling a failing provider until a cool-down has passed.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast. Once `reset_timeout` seconds pass, one trial request
+    is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Return whether a request may be attempted now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+def call_with_retry[T](
+    fn: Callable[[], T],
+    *,
+    limiter: AdaptiveTokenBucket,
+    breaker: CircuitBreaker,
+    is_rate_limited: Callable[[BaseException], bool],
+    is_retryable: Callable[[BaseException], bool],
+    retries: int = 3,
+    backoff: float = 0.5,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """Call an idempotent fetch under the limiter and breaker, retrying with backoff.
+
+    Raises CircuitOpenError without calling fn while the circuit is open,
+    RateLimitedError if the last attempt was throttled and ProviderError for
+    any other failure. Only throttled and retryable (transport) errors count
+    toward opening the circuit.
+    """
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError("provider circuit is open")
+        limiter.acquire()
+        try:
+            result = fn()
+        except Exception as exc:
+            throttled = is_rate_limited(exc)
+            transient = throttled or is_retryable(exc)
+            if transient:
+                breaker.record_failure()
+            else:
+                # The provider answered; the error is about this request
+                # (e.g. an unknown ticker), not the provider's health.
+                breaker.record_success()
+            if throttled:
+                limiter.on_rate_limited()
+            if attempt >= retries or not transient:
+                error = RateLimitedError if throttled else ProviderError
+                raise error(str(exc) or type(exc).__name__) from exc
+            sleep(backoff * 2**attempt * (1 + random.random()))
+            attempt += 1
+        else:
+            breaker.record_success()
+            limiter.on_success()
+            return result
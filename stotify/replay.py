@@ -0,0 +1,164 @@
+"""Historical replay of alert checks against recorded bars."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from stotify.bars import bar_end_times, is_intraday, load_bars
+from stotify.market_hours import ET
+from stotify.stock import get_history
+from stotify.strategies import get_series
+
+
+def _epoch_nanoseconds(moment: datetime) -> int:
+    """Return an aware datetime in UTC epoch nanoseconds, like Timestamp.value."""
+    return int(moment.timestamp()) * 10**9 + moment.microsecond * 1000
+
+
+@dataclass(frozen=True)
+class RecordedNotification:
+    """A notification that would have been sent during a replay."""
+
+    timestamp: datetime
+    group_name: str
+    ticker: str
+    price: float
+    alert_type: str | None
+    threshold: float | None
+    message: str | None = None
+
+
+class ReplayFeed:
+    """Serve prices and strategy series as of a simulated clock.
+
+    Each (ticker, interval) history is fetched once for the whole replay and
+    each strategy series is computed once over it. Series functions are causal,
+    so reading the row of the last completed bar only sees data up to `now`.
+    """
+
+    def __init__(self, start: datetime, end: datetime, interval: str):
+        self.start = start
+        self.end = end
+        self.interval = interval
+        self.now = start
+        self._now_value = _epoch_nanoseconds(start)
+        self._bars: dict[
+            tuple[str, str], tuple[np.ndarray, np.ndarray, pd.DataFrame] | None
+        ] = {}
+        self._series: dict[tuple, dict[str, np.ndarray] | None] = {}
+        self._positions: dict[tuple[str, str], int] = {}
+
+    def advance(self, now: datetime) -> None:
+        """Move the simulated clock forward."""
+        self.now = now
+        self._now_value = _epoch_nanoseconds(now)
+        self._positions.clear()
+
+    def latest(
+        self, strategy: str, ticker: str, params: dict, interval: str | None
+    ) -> tuple[float, dict] | None:
+        """Return the last completed close and series row for a strategy.
+
+        Quote-driven strategies pass no interval and see the replay bars.
+        """
+        interval = interval or self.interval
+        bars = self._load(ticker, interval)
+        position = self._position(ticker, interval)
+        if bars is None or position < 0:
+            return None
+
+        key = (strategy, ticker, interval, tuple(sorted(params.items())))
+        if key not in self._series:
+            frame = get_series(strategy)(bars[2], params)
+            self._series[key] = {
+                column: values.to_numpy() for column, values in frame.items()
+            }
+        columns = self._series[key]
+        row = {column: values[position] for column, values in columns.items()}
+        return float(bars[1][position]), row
+
+    def preload(self, tickers: list[str]) -> None:
+        """Fetch replay-interval bars for tickers so they drive the clock."""
+        for ticker in tickers:
+            self._load(ticker, self.interval)
+
+    def clock(self) -> list[datetime]:
+        """Return the completion times of all loaded replay-interval bars in range."""
+        ends = [
+            bars[0]
+            for (_, interval), bars in self._bars.items()
+            if interval == self.interval and bars is not None
+        ]
+        if not ends:
+            return []
+        merged = np.unique(np.concatenate(ends))
+        lower = pd.Timestamp(self.start).value
+        upper = pd.Timestamp(self.end).value
+        merged = merged[(merged >= lower) & (merged <= upper)]
+        return [
+            pd.Timestamp(value, tz="UTC").tz_convert(ET).to_pydatetime()
+            for value in merged
+        ]
+
+    def _position(self, ticker: str, interval: str) -> int:
+        key = (ticker, interval)
+        if key not in self._positions:
+            bars = self._bars.get(key)
+            if bars is None:
+                return -1
+            position = np.searchsorted(bars[0], self._now_value, "right")
+            self._positions[key] = int(position) - 1
+        return self._positions[key]
+
+    def _load(self, ticker: str, interval: str):
+        key = (ticker, interval)
+        if key not in self._bars:
+            warmup = timedelta(days=7 if is_intraday(interval) else 400)
+            history = load_bars(
+                get_history,
+                ticker,
+                interval,
+                start=str((self.start - warmup).date()),
+                end=str((self.end + timedelta(days=1)).date()),
+            )
+            if history is None:
+                self._bars[key] = None
+            else:
+                ends = bar_end_times(history.index, interval)
+                closes = history["Close"].to_numpy(dtype=float)
+                self._bars[key] = (ends, closes, history)
+        return self._bars[key]
+
+
+class NotificationRecorder:
+    """Drop-in replacement for send_alert that records instead of sending."""
+
+    def __init__(self, feed: ReplayFeed):
+        self.feed = feed
+        self.notifications: list[RecordedNotification] = []
+
+    def __call__(
+        self,
+        ticker: str,
+        price: float,
+        alert_type: str | None,
+        threshold: float | None,
+        group_name: str,
+        message: str | None = None,
+    ) -> bool:
+        self.notifications.append(
+            RecordedNotification(
+                timestamp=self.feed.now,
+                group_name=group_name,
+                ticker=ticker,
+                price=price,
+                alert_type=alert_type,
+                threshold=threshold,
+                message=message,
+            )
+        )
+        return True
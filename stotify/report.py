@@ -0,0 +1,146 @@
+"""Structured reports of check_alerts runs and a rolling run history."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from stotify.market_hours import ET
+
+SKIPPED_MARKET_HOURS = "skipped_market_hours"
+SKIPPED_TIMEFRAME = "skipped_timeframe"
+SKIPPED_SCHEDULE = "skipped_schedule"
+NO_DATA = "no_data"
+NOT_MET = "not_met"
+FIRED = "fired"
+NOTIFY_FAILED = "notify_failed"
+OUTCOMES = (
+    SKIPPED_MARKET_HOURS,
+    SKIPPED_TIMEFRAME,
+    SKIPPED_SCHEDULE,
+    NO_DATA,
+    NOT_MET,
+    FIRED,
+    NOTIFY_FAILED,
+)
+
+HISTORY_MAX_AGE = timedelta(days=90)
+
+
+@dataclass(frozen=True)
+class AlertOutcome:
+    """What happened to one alert in a run.
+
+    `data_as_of` is the oldest of the newest quote/bar times the alert's
+    tickers were evaluated on, and `staleness` its age in seconds when the
+    alert ran.
+    """
+
+    group: str
+    strategy: str
+    timeframe: str
+    tickers: tuple[str, ...]
+    outcome: str
+    signals: int = 0
+    sent: int = 0
+    data_as_of: str | None = None
+    staleness: float | None = None
+    seconds: float = 0.0
+
+
+def data_freshness(
+    times: list[pd.Timestamp], now: datetime
+) -> tuple[str | None, float | None]:
+    """Return (oldest data time as ISO string, its age in seconds) for times."""
+    if not times:
+        return None, None
+    oldest = min(
+        time.tz_localize(ET) if time.tzinfo is None else time for time in times
+    )
+    return oldest.isoformat(), round((pd.Timestamp(now) - oldest).total_seconds(), 1)
+
+
+class RunReport:
+    """Alert outcomes and summary of one check_alerts run."""
+
+    def __init__(self, started_at: datetime | None = None):
+        self.started_at = started_at or datetime.now(UTC)
+        self.outcomes: list[AlertOutcome] = []
+        self.notify_seconds: list[float] = []
+        self.summary: dict = {}
+
+    def add(self, outcome: AlertOutcome) -> None:
+        self.outcomes.append(outcome)
+
+    def notify_latency(self) -> dict[str, float]:
+        """Return the p50, p99 and slowest notification send time in seconds."""
+        if not self.notify_seconds:
+            return {}
+        p50, p99 = np.percentile(self.notify_seconds, [50, 99])
+        return {
+            "p50": round(float(p50), 4),
+            "p99": round(float(p99), 4),
+            "max": round(max(self.notify_seconds), 4),
+        }
+
+    def counts(self) -> dict[str, int]:
+        """Return how many alerts ended in each outcome."""
+        counts = dict.fromkeys(OUTCOMES, 0)
+        for outcome in self.outcomes:
+            counts[outcome.outcome] += 1
+        return counts
+
+    def to_dict(self, outcomes: bool = True) -> dict:
+        """Return the report as JSON-serializable data."""
+        report = {
+            "started_at": self.started_at.isoformat(),
+            **self.summary,
+            "counts": self.counts(),
+        }
+        if outcomes:
+            report["outcomes"] = [asdict(outcome) for outcome in self.outcomes]
+        return report
+
+    def write(self, path: str | Path) -> None:
+        """Write the report as compact JSON, or its outcomes as Parquet (.parquet)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".parquet":
+            frame = pd.DataFrame([asdict(outcome) for outcome in self.outcomes])
+            frame["started_at"] = self.started_at.isoformat()
+            frame.to_parquet(path, index=False)
+            return
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    def append_history(
+        self, path: str | Path, max_age: timedelta = HISTORY_MAX_AGE
+    ) -> None:
+        """Append the run summary to a JSON-lines history, dropping old runs."""
+        path = Path(path)
+        cutoff = self.started_at - max_age
+        lines = []
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        started = datetime.fromisoformat(json.loads(line)["started_at"])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if started >= cutoff:
+                        lines.append(line.rstrip("\n"))
+        except FileNotFoundError:
+            pass
+        lines.append(json.dumps(self.to_dict(outcomes=False), separators=(",", ":")))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(path.suffix + ".tmp")
+        with open(temp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(temp, path)
@@ -0,0 +1,219 @@
+"""Content-addressed cache of backtest results.
+
+A result is keyed by a hash of the bars a backtest ran over together with
+its strategy, params and exit rule, so repeating a backtest over the same
+data is a lookup, and new bars (which change the hash) miss the cache
+instead of returning a stale result. Entries keep only what the run
+produced: metrics, trade entry/exit bar positions and the strategy's
+indicator columns. Metrics-only callers never rebuild Trade lists or
+curves from them.
+
+Recent results stay in memory, least-recently-used first out. With a
+directory (STOTIFY_RESULT_CACHE), results are also written there as
+compressed .npz files, and the least recently used files are deleted
+once they exceed max_disk_bytes. Entries do not track strategy code;
+clear() the cache after changing a strategy's series function.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import threading
+import zipfile
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from stotify.cache import TTLCache
+
+RESULT_CACHE_ENV = "STOTIFY_RESULT_CACHE"
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+SUFFIX = ".npz"
+COLUMN_PREFIX = "column:"
+
+
+@dataclass(frozen=True)
+class CachedRun:
+    """What a backtest computed: metrics, trade positions and indicator columns."""
+
+    metrics: dict[str, float]
+    entries: np.ndarray
+    exits: np.ndarray
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = [self.entries, self.exits, *self.columns.values()]
+        return sum(array.nbytes for array in arrays) + 64 * len(self.metrics)
+
+
+def fingerprint(history: pd.DataFrame) -> str:
+    """Return a hash of the bar times, column names and values of history."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(column) for column in history.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(history, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def result_key(
+    history: pd.DataFrame,
+    strategy: str,
+    params: dict,
+    *,
+    exit_mode: str,
+    hold_days: int,
+    interval: str,
+) -> str:
+    """Return the cache key of a backtest over history."""
+    options = json.dumps(
+        {
+            "strategy": strategy,
+            "params": params,
+            "exit_mode": exit_mode,
+            "hold_days": hold_days,
+            "interval": interval,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.blake2b(options.encode(), digest_size=16)
+    digest.update(fingerprint(history).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Backtest results by result_key, in memory and optionally on disk."""
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.directory = Path(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = TTLCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._disk_lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_writes = 0
+        self.disk_evictions = 0
+
+    def get_or_run(self, key: str, run: Callable[[], CachedRun]) -> CachedRun:
+        """Return the cached result for key, calling run on a miss.
+
+        Concurrent requests for the same key wait for one run.
+        """
+        return self._memory.get_or_fetch(
+            key, lambda: self._load(key) or self._save(key, run()), math.inf
+        )
+
+    def clear(self) -> None:
+        """Drop every entry in memory and on disk."""
+        self._memory.clear()
+        with self._disk_lock:
+            for path in self._files():
+                path.unlink(missing_ok=True)
+            self.disk_hits = self.disk_writes = self.disk_evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return memory counters and disk hits, writes and evictions."""
+        return {
+            **self._memory.stats(),
+            "disk_hits": self.disk_hits,
+            "disk_writes": self.disk_writes,
+            "disk_evictions": self.disk_evictions,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def _files(self) -> list[Path]:
+        if self.directory is None or not self.directory.is_dir():
+            return []
+        return list(self.directory.glob(f"*{SUFFIX}"))
+
+    def _load(self, key: str) -> CachedRun | None:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                run = CachedRun(
+                    metrics=json.loads(str(stored["metrics"])),
+                    entries=stored["entries"],
+                    exits=stored["exits"],
+                    columns={
+                        name.removeprefix(COLUMN_PREFIX): stored[name]
+                        for name in stored.files
+                        if name.startswith(COLUMN_PREFIX)
+                    },
+                )
+            # Mark the file as recently used for disk eviction.
+            os.utime(path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+        with self._disk_lock:
+            self.disk_hits += 1
+        return run
+
+    def _save(self, key: str, run: CachedRun) -> CachedRun:
+        if self.directory is None:
+            return run
+        if any(values.dtype.hasobject for values in run.columns.values()):
+            # Object columns would need pickle; keep those in memory only.
+            return run
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        columns = {COLUMN_PREFIX + name: values for name, values in run.columns.items()}
+        with open(temp, "wb") as f:
+            np.savez_compressed(
+                f,
+                metrics=np.array(json.dumps(run.metrics)),
+                entries=run.entries,
+                exits=run.exits,
+                **columns,
+            )
+        os.replace(temp, path)
+        with self._disk_lock:
+            self.disk_writes += 1
+            self._evict_files()
+        return run
+
+    def _evict_files(self) -> None:
+        files = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda item: item[0]):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.disk_evictions += 1
+
+
+_CACHES: dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the shared cache, on disk at STOTIFY_RESULT_CACHE if that is set."""
+    directory = os.environ.get(RESULT_CACHE_ENV, "")
+    with _caches_lock:
+        if directory not in _CACHES:
+            _CACHES[directory] = ResultCache(directory or None)
+        return _CACHES[directory]
@@ -0,0 +1,153 @@
+"""Decide which alert timeframes are due at a given time.
+
+Only depends on the standard library and pytz, so the scheduler can be run
+before the full environment is installed:
+
+    uv run --no-project --with pytz python -m stotify.schedule alerts.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import date, datetime
+
+from stotify.market_hours import MARKET_CLOSE, _to_et, is_market_open
+
+TIMEFRAME_UNITS = {"m": 1, "h": 60, "d": 24 * 60}
+TIMEFRAME_PATTERN = re.compile(r"^([1-9]\d*)(m|h|d)$")
+NOTHING_DUE_EXIT_CODE = 3
+
+
+def timeframe_minutes(timeframe: str) -> int:
+    """Return the length of a timeframe such as 15m, 6h or 1d in minutes."""
+    match = TIMEFRAME_PATTERN.match(timeframe)
+    if not match:
+        raise ValueError(f"Invalid timeframe '{timeframe}'")
+    return int(match.group(1)) * TIMEFRAME_UNITS[match.group(2)]
+
+
+def is_due(
+    timeframe: str,
+    now: datetime | None = None,
+    cadence: str = "15m",
+    skip_market_check: bool = False,
+) -> bool:
+    """Check whether alerts of a timeframe should run in a scheduler tick.
+
+    `cadence` is how often the scheduler runs. Intraday timeframes are due in
+    the tick that starts their clock-aligned slot (1h on the hour, 6h at
+    00/06/12/18 ET) while the market is open. Daily timeframes are due in the
+    first tick after the session close, every N trading days for Nd.
+    """
+    now = _to_et(now)
+    length = timeframe_minutes(timeframe)
+    window = timeframe_minutes(cadence)
+
+    if timeframe.endswith("d"):
+        if now.weekday() > 4:
+            return False
+        close = now.replace(
+            hour=MARKET_CLOSE.hour, minute=MARKET_CLOSE.minute, second=0, microsecond=0
+        )
+        since_close = (now - close).total_seconds() / 60
+        sessions = length // TIMEFRAME_UNITS["d"]
+        return 0 <= since_close < window and _trading_day(now.date()) % sessions == 0
+
+    if not skip_market_check and not is_market_open(now):
+        return False
+    since_midnight = now.hour * 60 + now.minute
+    return since_midnight % length < window
+
+
+def due_timeframes(
+    timeframes: set[str] | list[str],
+    now: datetime | None = None,
+    cadence: str = "15m",
+    skip_market_check: bool = False,
+) -> list[str]:
+    """Return the subset of timeframes that are due, shortest first."""
+    return sorted(
+        (
+            timeframe
+            for timeframe in set(timeframes)
+            if is_due(timeframe, now, cadence, skip_market_check)
+        ),
+        key=timeframe_minutes,
+    )
+
+
+def plan_run(
+    config: dict,
+    now: datetime | None = None,
+    cadence: str = "15m",
+    skip_market_check: bool = False,
+    timeframe_filter: str | None = None,
+) -> dict:
+    """Return the due and skipped timeframes for a config at `now`."""
+    now = _to_et(now)
+    timeframes = {
+        alert["timeframe"]
+        for alerts in config["groups"].values()
+        for alert in alerts
+        if not timeframe_filter or alert["timeframe"] == timeframe_filter
+    }
+    due = due_timeframes(timeframes, now, cadence, skip_market_check)
+    return {
+        "now": now.isoformat(),
+        "cadence": cadence,
+        "due": due,
+        "skipped": sorted(timeframes - set(due), key=timeframe_minutes),
+    }
+
+
+def write_github_output(result: dict) -> None:
+    """Expose the plan as step outputs when running in GitHub Actions."""
+    path = os.environ.get("GITHUB_OUTPUT")
+    if not path:
+        return
+    with open(path, "a") as f:
+        f.write(f"due={'true' if result['due'] else 'false'}\n")
+        f.write(f"timeframes={','.join(result['due'])}\n")
+
+
+def _trading_day(day: date) -> int:
+    """Return a running count of weekdays (holidays are not excluded)."""
+    ordinal = day.toordinal() - 1  # 0001-01-01 is a Monday
+    return ordinal // 7 * 5 + min(ordinal % 7, 4)
+
+
+def main(args: list[str] | None = None) -> int:
+    """Print the plan as JSON. Exits NOTHING_DUE_EXIT_CODE when nothing is due."""
+    parser = argparse.ArgumentParser(description="Plan which alert timeframes are due.")
+    parser.add_argument("config", nargs="?", default="alerts.json")
+    parser.add_argument(
+        "--cadence",
+        default=os.environ.get("STOTIFY_CADENCE", "15m"),
+        help="How often the scheduler runs (e.g., 15m, 1d)",
+    )
+    parser.add_argument(
+        "--timeframe", default=os.environ.get("STOTIFY_TIMEFRAME"), help="Filter"
+    )
+    parser.add_argument("--skip-market-check", action="store_true")
+    parser.add_argument("--now", help="ISO timestamp to plan for (default: now)")
+    parsed = parser.parse_args(args)
+
+    with open(parsed.config) as f:
+        config = json.load(f)
+    now = datetime.fromisoformat(parsed.now) if parsed.now else None
+    result = plan_run(
+        config,
+        now,
+        cadence=parsed.cadence,
+        skip_market_check=parsed.skip_market_check,
+        timeframe_filter=parsed.timeframe,
+    )
+    print(json.dumps(result))
+    write_github_output(result)
+    return 0 if result["due"] else NOTHING_DUE_EXIT_CODE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
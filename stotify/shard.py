@@ -0,0 +1,133 @@
+"""Partition alerts across parallel runners and merge their run reports.
+
+Tickers are assigned to shards by consistent hashing, so all alerts for a
+ticker run on the same shard (keeping fetch dedup and incremental state
+effective) and changing the shard count only moves about 1/N of tickers.
+Merge per-shard reports with:
+
+    python -m stotify.shard reports/*.json
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+SHARD_PATTERN = re.compile(r"^(\d+)/(\d+)$")
+VIRTUAL_NODES = 64
+SUMMED_FIELDS = ("alerts", "tickers", "sent", "data_failures")
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a 1-based shard spec such as 2/4 into (2, 4)."""
+    match = SHARD_PATTERN.match(value)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise ValueError(f"Invalid shard '{value}'")
+    return int(match.group(1)), int(match.group(2))
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest())
+
+
+@lru_cache
+def _ring(count: int) -> tuple[list[int], list[int]]:
+    nodes = sorted(
+        (_hash(f"shard-{shard}-{node}"), shard)
+        for shard in range(1, count + 1)
+        for node in range(VIRTUAL_NODES)
+    )
+    return [point for point, _ in nodes], [shard for _, shard in nodes]
+
+
+def shard_of(ticker: str, count: int) -> int:
+    """Return the 1-based shard that owns a ticker."""
+    points, owners = _ring(count)
+    return owners[bisect.bisect(points, _hash(ticker)) % len(points)]
+
+
+def shard_config(config: dict, shard: int, count: int) -> dict:
+    """Return the part of a validated config that belongs to one shard.
+
+    Multi-ticker alerts are split so each shard only evaluates its own
+    tickers; groups left without alerts are dropped.
+    """
+    groups = {}
+    for group_name, alerts in config["groups"].items():
+        owned = []
+        for alert in alerts:
+            tickers = alert["tickers"] if "tickers" in alert else [alert["ticker"]]
+            mine = [ticker for ticker in tickers if shard_of(ticker, count) == shard]
+            if len(mine) == len(tickers):
+                owned.append(alert)
+            elif mine:
+                owned.append({**alert, "tickers": mine})
+        if owned:
+            groups[group_name] = owned
+    return {**config, "groups": groups}
+
+
+def write_report(path: str | Path, report: dict) -> None:
+    """Write a run report as JSON, creating parent directories."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, separators=(",", ":"))
+
+
+def merge_reports(reports: list[dict]) -> dict:
+    """Combine per-shard run reports into one.
+
+    Counts, outcome counts, cache and quote statistics are summed, per-alert
+    outcomes are concatenated, the duration is the slowest shard's, and
+    shards absent from `reports` are listed under "missing".
+    """
+    merged = {"shards": [], "missing": [], "duration": 0.0}
+    merged.update(cache={}, quotes={}, counts={})
+    merged.update(dict.fromkeys(SUMMED_FIELDS, 0))
+    merged["outcomes"] = []
+    expected = set()
+    for report in reports:
+        shard = report.get("shard", "1/1")
+        _, count = parse_shard(shard)
+        merged["shards"].append(shard)
+        expected.update(f"{index}/{count}" for index in range(1, count + 1))
+        for field in SUMMED_FIELDS:
+            merged[field] += report.get(field, 0)
+        for totals in ("cache", "quotes", "counts"):
+            for name, value in report.get(totals, {}).items():
+                merged[totals][name] = merged[totals].get(name, 0) + value
+        merged["outcomes"].extend(report.get("outcomes", []))
+        merged["duration"] = max(merged["duration"], report.get("duration", 0.0))
+    merged["shards"].sort(key=parse_shard)
+    merged["missing"] = sorted(expected - set(merged["shards"]), key=parse_shard)
+    return merged
+
+
+def main(args: list[str] | None = None) -> int:
+    """Print merged reports as JSON. Exits 1 if any shard's report is missing."""
+    parser = argparse.ArgumentParser(description="Merge per-shard run reports.")
+    parser.add_argument("reports", nargs="*", help="Per-shard report JSON files")
+    parser.add_argument("--output", help="Also write the merged report here")
+    parsed = parser.parse_args(args)
+
+    reports = []
+    for path in parsed.reports:
+        with open(path) as f:
+            reports.append(json.load(f))
+    merged = merge_reports(reports)
+    print(json.dumps(merged))
+    if parsed.output:
+        write_report(parsed.output, merged)
+    if merged["missing"]:
+        print(f"Missing shard reports: {', '.join(merged['missing'])}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Persistent index of moving average crossover events."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from stotify.indicators import RollingMeans
+
+
+class CrossoverIndex:
+    """Cross-up/cross-down times per (ticker, interval, fast, slow) window pair.
+
+    Events are kept as sorted int64 nanosecond timestamps, so range and state
+    queries are binary searches. `update` only processes bars after the last
+    indexed bar, seeding the moving averages from the stored tail of closes.
+    A cross-up is a bar where the fast MA is above the slow MA and was not on
+    the bar before, matching the ma_cross signal.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else None
+        self._entries: dict[str, dict] | None = None
+        self._dirty = False
+
+    def update(
+        self,
+        ticker: str,
+        history: pd.DataFrame,
+        fast_window: int,
+        slow_window: int,
+        interval: str = "1d",
+    ) -> None:
+        """Index crossovers in the bars of history that are not indexed yet.
+
+        History must overlap or directly follow the indexed bars; if it starts
+        before them, the pair is re-indexed from history.
+        """
+        closes = history["Close"].dropna()
+        if closes.empty:
+            return
+        times = _nanoseconds(closes.index)
+        key = _key(ticker, interval, fast_window, slow_window)
+        entry = self._load().get(key)
+        if entry is None or times[0] < entry["first_bar"]:
+            entry = {
+                "first_bar": int(times[0]),
+                "last_bar": None,
+                "state": False,
+                "tail": [],
+                "ups": np.empty(0, dtype=np.int64),
+                "downs": np.empty(0, dtype=np.int64),
+            }
+        values = closes.to_numpy(dtype=float)
+        if entry["last_bar"] is not None:
+            new = times > entry["last_bar"]
+            times, values = times[new], values[new]
+        if len(times) == 0:
+            return
+
+        tail = entry["tail"]
+        means = RollingMeans([fast_window, slow_window]).update(
+            np.concatenate((tail, values))
+        )
+        signal = (means[fast_window] > means[slow_window])[len(tail) :]
+        previous = np.concatenate(([entry["state"]], signal[:-1]))
+        entry["ups"] = np.concatenate((entry["ups"], times[signal & ~previous]))
+        entry["downs"] = np.concatenate((entry["downs"], times[~signal & previous]))
+        entry["state"] = bool(signal[-1])
+        entry["tail"] = np.concatenate((tail, values))[-slow_window:].tolist()
+        entry["last_bar"] = int(times[-1])
+        self._entries[key] = entry
+        self._dirty = True
+
+    def crossovers(
+        self,
+        ticker: str,
+        fast_window: int,
+        slow_window: int,
+        interval: str = "1d",
+        start: str | pd.Timestamp | None = None,
+        end: str | pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Return crossover events between start and end (inclusive), in order."""
+        entry = self._load().get(_key(ticker, interval, fast_window, slow_window))
+        frames = []
+        for name, direction in (("ups", "cross_up"), ("downs", "cross_down")):
+            events = entry[name] if entry else np.empty(0, dtype=np.int64)
+            lower = 0 if start is None else np.searchsorted(events, _ns(start))
+            upper = (
+                len(events)
+                if end is None
+                else np.searchsorted(events, _ns(end), side="right")
+            )
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "timestamp": pd.to_datetime(events[lower:upper], utc=True),
+                        "direction": direction,
+                    }
+                )
+            )
+        return (
+            pd.concat(frames)
+            .sort_values("timestamp", kind="stable")
+            .reset_index(drop=True)
+        )
+
+    def signal(
+        self,
+        ticker: str,
+        fast_window: int,
+        slow_window: int,
+        interval: str,
+        index: pd.Index,
+    ) -> np.ndarray:
+        """Return whether the fast MA is above the slow MA at each bar of index.
+
+        Bars outside the indexed range are False.
+        """
+        entry = self._load().get(_key(ticker, interval, fast_window, slow_window))
+        if entry is None:
+            return np.zeros(len(index), dtype=bool)
+        times = _nanoseconds(index)
+        ups = np.searchsorted(entry["ups"], times, "right")
+        downs = np.searchsorted(entry["downs"], times, "right")
+        last_up = np.where(ups > 0, entry["ups"][np.maximum(ups - 1, 0)], -1)
+        last_down = np.where(downs > 0, entry["downs"][np.maximum(downs - 1, 0)], -1)
+        inside = (times >= entry["first_bar"]) & (times <= entry["last_bar"])
+        return (last_up > last_down) & inside
+
+    def save(self) -> None:
+        """Write the index to disk if anything changed."""
+        if not self._dirty or self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        encoded = {
+            key: {
+                **entry,
+                "ups": entry["ups"].tolist(),
+                "downs": entry["downs"].tolist(),
+            }
+            for key, entry in self._entries.items()
+        }
+        temp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(temp, "w") as f:
+            json.dump(encoded, f, separators=(",", ":"))
+        os.replace(temp, self.path)
+        self._dirty = False
+
+    def _load(self) -> dict[str, dict]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path is not None:
+                try:
+                    with open(self.path) as f:
+                        stored = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    stored = {}
+                for key, entry in stored.items():
+                    entry["ups"] = np.array(entry["ups"], dtype=np.int64)
+                    entry["downs"] = np.array(entry["downs"], dtype=np.int64)
+                    self._entries[key] = entry
+        return self._entries
+
+
+def _key(ticker: str, interval: str, fast_window: int, slow_window: int) -> str:
+    return f"{ticker}|{interval}|{int(fast_window)}|{int(slow_window)}"
+
+
+def _nanoseconds(index: pd.Index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").as_unit("ns").asi8
+
+
+def _ns(timestamp: str | pd.Timestamp) -> int:
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return timestamp.as_unit("ns").value
@@ -1,22 +1,135 @@
 """Stock price fetching via Yahoo Finance."""
 
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import pandas as pd
 import yfinance as yf
+from yfinance.exceptions import YFRateLimitError
 
+from stotify.cache import TTLCache
+from stotify.market_hours import ET, _to_et, next_bar_close
+from stotify.profiling import section
+from stotify.ratelimit import (
+    AdaptiveTokenBucket,
+    CircuitBreaker,
+    ProviderError,
+    call_with_retry,
+)
 
-def get_price(ticker: str) -> float | None:
-    """Fetch current price for ticker. Returns None on any error."""
+QUOTE_TTL_SECONDS = 30.0
+QUOTE_FALLBACK_ENV = "STOTIFY_QUOTE_FALLBACK"
+SNAPSHOT = "snapshot"
+INFO = "info"
+
+logger = logging.getLogger(__name__)
+
+_cache = TTLCache()
+_limiter = AdaptiveTokenBucket()
+_breaker = CircuitBreaker()
+_failures_lock = threading.Lock()
+_failure_count = 0
+_last_failure: str | None = None
+_quote_stats_lock = threading.Lock()
+_quote_stats = {
+    "snapshots": 0,
+    "snapshot_seconds": 0.0,
+    "fallbacks": 0,
+    "fallback_seconds": 0.0,
+}
+
+
+@dataclass(frozen=True)
+class Quote:
+    """A price snapshot with when it traded and where it came from.
+
+    `source` is SNAPSHOT for the bulk minute-bar download or INFO for the
+    per-ticker `info` fallback, the only source with bid and ask.
+    `staleness` is the quote's age in seconds when it was fetched.
+    """
+
+    ticker: str
+    price: float
+    timestamp: datetime
+    source: str
+    staleness: float = 0.0
+    bid: float | None = None
+    ask: float | None = None
+    volume: float | None = None
+
+    def age(self, now: datetime | None = None) -> float:
+        """Return the quote's age in seconds at `now` (default: the current time)."""
+        return (_to_et(now) - self.timestamp).total_seconds()
+
+
+def get_quote(ticker: str, fallback: bool | None = None) -> Quote | None:
+    """Fetch a quote for ticker. Returns None on any error.
+
+    Quotes are memoized for QUOTE_TTL_SECONDS. See get_quotes for `fallback`.
+    Errors are counted in failure_count() so callers can tell them apart
+    from missing data.
+    """
+    fallback = _fallback_enabled(fallback)
     try:
-        stock = yf.Ticker(ticker)
-        # fast_info is quicker than info
-        price = stock.fast_info.get("lastPrice")
-        if price is None:
-            # fallback to regular info
-            price = stock.info.get("currentPrice")
-        return float(price) if price else None
-    except Exception:
+        return _cache.get_or_fetch(
+            ("quote", ticker),
+            lambda: _fetch_quote(ticker, fallback),
+            QUOTE_TTL_SECONDS,
+        )
+    except ProviderError as exc:
+        _record_failure(f"quote {ticker}: {exc}")
         return None
 
 
+def get_quotes(
+    tickers: list[str], fallback: bool | None = None
+) -> dict[str, Quote | None]:
+    """Fetch quotes for several tickers with one bulk snapshot request.
+
+    Memoized quotes are served from the cache. Tickers the snapshot has no
+    price for map to None, unless `fallback` (default: the
+    STOTIFY_QUOTE_FALLBACK env var) asks for one slower `info` request each;
+    quote_stats() counts and times both kinds of request.
+    """
+    fallback = _fallback_enabled(fallback)
+    quotes = {}
+    missing = []
+    for ticker in dict.fromkeys(tickers):
+        quotes[ticker] = _cache.get(("quote", ticker))
+        if quotes[ticker] is None:
+            missing.append(ticker)
+    if not missing:
+        return quotes
+
+    try:
+        fetched = _fetch_snapshot(missing)
+    except ProviderError as exc:
+        _record_failure(f"quotes {','.join(missing)}: {exc}")
+        fetched = {}
+    for ticker in missing:
+        quote = fetched.get(ticker)
+        if quote is None and fallback:
+            try:
+                quote = _fetch_info_quote(ticker)
+            except ProviderError as exc:
+                _record_failure(f"quote {ticker}: {exc}")
+        if quote is not None:
+            quotes[ticker] = _cache.get_or_fetch(
+                ("quote", ticker), lambda quote=quote: quote, QUOTE_TTL_SECONDS
+            )
+    return quotes
+
+
+def get_price(ticker: str, fallback: bool | None = None) -> float | None:
+    """Fetch current price for ticker. Returns None on any error."""
+    quote = get_quote(ticker, fallback)
+    return None if quote is None else quote.price
+
+
 def get_history(
     ticker: str,
     period: str = "1y",
@@ -24,15 +137,294 @@ def get_history(
     start: str | None = None,
     end: str | None = None,
 ):
-    """Fetch historical data for a ticker. Returns None on any error."""
+    """Fetch historical data for a ticker. Returns None on any error.
+
+    Histories are memoized until the current bar of `interval` closes. The
+    returned DataFrame may be shared, so callers must copy before mutating.
+    Errors are counted in failure_count().
+    """
+    try:
+        return _cache.get_or_fetch(
+            ("history", ticker, period, interval, start, end),
+            lambda: _fetch_history(ticker, period, interval, start, end),
+            lambda _history: _seconds_until_bar_close(interval),
+        )
+    except ProviderError as exc:
+        _record_failure(f"history {ticker}: {exc}")
+        return None
+
+
+def get_histories(
+    tickers: list[str],
+    period: str = "1y",
+    interval: str = "1d",
+    start: str | None = None,
+    end: str | None = None,
+) -> dict:
+    """Fetch histories for several tickers with one bulk request.
+
+    Tickers already memoized by get_history are served from the cache; the
+    rest are downloaded together and memoized per ticker, so later
+    get_history calls for the same request are cache hits. Tickers without
+    data map to None.
+    """
+    histories = {}
+    missing = []
+    for ticker in dict.fromkeys(tickers):
+        histories[ticker] = _cache.get(
+            ("history", ticker, period, interval, start, end)
+        )
+        if histories[ticker] is None:
+            missing.append(ticker)
+    if not missing:
+        return histories
+
+    try:
+        fetched = _fetch_histories(missing, period, interval, start, end)
+    except ProviderError as exc:
+        _record_failure(f"histories {','.join(missing)}: {exc}")
+        return histories
+    for ticker in missing:
+        history = fetched.get(ticker)
+        if history is not None:
+            histories[ticker] = _cache.get_or_fetch(
+                ("history", ticker, period, interval, start, end),
+                lambda history=history: history,
+                lambda _history: _seconds_until_bar_close(interval),
+            )
+    return histories
+
+
+def quote_stats() -> dict[str, float]:
+    """Return how many snapshot and `info` fallback requests ran, and their time."""
+    with _quote_stats_lock:
+        return {name: round(value, 4) for name, value in _quote_stats.items()}
+
+
+def cache_stats() -> dict[str, int]:
+    """Return hit/miss counters of the quote and history cache."""
+    return _cache.stats()
+
+
+def clear_cache() -> None:
+    """Drop all memoized quotes and histories."""
+    _cache.clear()
+
+
+def failure_count() -> int:
+    """Return how many quote/history requests have failed in this process."""
+    with _failures_lock:
+        return _failure_count
+
+
+def last_failure() -> str | None:
+    """Return a description of the most recent failed request."""
+    with _failures_lock:
+        return _last_failure
+
+
+def reset_provider() -> None:
+    """Reset the rate limiter, circuit breaker and failure counters."""
+    global _limiter, _breaker, _failure_count, _last_failure
+    _limiter = AdaptiveTokenBucket()
+    _breaker = CircuitBreaker()
+    with _failures_lock:
+        _failure_count = 0
+        _last_failure = None
+    with _quote_stats_lock:
+        for name in _quote_stats:
+            _quote_stats[name] = 0
+
+
+def _record_failure(description: str) -> None:
+    global _failure_count, _last_failure
+    logger.warning(f"Data request failed: {description}")
+    with _failures_lock:
+        _failure_count += 1
+        _last_failure = description
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    return isinstance(exc, YFRateLimitError) or "Too Many Requests" in str(exc)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    # Network errors (requests/curl_cffi) derive from OSError.
+    return isinstance(exc, OSError)
+
+
+def _provider_call(fn):
+    """Run a Yahoo request under the shared rate limiter and circuit breaker."""
+    return call_with_retry(
+        fn,
+        limiter=_limiter,
+        breaker=_breaker,
+        is_rate_limited=_is_rate_limited,
+        is_retryable=_is_retryable,
+    )
+
+
+def _seconds_until_bar_close(interval: str) -> float:
+    now = datetime.now(ET)
+    return (next_bar_close(interval, now) - now).total_seconds()
+
+
+def _fallback_enabled(fallback: bool | None) -> bool:
+    if fallback is not None:
+        return fallback
+    return os.environ.get(QUOTE_FALLBACK_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _note_quote_request(kind: str, seconds: float) -> None:
+    with _quote_stats_lock:
+        _quote_stats[f"{kind}s"] += 1
+        _quote_stats[f"{kind}_seconds"] += seconds
+
+
+def _fetch_quote(ticker: str, fallback: bool) -> Quote | None:
+    quote = _fetch_snapshot([ticker]).get(ticker)
+    if quote is None and fallback:
+        quote = _fetch_info_quote(ticker)
+    return quote
+
+
+def _fetch_snapshot(tickers: list[str]) -> dict[str, Quote]:
+    """Read the latest minute bar of each ticker from one bulk download."""
+
+    def request():
+        return yf.download(
+            tickers,
+            period="1d",
+            interval="1m",
+            group_by="ticker",
+            auto_adjust=True,
+            progress=False,
+        )
+
+    started = time.perf_counter()
     try:
+        with section("yahoo:snapshot"):
+            frame = _provider_call(request)
+    finally:
+        _note_quote_request("snapshot", time.perf_counter() - started)
+    if frame is None or frame.empty:
+        return {}
+    now = datetime.now(ET)
+    quotes = {}
+    for ticker in tickers:
+        if ticker not in frame.columns.get_level_values(0):
+            continue
+        bars = frame[ticker].dropna(subset=["Close"])
+        if bars.empty:
+            continue
+        # A minute bar's close is its last trade, up to a minute after it opened.
+        opened = _to_et(bars.index[-1].to_pydatetime())
+        timestamp = min(opened + timedelta(minutes=1), now)
+        quotes[ticker] = Quote(
+            ticker,
+            float(bars["Close"].iloc[-1]),
+            timestamp,
+            SNAPSHOT,
+            staleness=round((now - timestamp).total_seconds(), 1),
+            volume=float(bars["Volume"].sum()) if "Volume" in bars else None,
+        )
+    return quotes
+
+
+def _fetch_info_quote(ticker: str) -> Quote | None:
+    """Read a quote, with bid and ask, from the heavy per-ticker `info` endpoint."""
+
+    def request():
+        return yf.Ticker(ticker).info
+
+    started = time.perf_counter()
+    try:
+        with section("yahoo:info"):
+            info = _provider_call(request)
+    finally:
+        _note_quote_request("fallback", time.perf_counter() - started)
+    price = info.get("currentPrice") or info.get("regularMarketPrice")
+    if not price:
+        return None
+    now = datetime.now(ET)
+    traded = info.get("regularMarketTime")
+    timestamp = datetime.fromtimestamp(traded, ET) if traded else now
+    return Quote(
+        ticker,
+        float(price),
+        timestamp,
+        INFO,
+        staleness=round((now - timestamp).total_seconds(), 1),
+        bid=info.get("bid"),
+        ask=info.get("ask"),
+        volume=info.get("regularMarketVolume"),
+    )
+
+
+def _fetch_history(
+    ticker: str,
+    period: str,
+    interval: str,
+    start: str | None,
+    end: str | None,
+):
+    def request():
         stock = yf.Ticker(ticker)
         if start or end:
-            history = stock.history(start=start, end=end, interval=interval)
-        else:
-            history = stock.history(period=period, interval=interval)
-        if history is None or history.empty:
-            return None
-        return history
-    except Exception:
+            return stock.history(start=start, end=end, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+    with section("yahoo:history"):
+        history = _provider_call(request)
+    if history is None or history.empty:
         return None
+    return history
+
+
+def _fetch_histories(
+    tickers: list[str],
+    period: str,
+    interval: str,
+    start: str | None,
+    end: str | None,
+) -> dict:
+    def request():
+        window = {"start": start, "end": end} if start or end else {"period": period}
+        return yf.download(
+            tickers,
+            interval=interval,
+            group_by="ticker",
+            auto_adjust=True,
+            ignore_tz=False,
+            progress=False,
+            **window,
+        )
+
+    with section("yahoo:download"):
+        frame = _provider_call(request)
+    if frame is None or frame.empty:
+        return {}
+    histories = {}
+    for ticker in tickers:
+        if ticker not in frame.columns.get_level_values(0):
+            continue
+        history = frame[ticker].dropna(how="all")
+        if not history.empty:
+            histories[ticker] = _in_exchange_time(history)
+    return histories
+
+
+def _in_exchange_time(history):
+    """Index bulk-downloaded bars in ET, like Ticker.history does for US tickers.
+
+    Both fetch paths memoize under the same key, so their frames must agree
+    on the index tz for callers that align several tickers' bars.
+    """
+    index = history.index
+    if not isinstance(index, pd.DatetimeIndex):
+        return history
+    if index.tz is None:
+        index = index.tz_localize(ET)
+    else:
+        index = index.tz_convert(ET)
+    return history.set_axis(index)
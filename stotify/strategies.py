@@ -2,10 +2,32 @@
 
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Callable
+from datetime import datetime
+from functools import cached_property
+from typing import Protocol
 
-from stotify.stock import get_history, get_price
+import numpy as np
+import pandas as pd
+
+from stotify.bars import completed_bars, intraday_period, is_intraday, load_bars
+from stotify.indicators import (
+    EMA,
+    IndicatorCache,
+    RollingStats,
+    SessionAnchor,
+    WilderRSI,
+    get_state_store,
+    rolling_means,
+)
+from stotify.market_hours import ET
+from stotify.price_matrix import PriceMatrices, last_valid, right_align
+from stotify.profiling import section
+from stotify.stock import Quote, get_history, get_quote, get_quotes
 
 
 @dataclass(frozen=True)
@@ -21,14 +43,156 @@ class StrategySignal:
 
 StrategyFn = Callable[[list[str], dict], list[StrategySignal]]
 
+# A series function maps a price history (at least a "Close" column) to a frame
+# on the same index. Boolean columns are signals named after the alert_type
+# they produce; any other columns are indicator values (e.g. moving averages).
+# Values at a bar may only depend on bars at or before it.
+SeriesFn = Callable[[pd.DataFrame, dict], pd.DataFrame]
+
+# A matrix function evaluates the last bar of many tickers at once. It maps a
+# (bars × tickers) closes matrix, NaN where a ticker has no bar, to the series
+# row of the last bar as one array per column, with one value per ticker.
+MatrixFn = Callable[[np.ndarray, dict], dict[str, np.ndarray]]
+
+
+class IncrementalStrategy(ABC):
+    """Bar-by-bar evaluation of a strategy with O(1) work per bar.
+
+    `update` consumes one bar (a dict with "timestamp", "Close" and optionally
+    "Open", "High", "Low", "Volume") and returns the same row the strategy's
+    series function would produce for that bar. `to_state` returns a
+    JSON-serializable snapshot that can be passed back to the constructor to
+    resume.
+    """
+
+    def __init__(self, params: dict, state: dict | None = None):
+        self.params = params
+
+    @abstractmethod
+    def update(self, bar: dict) -> dict: ...
+
+    @abstractmethod
+    def to_state(self) -> dict: ...
+
+
+@dataclass(frozen=True)
+class Param:
+    """Validation rule for one strategy parameter.
+
+    Numbers must be positive unless `minimum` is set; bounds are inclusive.
+    """
+
+    kind: type = float
+    required: bool = False
+    minimum: float | None = None
+    maximum: float | None = None
+
+    def accepts(self, value: object) -> bool:
+        if self.kind is bool:
+            return isinstance(value, bool)
+        if self.kind is str:
+            return isinstance(value, str) and bool(value)
+        allowed = (int,) if self.kind is int else (int, float)
+        if not isinstance(value, allowed) or isinstance(value, bool):
+            return False
+        if not (value >= self.minimum if self.minimum is not None else value > 0):
+            return False
+        return self.maximum is None or value <= self.maximum
+
+
+@dataclass(frozen=True)
+class ParamSchema:
+    """Declared parameters of a strategy; `require_any` needs one of its keys."""
+
+    params: dict[str, Param]
+    require_any: tuple[str, ...] = ()
+
+    @cached_property
+    def required(self) -> tuple[str, ...]:
+        return tuple(key for key, param in self.params.items() if param.required)
+
+
+# Parameters every strategy may set to override how bars are requested.
+COMMON_PARAMS = {"interval": Param(str), "period": Param(str)}
+
 STRATEGIES: dict[str, StrategyFn] = {}
+SIGNAL_SERIES: dict[str, SeriesFn] = {}
+INCREMENTAL: dict[str, type[IncrementalStrategy]] = {}
+QUOTE_STRATEGIES: set[str] = set()
+SIGNAL_MATRIX: dict[str, MatrixFn] = {}
+PARAM_SCHEMAS: dict[str, ParamSchema] = {}
+
+
+class Feed(Protocol):
+    """Alternative data source for strategies (e.g. a historical replay)."""
+
+    def latest(
+        self, strategy: str, ticker: str, params: dict, interval: str | None
+    ) -> tuple[float, dict] | None: ...
+
 
+_ACTIVE_FEED: ContextVar[Feed | None] = ContextVar("active_feed", default=None)
+_RUN_CACHE: ContextVar[IndicatorCache | None] = ContextVar("run_cache", default=None)
+_ACTIVE_TIMEFRAME: ContextVar[str | None] = ContextVar("active_timeframe", default=None)
+_DATA_TIMES: ContextVar[list[pd.Timestamp] | None] = ContextVar(
+    "data_times", default=None
+)
+_PRICE_MATRICES: ContextVar[PriceMatrices | None] = ContextVar(
+    "price_matrices", default=None
+)
 
-def register_strategy(name: str) -> Callable[[StrategyFn], StrategyFn]:
-    """Register a strategy function by name."""
+
+@contextmanager
+def use_feed(feed: Feed) -> Iterator[Feed]:
+    """Route strategy data lookups to a feed instead of Yahoo Finance."""
+    token = _ACTIVE_FEED.set(feed)
+    try:
+        yield feed
+    finally:
+        _ACTIVE_FEED.reset(token)
+
+
+@contextmanager
+def use_timeframe(timeframe: str) -> Iterator[str]:
+    """Evaluate strategies on completed bars of a sub-daily alert timeframe."""
+    token = _ACTIVE_TIMEFRAME.set(timeframe)
+    try:
+        yield timeframe
+    finally:
+        _ACTIVE_TIMEFRAME.reset(token)
+
+
+def register_strategy(
+    name: str,
+    series: SeriesFn | None = None,
+    incremental: type[IncrementalStrategy] | None = None,
+    params: dict[str, Param] | None = None,
+    require_any: tuple[str, ...] = (),
+    matrix: MatrixFn | None = None,
+    quotes: bool = False,
+) -> Callable[[StrategyFn], StrategyFn]:
+    """Register a strategy function by name.
+
+    A strategy can also register its vectorized series function, its
+    incremental (bar-by-bar) evaluator, its matrix function (all tickers'
+    last bar at once) and the parameters configs may set, which are used to
+    validate alerts. Strategies that read live quotes set `quotes` so runs
+    can fetch their tickers' quotes in one bulk request.
+    """
 
     def decorator(func: StrategyFn) -> StrategyFn:
         STRATEGIES[name] = func
+        PARAM_SCHEMAS[name] = ParamSchema(
+            {**COMMON_PARAMS, **(params or {})}, require_any
+        )
+        if series is not None:
+            SIGNAL_SERIES[name] = series
+        if incremental is not None:
+            INCREMENTAL[name] = incremental
+        if matrix is not None:
+            SIGNAL_MATRIX[name] = matrix
+        if quotes:
+            QUOTE_STRATEGIES.add(name)
         return func
 
     return decorator
@@ -41,80 +205,970 @@ def get_strategy(name: str) -> StrategyFn:
     return STRATEGIES[name]
 
 
-@register_strategy("threshold")
+def get_series(name: str) -> SeriesFn:
+    """Return the series function for a strategy by name."""
+    if name not in SIGNAL_SERIES:
+        raise ValueError(f"Strategy '{name}' has no series function")
+    return SIGNAL_SERIES[name]
+
+
+def signal_columns(frame: pd.DataFrame) -> list[str]:
+    """Return the signal (boolean) columns of a series frame."""
+    return [
+        column
+        for column, dtype in frame.dtypes.items()
+        if pd.api.types.is_bool_dtype(dtype)
+    ]
+
+
+@contextmanager
+def track_data_times() -> Iterator[list[pd.Timestamp]]:
+    """Collect the time of the newest quote or bar behind each data lookup."""
+    times: list[pd.Timestamp] = []
+    token = _DATA_TIMES.set(times)
+    try:
+        yield times
+    finally:
+        _DATA_TIMES.reset(token)
+
+
+def _note_data_time(timestamp) -> None:
+    times = _DATA_TIMES.get()
+    if times is not None:
+        times.append(pd.Timestamp(timestamp))
+
+
+@contextmanager
+def use_indicator_cache(cache: IndicatorCache) -> Iterator[IndicatorCache]:
+    """Share fetched data and indicator series across strategies in one run."""
+    token = _RUN_CACHE.set(cache)
+    try:
+        yield cache
+    finally:
+        _RUN_CACHE.reset(token)
+
+
+@contextmanager
+def use_price_matrices(matrices: PriceMatrices) -> Iterator[PriceMatrices]:
+    """Evaluate strategies with matrix functions on shared price matrices."""
+    token = _PRICE_MATRICES.set(matrices)
+    try:
+        yield matrices
+    finally:
+        _PRICE_MATRICES.reset(token)
+
+
+def uses_quotes(alert: dict) -> bool:
+    """Check whether an alert is evaluated on live quotes rather than bars."""
+    if alert["strategy"] not in QUOTE_STRATEGIES:
+        return False
+    return not (alert["params"].get("on_close") and is_intraday(alert["timeframe"]))
+
+
+def prefetch_quotes(tickers: list[str]) -> None:
+    """Fetch quotes for tickers into the run cache with one bulk request."""
+    cache = _RUN_CACHE.get()
+    if cache is None or _ACTIVE_FEED.get() is not None or not tickers:
+        return
+    cache.prefetch_quotes(tickers, get_quotes)
+
+
+def _fetch_quote(ticker: str) -> Quote | None:
+    cache = _RUN_CACHE.get()
+    if cache is not None:
+        quote = cache.quote(ticker, get_quote)
+    else:
+        quote = get_quote(ticker)
+    if quote is not None:
+        _note_data_time(quote.timestamp)
+    return quote
+
+
+def _fetch_history(ticker: str, **kwargs):
+    cache = _RUN_CACHE.get()
+    if cache is not None:
+        history = cache.history(ticker, get_history, **kwargs)
+    else:
+        history = get_history(ticker, **kwargs)
+    if history is not None and not history.empty:
+        _note_data_time(history.index[-1])
+    return history
+
+
+def _bar_request(params: dict, period: str, interval: str) -> tuple[str, str]:
+    """Return the (period, interval) to evaluate, following the alert timeframe.
+
+    Without an explicit `interval` param, alerts with a sub-daily timeframe
+    evaluate bars of that timeframe instead of the strategy default.
+    """
+    timeframe = _ACTIVE_TIMEFRAME.get()
+    if "interval" not in params and is_intraday(timeframe):
+        if not is_intraday(interval):
+            period = intraday_period(timeframe)
+        interval = timeframe
+    return params.get("period", period), params.get("interval", interval)
+
+
+def _fetch_bars(ticker: str, interval: str, **kwargs) -> pd.DataFrame | None:
+    """Fetch bars with non-missing closes, dropping a still-forming intraday bar."""
+    history = load_bars(_fetch_history, ticker, interval, **kwargs)
+    if history is not None and is_intraday(interval):
+        history = completed_bars(history, interval, datetime.now(ET))
+    if history is None or history.empty:
+        return None
+    return history
+
+
+def quote_signals(
+    strategy: str, ticker: str, params: dict
+) -> tuple[float, dict] | None:
+    """Return the current price and a strategy's series row evaluated on it.
+
+    With `on_close` set and a sub-daily timeframe, the close of the last
+    completed bar is used instead of the live quote. Quotes older than the
+    `max_age` param (seconds) are skipped as if there were no data.
+    """
+    if params.get("on_close") and is_intraday(_ACTIVE_TIMEFRAME.get()):
+        period, interval = _bar_request(params, "1d", "1d")
+        return latest_signals(
+            strategy, ticker, params, period=period, interval=interval
+        )
+
+    feed = _ACTIVE_FEED.get()
+    if feed is not None:
+        return feed.latest(strategy, ticker, params, None)
+
+    quote = _fetch_quote(ticker)
+    if quote is None:
+        return None
+    if "max_age" in params and quote.age() > params["max_age"]:
+        return None
+
+    latest = get_series(strategy)(pd.DataFrame({"Close": [quote.price]}), params)
+    return quote.price, latest.iloc[-1].to_dict()
+
+
+def latest_signals(
+    strategy: str,
+    ticker: str,
+    params: dict,
+    *,
+    period: str,
+    interval: str,
+    min_bars: int = 1,
+) -> tuple[float, dict] | None:
+    """Return the last close and last series row for a strategy on a ticker."""
+    feed = _ACTIVE_FEED.get()
+    if feed is not None:
+        return feed.latest(strategy, ticker, params, interval)
+
+    history = _fetch_bars(ticker, interval, period=period)
+    if history is None or len(history) < min_bars:
+        return None
+
+    latest = get_series(strategy)(history, params).iloc[-1]
+    return float(history["Close"].iloc[-1]), latest.to_dict()
+
+
+def matrix_signals(
+    strategy: str,
+    tickers: list[str],
+    params: dict,
+    *,
+    period: str,
+    interval: str,
+    min_bars: int = 1,
+) -> dict[str, tuple[float, dict]] | None:
+    """Return the last close and last series row of each ticker from a matrix.
+
+    All tickers are evaluated with one call of the strategy's matrix
+    function. Tickers with fewer than min_bars closes are left out. Returns
+    None, for the caller to evaluate ticker by ticker, outside a
+    use_price_matrices scope, with a feed, for intraday bars or when the
+    strategy has no matrix function.
+    """
+    matrices = _PRICE_MATRICES.get()
+    if (
+        matrices is None
+        or _ACTIVE_FEED.get() is not None
+        or strategy not in SIGNAL_MATRIX
+        or is_intraday(interval)
+        or not set(tickers) <= set(matrices.tickers)
+    ):
+        return None
+
+    matrix = matrices.get(period, interval)
+    closes = matrix.columns(tickers)
+    if len(closes) == 0:
+        return {}
+    rows, counts = last_valid(closes)
+    with section(f"matrix:{strategy}"):
+        latest = SIGNAL_MATRIX[strategy](closes, params)
+    evaluated = {}
+    for column, ticker in enumerate(tickers):
+        if counts[column] < min_bars:
+            continue
+        _note_data_time(matrix.index[rows[column]])
+        evaluated[ticker] = (
+            float(closes[rows[column], column]),
+            {name: values[column].item() for name, values in latest.items()},
+        )
+    return evaluated
+
+
+def incremental_signals(
+    strategy: str,
+    ticker: str,
+    params: dict,
+    *,
+    period: str,
+    interval: str,
+) -> tuple[float, dict] | None:
+    """Return the last close and signal row from a strategy's incremental state.
+
+    With a state store configured, only bars after the last persisted bar are
+    fetched. A daily bar may still be forming, so the newest one is evaluated
+    but never persisted; intraday histories only hold completed bars, so every
+    bar is persisted and each run extends the state by the bars since. The
+    row of the last persisted bar is saved too and returned when no bar is
+    newer, e.g. for the same alert in another group or a rerun within a bar.
+    """
+    feed = _ACTIVE_FEED.get()
+    if feed is not None:
+        return feed.latest(strategy, ticker, params, interval)
+
+    store = get_state_store()
+    key = state_key(strategy, ticker, interval, params)
+    saved = store.get(key) if store is not None else None
+    if saved is not None:
+        last_bar = pd.Timestamp(saved["last_bar"])
+        history = _fetch_bars(ticker, interval, start=str(last_bar.date()))
+    else:
+        history = _fetch_bars(ticker, interval, period=period)
+    if history is None:
+        return None
+
+    if saved is not None:
+        history = history[history.index > last_bar]
+    if history.empty:
+        if saved is None or "latest" not in saved:
+            return None
+        return saved["latest"]["close"], dict(saved["latest"]["row"])
+
+    evaluator = INCREMENTAL[strategy](params, saved["indicators"] if saved else None)
+    bars = [
+        {"timestamp": timestamp, **row}
+        for timestamp, row in zip(history.index, history.to_dict("records"))
+    ]
+    intraday = is_intraday(interval)
+    complete = bars if intraday else bars[:-1]
+    for bar in complete:
+        latest = evaluator.update(bar)
+    if store is not None and complete:
+        store.set(
+            key,
+            {
+                "last_bar": complete[-1]["timestamp"].isoformat(),
+                "indicators": evaluator.to_state(),
+                "latest": {
+                    "close": float(complete[-1]["Close"]),
+                    "row": {
+                        name: value.item() if isinstance(value, np.generic) else value
+                        for name, value in latest.items()
+                    },
+                },
+            },
+        )
+    if not intraday:
+        latest = evaluator.update(bars[-1])
+    return float(bars[-1]["Close"]), latest
+
+
+def state_key(strategy: str, ticker: str, interval: str, params: dict) -> str:
+    """Return the persisted state key for one strategy evaluation."""
+    encoded = ",".join(f"{k}={params[k]}" for k in sorted(params))
+    return f"{strategy}|{ticker}|{interval}|{encoded}"
+
+
+def save_state() -> None:
+    """Persist incremental strategy state, if a state store is configured."""
+    store = get_state_store()
+    if store is not None:
+        store.save()
+
+
+def _session_keys(index: pd.Index) -> pd.Index:
+    """Return the ET trading date of each bar as an ISO string."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert(ET)
+    return pd.Index(index.strftime("%Y-%m-%d"))
+
+
+def _bar_session(bar: dict) -> str:
+    timestamp = pd.Timestamp(bar["timestamp"])
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(ET)
+    return timestamp.strftime("%Y-%m-%d")
+
+
+def _column(history: pd.DataFrame, name: str) -> pd.Series:
+    """Return an OHLCV column, falling back to Close when it is missing."""
+    return history[name] if name in history else history["Close"]
+
+
+def threshold_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars whose close is at/above `high` or at/below `low`."""
+    closes = history["Close"]
+    frame = pd.DataFrame(index=history.index)
+    if params.get("high") is not None:
+        frame["high"] = (closes >= params["high"]).to_numpy()
+    if params.get("low") is not None:
+        frame["low"] = (closes <= params["low"]).to_numpy()
+    return frame
+
+
+def ma_cross_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars where the fast moving average is above the slow one."""
+    closes = history["Close"]
+    fast_window = int(params["fast_window"])
+    slow_window = int(params["slow_window"])
+    values = closes.to_numpy(dtype=float)
+    if np.isfinite(values).all():
+        means = rolling_means(values, [fast_window, slow_window])
+        fast_ma = pd.Series(means[fast_window], index=history.index)
+        slow_ma = pd.Series(means[slow_window], index=history.index)
+    else:
+        fast_ma = closes.rolling(window=fast_window).mean()
+        slow_ma = closes.rolling(window=slow_window).mean()
+    return pd.DataFrame(
+        {"fast_ma": fast_ma, "slow_ma": slow_ma, "ma_cross": fast_ma > slow_ma},
+        index=history.index,
+    )
+
+
+def ma_cross_matrix(closes: np.ndarray, params: dict) -> dict[str, np.ndarray]:
+    """Evaluate the last ma_cross row of every column of a closes matrix."""
+    aligned, counts = right_align(closes)
+    latest = {}
+    for name, window in (
+        ("fast_ma", int(params["fast_window"])),
+        ("slow_ma", int(params["slow_window"])),
+    ):
+        means = aligned[-window:].mean(axis=0)
+        latest[name] = np.where(counts >= window, means, np.nan)
+    latest["ma_cross"] = latest["fast_ma"] > latest["slow_ma"]
+    return latest
+
+
+def _cached_ma_cross(
+    cache: IndicatorCache,
+    ticker: str,
+    period: str,
+    interval: str,
+    fast_window: int,
+    slow_window: int,
+) -> tuple[float, dict] | None:
+    """Evaluate the last ma_cross row from run-cached moving averages."""
+    # Served from the run cache; called for the data time it notes.
+    if _fetch_history(ticker, period=period, interval=interval) is None:
+        return None
+    closes = cache.closes(ticker, period, interval, get_history)
+    if closes is None or len(closes) < slow_window:
+        return None
+    fast_ma = cache.sma(ticker, period, interval, fast_window, get_history)[-1]
+    slow_ma = cache.sma(ticker, period, interval, slow_window, get_history)[-1]
+    return float(closes[-1]), {
+        "fast_ma": fast_ma,
+        "slow_ma": slow_ma,
+        "ma_cross": bool(fast_ma > slow_ma),
+    }
+
+
+class MaCrossIncremental(IncrementalStrategy):
+    def __init__(self, params: dict, state: dict | None = None):
+        super().__init__(params, state)
+        state = state or {}
+        self.fast = RollingStats(int(params["fast_window"]), state=state.get("fast"))
+        self.slow = RollingStats(int(params["slow_window"]), state=state.get("slow"))
+
+    def update(self, bar: dict) -> dict:
+        self.fast.update(bar["Close"])
+        self.slow.update(bar["Close"])
+        fast_ma = self.fast.mean
+        slow_ma = self.slow.mean
+        return {
+            "fast_ma": fast_ma,
+            "slow_ma": slow_ma,
+            "ma_cross": fast_ma is not None
+            and slow_ma is not None
+            and fast_ma > slow_ma,
+        }
+
+    def to_state(self) -> dict:
+        return {"fast": self.fast.to_state(), "slow": self.slow.to_state()}
+
+
+@register_strategy(
+    "threshold",
+    series=threshold_series,
+    params={
+        "high": Param(),
+        "low": Param(),
+        "on_close": Param(bool),
+        "max_age": Param(),
+    },
+    require_any=("high", "low"),
+    quotes=True,
+)
 def threshold_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
     """Trigger when price crosses high/low thresholds."""
     signals: list[StrategySignal] = []
-    high = params.get("high")
-    low = params.get("low")
 
     for ticker in tickers:
-        price = get_price(ticker)
-        if price is None:
+        evaluated = quote_signals("threshold", ticker, params)
+        if evaluated is None:
             continue
 
-        if high is not None and price >= high:
+        price, latest = evaluated
+        for alert_type, triggered in latest.items():
+            if triggered:
+                signals.append(
+                    StrategySignal(
+                        ticker=ticker,
+                        price=price,
+                        alert_type=alert_type,
+                        threshold=float(params[alert_type]),
+                    )
+                )
+
+    return signals
+
+
+@register_strategy(
+    "ma_cross",
+    series=ma_cross_series,
+    incremental=MaCrossIncremental,
+    params={
+        "fast_window": Param(int, required=True),
+        "slow_window": Param(int, required=True),
+    },
+    matrix=ma_cross_matrix,
+)
+def moving_average_cross_strategy(
+    tickers: list[str], params: dict
+) -> list[StrategySignal]:
+    """Trigger when a fast moving average is above a slow moving average.
+
+    Intraday intervals are evaluated incrementally on completed bars. With
+    price matrices in use, all tickers are evaluated in one 2-D computation.
+    """
+    signals: list[StrategySignal] = []
+    fast_window = int(params["fast_window"])
+    slow_window = int(params["slow_window"])
+    period, interval = _bar_request(params, "1y", "1d")
+    unit = "d" if interval == "1d" else f"x{interval}"
+
+    cache = _RUN_CACHE.get()
+    from_matrix = matrix_signals(
+        "ma_cross",
+        tickers,
+        params,
+        period=period,
+        interval=interval,
+        min_bars=slow_window,
+    )
+
+    for ticker in tickers:
+        if from_matrix is not None:
+            evaluated = from_matrix.get(ticker)
+        elif _ACTIVE_FEED.get() is None and is_intraday(interval):
+            evaluated = incremental_signals(
+                "ma_cross", ticker, params, period=period, interval=interval
+            )
+        elif cache is not None and _ACTIVE_FEED.get() is None:
+            evaluated = _cached_ma_cross(
+                cache, ticker, period, interval, fast_window, slow_window
+            )
+        else:
+            evaluated = latest_signals(
+                "ma_cross",
+                ticker,
+                params,
+                period=period,
+                interval=interval,
+                min_bars=slow_window,
+            )
+        if evaluated is None:
+            continue
+
+        price, latest = evaluated
+        if latest["ma_cross"]:
+            message = (
+                f"{ticker} {fast_window}{unit} MA (${latest['fast_ma']:.2f}) "
+                f"above {slow_window}{unit} MA (${latest['slow_ma']:.2f})"
+            )
             signals.append(
                 StrategySignal(
                     ticker=ticker,
                     price=price,
-                    alert_type="high",
-                    threshold=float(high),
+                    alert_type="ma_cross",
+                    threshold=None,
+                    message=message,
                 )
             )
 
-        if low is not None and price <= low:
+    return signals
+
+
+def ema_cross_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars where the fast EMA is above the slow EMA."""
+    closes = history["Close"]
+    fast = closes.ewm(span=int(params["fast_span"]), adjust=False).mean()
+    slow = closes.ewm(span=int(params["slow_span"]), adjust=False).mean()
+    return pd.DataFrame(
+        {"fast_ema": fast, "slow_ema": slow, "ema_cross": fast > slow},
+        index=history.index,
+    )
+
+
+class EmaCrossIncremental(IncrementalStrategy):
+    def __init__(self, params: dict, state: dict | None = None):
+        super().__init__(params, state)
+        state = state or {}
+        self.fast = EMA(int(params["fast_span"]), state=state.get("fast"))
+        self.slow = EMA(int(params["slow_span"]), state=state.get("slow"))
+
+    def update(self, bar: dict) -> dict:
+        fast = self.fast.update(bar["Close"])
+        slow = self.slow.update(bar["Close"])
+        return {"fast_ema": fast, "slow_ema": slow, "ema_cross": fast > slow}
+
+    def to_state(self) -> dict:
+        return {"fast": self.fast.to_state(), "slow": self.slow.to_state()}
+
+
+@register_strategy(
+    "ema_cross",
+    series=ema_cross_series,
+    incremental=EmaCrossIncremental,
+    params={
+        "fast_span": Param(int, required=True),
+        "slow_span": Param(int, required=True),
+    },
+)
+def ema_cross_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
+    """Trigger when a fast EMA is above a slow EMA."""
+    signals: list[StrategySignal] = []
+    period, interval = _bar_request(params, "1y", "1d")
+    for ticker in tickers:
+        evaluated = incremental_signals(
+            "ema_cross", ticker, params, period=period, interval=interval
+        )
+        if evaluated is None:
+            continue
+
+        price, latest = evaluated
+        if latest["ema_cross"]:
             signals.append(
                 StrategySignal(
                     ticker=ticker,
                     price=price,
-                    alert_type="low",
-                    threshold=float(low),
+                    alert_type="ema_cross",
+                    threshold=None,
+                    message=(
+                        f"{ticker} {params['fast_span']} EMA "
+                        f"(${latest['fast_ema']:.2f}) above "
+                        f"{params['slow_span']} EMA (${latest['slow_ema']:.2f})"
+                    ),
                 )
             )
-
     return signals
 
 
-@register_strategy("ma_cross")
-def moving_average_cross_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
-    """Trigger when a fast moving average is above a slow moving average."""
-    signals: list[StrategySignal] = []
-    fast_window = int(params["fast_window"])
-    slow_window = int(params["slow_window"])
-    period = params.get("period", "1y")
-    interval = params.get("interval", "1d")
+def rsi_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars where RSI is overbought or oversold."""
+    window = int(params.get("window", 14))
+    delta = history["Close"].diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / window, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / window, adjust=False).mean()
+    rsi = (100 - 100 / (1 + gain / loss)).where(loss != 0, 100.0).where(gain.notna())
+    return pd.DataFrame(
+        {
+            "rsi": rsi,
+            "overbought": rsi >= params.get("overbought", 70),
+            "oversold": rsi <= params.get("oversold", 30),
+        },
+        index=history.index,
+    )
+
+
+class RsiIncremental(IncrementalStrategy):
+    def __init__(self, params: dict, state: dict | None = None):
+        super().__init__(params, state)
+        self.rsi = WilderRSI(int(params.get("window", 14)), state=state)
+
+    def update(self, bar: dict) -> dict:
+        rsi = self.rsi.update(bar["Close"])
+        return {
+            "rsi": rsi,
+            "overbought": rsi is not None and rsi >= self.params.get("overbought", 70),
+            "oversold": rsi is not None and rsi <= self.params.get("oversold", 30),
+        }
+
+    def to_state(self) -> dict:
+        return self.rsi.to_state()
+
 
+@register_strategy(
+    "rsi",
+    series=rsi_series,
+    incremental=RsiIncremental,
+    params={
+        "window": Param(int),
+        "overbought": Param(maximum=100),
+        "oversold": Param(maximum=100),
+    },
+)
+def rsi_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
+    """Trigger when RSI is at/above overbought or at/below oversold."""
+    signals: list[StrategySignal] = []
+    window = int(params.get("window", 14))
+    bounds = {
+        "overbought": ("at/above", float(params.get("overbought", 70))),
+        "oversold": ("at/below", float(params.get("oversold", 30))),
+    }
+    period, interval = _bar_request(params, "1y", "1d")
     for ticker in tickers:
-        history = get_history(ticker, period=period, interval=interval)
-        if history is None or history.empty:
+        evaluated = incremental_signals(
+            "rsi", ticker, params, period=period, interval=interval
+        )
+        if evaluated is None:
             continue
 
-        closes = history["Close"].dropna()
-        if len(closes) < slow_window:
+        price, latest = evaluated
+        for alert_type, (relation, bound) in bounds.items():
+            if latest[alert_type]:
+                signals.append(
+                    StrategySignal(
+                        ticker=ticker,
+                        price=price,
+                        alert_type=alert_type,
+                        threshold=bound,
+                        message=(
+                            f"{ticker} RSI({window}) {latest['rsi']:.1f} "
+                            f"{relation} {bound:g} ({alert_type})"
+                        ),
+                    )
+                )
+    return signals
+
+
+def bollinger_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars that close outside the Bollinger bands."""
+    closes = history["Close"]
+    window = int(params.get("window", 20))
+    num_std = float(params.get("num_std", 2))
+    rolling = closes.rolling(window=window)
+    middle = rolling.mean()
+    width = rolling.std(ddof=0) * num_std
+    upper = middle + width
+    lower = middle - width
+    return pd.DataFrame(
+        {
+            "middle": middle,
+            "upper": upper,
+            "lower": lower,
+            "upper_break": closes > upper,
+            "lower_break": closes < lower,
+        },
+        index=history.index,
+    )
+
+
+class BollingerIncremental(IncrementalStrategy):
+    def __init__(self, params: dict, state: dict | None = None):
+        super().__init__(params, state)
+        self.stats = RollingStats(int(params.get("window", 20)), state=state)
+        self.num_std = float(params.get("num_std", 2))
+
+    def update(self, bar: dict) -> dict:
+        close = bar["Close"]
+        self.stats.update(close)
+        if not self.stats.full:
+            return {
+                "middle": None,
+                "upper": None,
+                "lower": None,
+                "upper_break": False,
+                "lower_break": False,
+            }
+        middle = self.stats.mean
+        width = self.stats.std * self.num_std
+        return {
+            "middle": middle,
+            "upper": middle + width,
+            "lower": middle - width,
+            "upper_break": close > middle + width,
+            "lower_break": close < middle - width,
+        }
+
+    def to_state(self) -> dict:
+        return self.stats.to_state()
+
+
+@register_strategy(
+    "bollinger",
+    series=bollinger_series,
+    incremental=BollingerIncremental,
+    params={"window": Param(int), "num_std": Param()},
+)
+def bollinger_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
+    """Trigger when price closes above the upper or below the lower band."""
+    signals: list[StrategySignal] = []
+    period, interval = _bar_request(params, "1y", "1d")
+    for ticker in tickers:
+        evaluated = incremental_signals(
+            "bollinger", ticker, params, period=period, interval=interval
+        )
+        if evaluated is None:
             continue
 
-        fast_ma = closes.rolling(window=fast_window).mean().iloc[-1]
-        slow_ma = closes.rolling(window=slow_window).mean().iloc[-1]
-        if fast_ma is None or slow_ma is None:
+        price, latest = evaluated
+        for alert_type, band, relation in (
+            ("upper_break", "upper", "above"),
+            ("lower_break", "lower", "below"),
+        ):
+            if latest[alert_type]:
+                signals.append(
+                    StrategySignal(
+                        ticker=ticker,
+                        price=price,
+                        alert_type=alert_type,
+                        threshold=float(latest[band]),
+                        message=(
+                            f"{ticker} ${price:.2f} {relation} "
+                            f"{band} Bollinger band (${latest[band]:.2f})"
+                        ),
+                    )
+                )
+    return signals
+
+
+def pct_move_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars that moved at least `percent` since the session open."""
+    percent = float(params["percent"])
+    session_open = (
+        _column(history, "Open")
+        .groupby(_session_keys(history.index).to_numpy())
+        .transform("first")
+    )
+    move = (history["Close"] / session_open.to_numpy() - 1) * 100
+    return pd.DataFrame(
+        {"move_pct": move, "up": move >= percent, "down": move <= -percent},
+        index=history.index,
+    )
+
+
+class PctMoveIncremental(IncrementalStrategy):
+    def __init__(self, params: dict, state: dict | None = None):
+        super().__init__(params, state)
+        self.session = SessionAnchor(state)
+        self.percent = float(params["percent"])
+
+    def update(self, bar: dict) -> dict:
+        close = bar["Close"]
+        self.session.update(_bar_session(bar), bar.get("Open", close), close, 0.0)
+        move = (close / self.session.open - 1) * 100
+        return {
+            "move_pct": move,
+            "up": move >= self.percent,
+            "down": move <= -self.percent,
+        }
+
+    def to_state(self) -> dict:
+        return self.session.to_state()
+
+
+@register_strategy(
+    "pct_move",
+    series=pct_move_series,
+    incremental=PctMoveIncremental,
+    params={"percent": Param(required=True)},
+)
+def pct_move_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
+    """Trigger when price moved at least `percent` since the session open."""
+    signals: list[StrategySignal] = []
+    percent = float(params["percent"])
+    period, interval = _bar_request(params, "5d", "1d")
+    for ticker in tickers:
+        evaluated = incremental_signals(
+            "pct_move", ticker, params, period=period, interval=interval
+        )
+        if evaluated is None:
             continue
-        if fast_ma != fast_ma or slow_ma != slow_ma:
+
+        price, latest = evaluated
+        for alert_type in ("up", "down"):
+            if latest[alert_type]:
+                signals.append(
+                    StrategySignal(
+                        ticker=ticker,
+                        price=price,
+                        alert_type=alert_type,
+                        threshold=percent,
+                        message=(
+                            f"{ticker} ${price:.2f} is {latest['move_pct']:+.2f}% "
+                            "since the open"
+                        ),
+                    )
+                )
+    return signals
+
+
+def volume_spike_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars whose volume is a multiple of the trailing average volume."""
+    window = int(params.get("window", 20))
+    multiplier = float(params.get("multiplier", 2))
+    volume = history["Volume"]
+    average = volume.shift(1).rolling(window=window).mean()
+    return pd.DataFrame(
+        {
+            "average_volume": average,
+            "volume_spike": volume >= average * multiplier,
+        },
+        index=history.index,
+    )
+
+
+class VolumeSpikeIncremental(IncrementalStrategy):
+    def __init__(self, params: dict, state: dict | None = None):
+        super().__init__(params, state)
+        self.stats = RollingStats(int(params.get("window", 20)), state=state)
+        self.multiplier = float(params.get("multiplier", 2))
+
+    def update(self, bar: dict) -> dict:
+        average = self.stats.mean
+        volume = bar["Volume"]
+        self.stats.update(volume)
+        return {
+            "average_volume": average,
+            "volume_spike": average is not None and volume >= average * self.multiplier,
+        }
+
+    def to_state(self) -> dict:
+        return self.stats.to_state()
+
+
+@register_strategy(
+    "volume_spike",
+    series=volume_spike_series,
+    incremental=VolumeSpikeIncremental,
+    params={"window": Param(int), "multiplier": Param()},
+)
+def volume_spike_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
+    """Trigger when volume is at least `multiplier` times its trailing average."""
+    signals: list[StrategySignal] = []
+    period, interval = _bar_request(params, "3mo", "1d")
+    for ticker in tickers:
+        evaluated = incremental_signals(
+            "volume_spike", ticker, params, period=period, interval=interval
+        )
+        if evaluated is None:
             continue
 
-        if fast_ma > slow_ma:
-            price = float(closes.iloc[-1])
-            message = (
-                f"{ticker} {fast_window}d MA (${fast_ma:.2f}) "
-                f"above {slow_window}d MA (${slow_ma:.2f})"
-            )
+        price, latest = evaluated
+        if latest["volume_spike"]:
             signals.append(
                 StrategySignal(
                     ticker=ticker,
                     price=price,
-                    alert_type="ma_cross",
-                    threshold=None,
-                    message=message,
+                    alert_type="volume_spike",
+                    threshold=float(params.get("multiplier", 2)),
+                    message=(
+                        f"{ticker} volume spike at ${price:.2f} "
+                        f"(avg volume {latest['average_volume']:,.0f})"
+                    ),
                 )
             )
+    return signals
 
+
+def vwap_breakout_series(history: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Flag bars that close beyond the session VWAP by `band_pct` percent."""
+    band = float(params.get("band_pct", 0)) / 100
+    sessions = _session_keys(history.index).to_numpy()
+    typical = (
+        _column(history, "High") + _column(history, "Low") + history["Close"]
+    ) / 3
+    volume = history["Volume"]
+    vwap = (typical * volume).groupby(sessions).cumsum() / volume.groupby(
+        sessions
+    ).cumsum()
+    closes = history["Close"]
+    return pd.DataFrame(
+        {
+            "vwap": vwap,
+            "above_vwap": closes > vwap * (1 + band),
+            "below_vwap": closes < vwap * (1 - band),
+        },
+        index=history.index,
+    )
+
+
+class VwapBreakoutIncremental(IncrementalStrategy):
+    def __init__(self, params: dict, state: dict | None = None):
+        super().__init__(params, state)
+        self.session = SessionAnchor(state)
+        self.band = float(params.get("band_pct", 0)) / 100
+
+    def update(self, bar: dict) -> dict:
+        close = bar["Close"]
+        typical = (bar.get("High", close) + bar.get("Low", close) + close) / 3
+        self.session.update(
+            _bar_session(bar), bar.get("Open", close), typical, bar["Volume"]
+        )
+        vwap = self.session.vwap
+        return {
+            "vwap": vwap,
+            "above_vwap": vwap is not None and close > vwap * (1 + self.band),
+            "below_vwap": vwap is not None and close < vwap * (1 - self.band),
+        }
+
+    def to_state(self) -> dict:
+        return self.session.to_state()
+
+
+@register_strategy(
+    "vwap_breakout",
+    series=vwap_breakout_series,
+    incremental=VwapBreakoutIncremental,
+    params={"band_pct": Param(minimum=0)},
+)
+def vwap_breakout_strategy(tickers: list[str], params: dict) -> list[StrategySignal]:
+    """Trigger when price breaks above or below the session VWAP."""
+    signals: list[StrategySignal] = []
+    period, interval = _bar_request(params, "1d", "15m")
+    for ticker in tickers:
+        evaluated = incremental_signals(
+            "vwap_breakout", ticker, params, period=period, interval=interval
+        )
+        if evaluated is None:
+            continue
+
+        price, latest = evaluated
+        for alert_type, relation in (("above_vwap", "above"), ("below_vwap", "below")):
+            if latest[alert_type]:
+                signals.append(
+                    StrategySignal(
+                        ticker=ticker,
+                        price=price,
+                        alert_type=alert_type,
+                        threshold=float(latest["vwap"]),
+                        message=(
+                            f"{ticker} ${price:.2f} {relation} "
+                            f"session VWAP (${latest['vwap']:.2f})"
+                        ),
+                    )
+                )
     return signals
@@ -0,0 +1,321 @@
+"""Schema-driven validation of alerts.json.
+
+Validation runs in one pass and collects every problem with the JSON path
+it was found at. Strategy parameters are checked against the schema each
+strategy declares in register_strategy, and notifier backends against the
+options their constructors take. orjson is used to parse configs
+when it is installed.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from stotify.notifier import BACKENDS, DEFAULT_ROUTE, backend_options
+from stotify.strategies import PARAM_SCHEMAS
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib parser works the same
+    orjson = None
+
+TIMEFRAME_PATTERN = re.compile(r"^[1-9]\d*(m|h|d)$")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class Issue:
+    """One validation problem and where it is in the config."""
+
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+class ConfigError(ValueError):
+    """A config failed validation; `issues` lists every problem found."""
+
+    def __init__(self, issues: list[Issue]):
+        self.issues = issues
+        super().__init__("\n".join(str(issue) for issue in issues))
+
+
+def is_valid_group_name(name: str) -> bool:
+    """Check if group name is valid ntfy.sh channel name."""
+    if not name:
+        return False
+    if len(name) > 100:
+        return False
+    return bool(re.match(r"^[a-zA-Z0-9_-]+$", name))
+
+
+@lru_cache(maxsize=256)
+def is_valid_timeframe(timeframe: str) -> bool:
+    """Check if timeframe matches supported patterns (e.g., 15m, 6h, 1d)."""
+    return bool(TIMEFRAME_PATTERN.match(timeframe))
+
+
+def member(path: str, key: str | int) -> str:
+    """Return the JSON path of an object member or array item under path."""
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    if _IDENTIFIER.match(key):
+        return f"{path}.{key}"
+    return f"{path}[{json.dumps(key)}]"
+
+
+def ticker_issues(
+    alert: dict, group_name: str, path: str = "$"
+) -> tuple[list[str], list[Issue]]:
+    """Return an alert's tickers and any problems with how they are given."""
+    if "tickers" in alert and "ticker" in alert:
+        return [], [
+            Issue(
+                path,
+                f"Alert in group '{group_name}' cannot define both 'ticker' "
+                "and 'tickers'",
+            )
+        ]
+    if "tickers" in alert:
+        tickers = alert["tickers"]
+        if (
+            not isinstance(tickers, list)
+            or not tickers
+            or not all(isinstance(t, str) and t for t in tickers)
+        ):
+            return [], [
+                Issue(
+                    f"{path}.tickers",
+                    f"Alert in group '{group_name}' has invalid 'tickers'",
+                )
+            ]
+        return tickers, []
+    if "ticker" in alert:
+        ticker = alert["ticker"]
+        if not isinstance(ticker, str) or not ticker:
+            return [], [
+                Issue(
+                    f"{path}.ticker",
+                    f"Alert in group '{group_name}' has invalid 'ticker'",
+                )
+            ]
+        return [ticker], []
+    return [], [
+        Issue(path, f"Alert in group '{group_name}' missing 'ticker' or 'tickers'")
+    ]
+
+
+def extract_tickers(alert: dict, group_name: str) -> list[str]:
+    """Return a list of tickers for an alert, validating the input."""
+    tickers, issues = ticker_issues(alert, group_name)
+    if issues:
+        raise ValueError(issues[0].message)
+    return tickers
+
+
+def alert_issues(alert: dict, group_name: str, path: str = "$") -> list[Issue]:
+    """Return every problem with a single alert configuration.
+
+    Paths are only built once a problem is found, so valid alerts cost a few
+    dictionary lookups.
+    """
+    if not isinstance(alert, dict):
+        return [Issue(path, f"Alert in group '{group_name}' must be an object")]
+    issues = []
+    strategy_name = alert.get("strategy")
+    if strategy_name is None:
+        issues.append(Issue(path, f"Alert in group '{group_name}' missing 'strategy'"))
+    timeframe = alert.get("timeframe")
+    if timeframe is None:
+        issues.append(Issue(path, f"Alert in group '{group_name}' missing 'timeframe'"))
+    elif not isinstance(timeframe, str) or not is_valid_timeframe(timeframe):
+        issues.append(
+            Issue(
+                f"{path}.timeframe",
+                f"Alert in group '{group_name}' has invalid timeframe",
+            )
+        )
+
+    tickers, problems = ticker_issues(alert, group_name, path)
+    issues.extend(problems)
+
+    params = alert.get("params")
+    if not isinstance(params, dict):
+        issues.append(
+            Issue(f"{path}.params", f"Alert in group '{group_name}' missing 'params'")
+        )
+    schema = (
+        PARAM_SCHEMAS.get(strategy_name) if isinstance(strategy_name, str) else None
+    )
+    if strategy_name is not None and schema is None:
+        issues.append(
+            Issue(
+                f"{path}.strategy",
+                f"Alert in group '{group_name}' has invalid strategy '{strategy_name}'",
+            )
+        )
+    if schema is None or not isinstance(params, dict):
+        return issues
+
+    declared = schema.params
+    for key, value in params.items():
+        param = declared.get(key)
+        if param is not None and not param.accepts(value):
+            issues.append(
+                Issue(
+                    member(f"{path}.params", key),
+                    f"Alert in group '{group_name}' has invalid '{key}' value",
+                )
+            )
+    for key in schema.required:
+        if key not in params:
+            issues.append(
+                Issue(
+                    f"{path}.params",
+                    f"Alert in group '{group_name}' missing '{key}' in params",
+                )
+            )
+    if schema.require_any and not any(key in params for key in schema.require_any):
+        ticker_label = ", ".join(tickers)
+        options = " or ".join(f"'{key}'" for key in schema.require_any)
+        issues.append(
+            Issue(
+                f"{path}.params",
+                f"Alert for {ticker_label} in group '{group_name}' must have "
+                f"{options} in params",
+            )
+        )
+    return issues
+
+
+def group_issues(group_name: str, alerts: list, path: str = "$") -> list[Issue]:
+    """Return problems with a group's name and its list of alerts."""
+    if not group_name:
+        return [Issue(path, "Group name cannot be empty")]
+    issues = []
+    if len(group_name) > 100:
+        issues.append(Issue(path, f"Group name '{group_name}' exceeds 100 characters"))
+    elif not is_valid_group_name(group_name):
+        issues.append(
+            Issue(
+                path,
+                f"Group name '{group_name}' contains invalid characters "
+                "(only a-z, A-Z, 0-9, -, _ allowed)",
+            )
+        )
+    if not alerts or not isinstance(alerts, list):
+        issues.append(Issue(path, f"Group '{group_name}' has no alerts"))
+    return issues
+
+
+def notifier_issues(config: dict) -> list[Issue]:
+    """Return problems with a config's notifier backends and group routes."""
+    issues = []
+    notifiers = config.get("notifiers", {})
+    notifiers_path = member("$", "notifiers")
+    if not isinstance(notifiers, dict):
+        return [Issue(notifiers_path, "'notifiers' must be an object")]
+    for name, options in notifiers.items():
+        path = member(notifiers_path, name)
+        if not isinstance(options, dict):
+            issues.append(Issue(path, f"Notifier '{name}' must be an object"))
+            continue
+        kind = options.get("type")
+        if kind not in BACKENDS:
+            issues.append(
+                Issue(f"{path}.type", f"Notifier '{name}' has invalid type '{kind}'")
+            )
+            continue
+        required, accepted = backend_options(kind)
+        for key in options:
+            if key != "type" and key not in accepted:
+                issues.append(
+                    Issue(
+                        member(path, key),
+                        f"Notifier '{name}' has unknown option '{key}'",
+                    )
+                )
+        for key in sorted(required - options.keys()):
+            issues.append(Issue(path, f"Notifier '{name}' missing '{key}'"))
+
+    routes = config.get("routes", {})
+    routes_path = member("$", "routes")
+    if not isinstance(routes, dict):
+        return [*issues, Issue(routes_path, "'routes' must be an object")]
+    for group_name, names in routes.items():
+        path = member(routes_path, group_name)
+        if group_name != DEFAULT_ROUTE and group_name not in config["groups"]:
+            issues.append(Issue(path, f"Route for unknown group '{group_name}'"))
+        if (
+            not isinstance(names, list)
+            or not names
+            or not all(isinstance(n, str) and n in notifiers for n in names)
+        ):
+            issues.append(
+                Issue(
+                    path,
+                    f"Route for '{group_name}' must list configured notifiers",
+                )
+            )
+    return issues
+
+
+def config_issues(config: object) -> list[Issue]:
+    """Return every problem in a parsed config, in document order."""
+    if not isinstance(config, dict) or not isinstance(config.get("groups"), dict):
+        return [Issue("$", "Config must have 'groups' object")]
+    issues = []
+    groups_path = member("$", "groups")
+    for group_name, alerts in config["groups"].items():
+        group_path = member(groups_path, group_name)
+        issues.extend(group_issues(group_name, alerts, group_path))
+        if not isinstance(alerts, list):
+            continue
+        for index, alert in enumerate(alerts):
+            problems = alert_issues(alert, group_name, f"{group_path}[{index}]")
+            if problems:
+                issues.extend(problems)
+    issues.extend(notifier_issues(config))
+    return issues
+
+
+def validate_alert(alert: dict, group_name: str) -> None:
+    """Validate a single alert configuration, raising ConfigError."""
+    issues = alert_issues(alert, group_name)
+    if issues:
+        raise ConfigError(issues)
+
+
+def validate_group(group_name: str, alerts: list) -> None:
+    """Validate a group's name and that it has a list of alerts."""
+    issues = group_issues(group_name, alerts)
+    if issues:
+        raise ConfigError(issues)
+
+
+def validate_config(config: object) -> None:
+    """Validate a parsed config, raising ConfigError listing every problem."""
+    issues = config_issues(config)
+    if issues:
+        raise ConfigError(issues)
+
+
+def parse_config(data: bytes | str) -> object:
+    """Parse config JSON, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_config(path: str | Path) -> dict:
+    """Load and validate alerts.json config."""
+    with open(path, "rb") as f:
+        config = parse_config(f.read())
+    validate_config(config)
+    return config
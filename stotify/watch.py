@@ -0,0 +1,242 @@
+"""Long-running alert checks that hot-reload alerts.json when it changes.
+
+    python -m stotify.watch alerts.json --cadence 15m
+
+Edits are validated per alert: unchanged groups are reused as-is and only
+alerts that were not valid before are re-checked. Quote/history caches live
+for the whole process and incremental state is keyed by alert content, so
+unchanged alerts stay warm across reloads.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from stotify.bars import is_intraday
+from stotify.indicators import get_state_store
+from stotify.main import check_alerts
+from stotify.market_hours import _to_et
+from stotify.schedule import timeframe_minutes
+from stotify.strategies import state_key
+from stotify.validation import (
+    ConfigError,
+    Issue,
+    alert_issues,
+    extract_tickers,
+    group_issues,
+    member,
+    notifier_issues,
+    parse_config,
+)
+
+
+@dataclass(frozen=True)
+class ConfigDiff:
+    """How a reloaded config differs from the previous one, in alerts."""
+
+    added: int
+    removed: int
+    unchanged: int
+    groups: tuple[str, ...]
+
+
+def _fingerprint(alert: dict) -> str:
+    return json.dumps(alert, sort_keys=True, separators=(",", ":"))
+
+
+class ConfigWatcher:
+    """Reload a config file when it changes, validating only what changed.
+
+    `config` is the last config that passed validation; a failed reload
+    raises and leaves it in place.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.config: dict | None = None
+        self._stamp: tuple[int, int] | None = None
+        self._fingerprints: dict[str, list[str]] = {}
+
+    def poll(self) -> ConfigDiff | None:
+        """Reload the file if it changed. Returns the diff, or None if unchanged."""
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return None
+        self._stamp = stamp
+
+        with open(self.path, "rb") as f:
+            raw = parse_config(f.read())
+        if not isinstance(raw, dict) or not isinstance(raw.get("groups"), dict):
+            raise ConfigError([Issue("$", "Config must have 'groups' object")])
+
+        groups = {}
+        fingerprints = {}
+        changed = []
+        issues = []
+        groups_path = member("$", "groups")
+        for group_name, alerts in raw["groups"].items():
+            group_path = member(groups_path, group_name)
+            problems = group_issues(group_name, alerts, group_path)
+            if problems:
+                issues.extend(problems)
+                continue
+            current = [_fingerprint(alert) for alert in alerts]
+            previous = self._fingerprints.get(group_name)
+            if current == previous:
+                groups[group_name] = self.config["groups"][group_name]
+            else:
+                known = set(previous or ())
+                for index, (alert, fingerprint) in enumerate(
+                    zip(alerts, current, strict=True)
+                ):
+                    if fingerprint not in known:
+                        issues.extend(
+                            alert_issues(alert, group_name, member(group_path, index))
+                        )
+                groups[group_name] = alerts
+                changed.append(group_name)
+            fingerprints[group_name] = current
+        issues.extend(notifier_issues(raw))
+        if issues:
+            raise ConfigError(issues)
+        changed.extend(name for name in self._fingerprints if name not in groups)
+
+        old = Counter(
+            (name, fingerprint)
+            for name, values in self._fingerprints.items()
+            for fingerprint in values
+        )
+        new = Counter(
+            (name, fingerprint)
+            for name, values in fingerprints.items()
+            for fingerprint in values
+        )
+        self.config = {**raw, "groups": groups}
+        self._fingerprints = fingerprints
+        return ConfigDiff(
+            added=(new - old).total(),
+            removed=(old - new).total(),
+            unchanged=(old & new).total(),
+            groups=tuple(changed),
+        )
+
+
+def prune_state(config: dict) -> int:
+    """Drop persisted incremental state that no alert in config can use."""
+    store = get_state_store()
+    if store is None:
+        return 0
+    live = {
+        state_key(alert["strategy"], ticker, "*", alert["params"])
+        for group_name, alerts in config["groups"].items()
+        for alert in alerts
+        for ticker in extract_tickers(alert, group_name)
+    }
+
+    def keep(key: str) -> bool:
+        strategy, ticker, _, params = key.split("|", 3)
+        return f"{strategy}|{ticker}|*|{params}" in live
+
+    return store.retain(keep)
+
+
+def watch(
+    path: str | Path,
+    *,
+    cadence: str = "15m",
+    skip_market_check: bool = False,
+    timeframe_filter: str | None = None,
+    poll: float = 5.0,
+    runs: int | None = None,
+    clock: Callable[[], datetime] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Check alerts once per cadence slot, reloading the config between runs.
+
+    The config file is polled every `poll` seconds. A reload that fails
+    validation is reported and the previous config keeps running. Stops
+    after `runs` check_alerts runs if given.
+    """
+    if not is_intraday(cadence):
+        raise ValueError(f"Watch cadence must be intraday, got '{cadence}'")
+    minutes = timeframe_minutes(cadence)
+    watcher = ConfigWatcher(path)
+    last_slot = None
+    completed = 0
+    while runs is None or completed < runs:
+        try:
+            diff = watcher.poll()
+        except (OSError, json.JSONDecodeError, ValueError) as exc:
+            print(f"Config reload failed: {exc}", file=sys.stderr)
+        else:
+            if diff is not None:
+                print(
+                    "Config loaded: "
+                    f"added={diff.added} "
+                    f"removed={diff.removed} "
+                    f"unchanged={diff.unchanged}"
+                )
+                if diff.removed:
+                    prune_state(watcher.config)
+
+        now = _to_et(clock() if clock else None)
+        slot = (now.date(), (now.hour * 60 + now.minute) // minutes)
+        if watcher.config is None or slot == last_slot:
+            sleep(poll)
+            continue
+        last_slot = slot
+        sent = check_alerts(
+            watcher.config,
+            skip_market_check=skip_market_check,
+            timeframe_filter=timeframe_filter,
+            now=now,
+            cadence=cadence,
+        )
+        print(f"Sent {sent} alert(s)")
+        completed += 1
+
+
+def main(args: list[str] | None = None) -> int:
+    """Run alert checks until interrupted."""
+    parser = argparse.ArgumentParser(description="Run stock alert checks continuously.")
+    parser.add_argument("config", nargs="?", default="alerts.json")
+    parser.add_argument(
+        "--cadence",
+        default=os.environ.get("STOTIFY_CADENCE", "15m"),
+        help="How often alerts are checked (e.g., 5m, 15m)",
+    )
+    parser.add_argument(
+        "--timeframe", default=os.environ.get("STOTIFY_TIMEFRAME"), help="Filter"
+    )
+    parser.add_argument("--skip-market-check", action="store_true")
+    parser.add_argument(
+        "--poll", type=float, default=5.0, help="Seconds between config checks"
+    )
+    parsed = parser.parse_args(args)
+
+    try:
+        watch(
+            parsed.config,
+            cadence=parsed.cadence,
+            skip_market_check=parsed.skip_market_check,
+            timeframe_filter=parsed.timeframe,
+            poll=parsed.poll,
+        )
+    except ValueError as exc:
+        print(f"Config error: {exc}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
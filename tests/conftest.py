@@ -0,0 +1,17 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from stotify.result_cache import get_result_cache
+from stotify.stock import clear_cache, reset_provider
+
+
+@pytest.fixture(autouse=True)
+def _clear_stock_cache():
+    """Keep memoized data and provider state from leaking between tests."""
+    clear_cache()
+    reset_provider()
+    get_result_cache().clear()
+    yield
+    clear_cache()
+    reset_provider()
@@ -1,6 +1,18 @@
+import numpy as np
 import pandas as pd
+import pytest
 
-from stotify.backtest import backtest_ma_cross
+from stotify.backtest import (
+    _summarize_trades,
+    backtest_alerts,
+    backtest_ma_cross,
+    backtest_ma_cross_chunks,
+    backtest_ma_cross_many,
+    backtest_strategy,
+    history_chunks,
+    walk_forward_ma_cross,
+)
+from stotify.signal_index import CrossoverIndex
 
 
 def make_history(close_values):
@@ -60,3 +72,259 @@ def test_backtest_no_history(monkeypatch):
 
     result = backtest_ma_cross("TEST")
     assert result.trades == []
+
+
+def test_backtest_equity_curve_and_exposure(monkeypatch):
+    history = make_history([1, 1, 1, 2, 3, 2, 1])
+
+    def fake_get_history(*_args, **_kwargs):
+        return history
+
+    monkeypatch.setattr("stotify.backtest.get_history", fake_get_history)
+
+    result = backtest_ma_cross(
+        "TEST",
+        fast_window=2,
+        slow_window=3,
+        exit_mode="cross",
+    )
+
+    assert result.exposure.tolist() == [False] * 4 + [True] * 3
+    assert result.equity.iloc[0] == 1.0
+    assert result.equity.iloc[-1] == pytest.approx(0.5)
+    assert result.benchmark.iloc[-1] == pytest.approx(1.0)
+    assert result.metrics["total_return"] == pytest.approx(-50.0)
+    assert result.metrics["max_drawdown"] == pytest.approx(-200 / 3)
+    assert result.metrics["exposure"] == pytest.approx(50.0)
+    assert result.metrics["buy_hold_return"] == pytest.approx(0.0)
+
+
+def test_summarize_trades_profit_factor():
+    metrics = _summarize_trades([10.0, -5.0, 20.0])
+
+    assert metrics["total_trades"] == 3.0
+    assert metrics["win_rate"] == pytest.approx(200 / 3)
+    assert metrics["profit_factor"] == pytest.approx(6.0)
+    assert metrics["total_return"] == pytest.approx((1.1 * 0.95 * 1.2 - 1) * 100)
+
+
+def make_wave_history(length=400):
+    steps = np.arange(length)
+    return make_history(100 + 10 * np.sin(steps / 15) + steps * 0.05)
+
+
+def test_walk_forward_stitches_out_of_sample_folds(monkeypatch):
+    history = make_wave_history()
+    monkeypatch.setattr(
+        "stotify.backtest.get_history", lambda *_args, **_kwargs: history
+    )
+
+    result = walk_forward_ma_cross(
+        "TEST",
+        fast_windows=[3, 5],
+        slow_windows=[10, 20],
+        train_bars=200,
+        test_bars=50,
+        workers=1,
+    )
+
+    assert len(result.folds) == 4
+    assert result.folds[0].test_start == history.index[200]
+    assert result.folds[-1].test_end == history.index[-1]
+    assert len(result.equity) == 200
+    assert result.equity.iloc[0] == 1.0
+    assert result.best_params in {(3, 10), (3, 20), (5, 10), (5, 20)}
+    assert "sharpe" in result.metrics
+
+
+def test_walk_forward_carries_open_positions_across_folds(monkeypatch):
+    history = make_history(np.linspace(100, 200, 400))
+    monkeypatch.setattr(
+        "stotify.backtest.get_history", lambda *_args, **_kwargs: history
+    )
+
+    result = walk_forward_ma_cross(
+        "TEST",
+        fast_windows=[3],
+        slow_windows=[10],
+        train_bars=200,
+        test_bars=50,
+        workers=1,
+    )
+
+    closes = history["Close"]
+    assert result.equity.iloc[0] == 1.0
+    assert result.equity.iloc[-1] == pytest.approx(closes.iloc[-1] / closes.iloc[200])
+    assert result.equity.iloc[50] == pytest.approx(closes.iloc[250] / closes.iloc[200])
+
+
+def test_walk_forward_parallel_matches_serial(monkeypatch):
+    history = make_wave_history()
+    monkeypatch.setattr(
+        "stotify.backtest.get_history", lambda *_args, **_kwargs: history
+    )
+    kwargs = {
+        "fast_windows": [3, 5],
+        "slow_windows": [10, 20],
+        "train_bars": 200,
+        "test_bars": 50,
+    }
+
+    serial = walk_forward_ma_cross("TEST", workers=1, **kwargs)
+    parallel = walk_forward_ma_cross("TEST", workers=2, **kwargs)
+
+    assert serial.folds == parallel.folds
+    assert serial.equity.equals(parallel.equity)
+
+
+def test_backtest_strategy_threshold(monkeypatch):
+    history = make_history([1, 3, 3, 1, 3, 1])
+    monkeypatch.setattr(
+        "stotify.backtest.get_history", lambda *_args, **_kwargs: history
+    )
+
+    result = backtest_strategy("TEST", "threshold", {"high": 2}, exit_mode="cross")
+
+    assert [trade.entry_date for trade in result.trades] == [
+        history.index[1],
+        history.index[4],
+    ]
+    assert [trade.exit_date for trade in result.trades] == [
+        history.index[3],
+        history.index[5],
+    ]
+
+
+def test_backtest_alerts_fetches_each_ticker_once(monkeypatch):
+    history = make_history([1, 1, 1, 2, 3, 4])
+    calls = []
+
+    def fake_get_history(ticker, **_kwargs):
+        calls.append(ticker)
+        return history
+
+    monkeypatch.setattr("stotify.backtest.get_history", fake_get_history)
+    config = {
+        "groups": {
+            "portfolio": [
+                {"ticker": "AAPL", "strategy": "threshold", "params": {"high": 2}},
+                {
+                    "tickers": ["AAPL", "MSFT"],
+                    "strategy": "ma_cross",
+                    "params": {"fast_window": 2, "slow_window": 3},
+                },
+            ]
+        }
+    }
+
+    results = backtest_alerts(config, hold_days=2)
+
+    assert sorted(calls) == ["AAPL", "MSFT"]
+    assert [(item.ticker, item.strategy) for item in results] == [
+        ("AAPL", "threshold"),
+        ("AAPL", "ma_cross"),
+        ("MSFT", "ma_cross"),
+    ]
+    assert "fast_ma" in results[1].result.history
+
+
+@pytest.mark.parametrize("exit_mode", ["fixed", "cross"])
+def test_chunked_backtest_matches_in_memory(monkeypatch, exit_mode):
+    rng = np.random.default_rng(3)
+    history = make_history(100 + np.cumsum(rng.normal(0, 0.5, 3000)))
+    monkeypatch.setattr(
+        "stotify.backtest.get_history", lambda *_args, **_kwargs: history
+    )
+    options = {"fast_window": 5, "slow_window": 30, "exit_mode": exit_mode}
+
+    expected = backtest_ma_cross("TEST", hold_days=7, **options)
+    chunks = (history.iloc[start : start + 97] for start in range(0, 3000, 97))
+    result = backtest_ma_cross_chunks(chunks, hold_days=7, **options)
+
+    assert result.trades == expected.trades
+    assert result.metrics == pytest.approx(expected.metrics, rel=1e-9)
+
+
+def test_backtest_many_matches_single_ticker_runs(monkeypatch):
+    rng = np.random.default_rng(4)
+    histories = {
+        ticker: make_history(100 + np.cumsum(rng.normal(0, 1, 300)))
+        for ticker in ("AAA", "BBB", "CCC")
+    }
+    histories["CCC"] = None
+    requests = []
+
+    def fake_get_histories(tickers, **_kwargs):
+        requests.append(list(tickers))
+        return {ticker: histories[ticker] for ticker in tickers}
+
+    monkeypatch.setattr("stotify.backtest.get_histories", fake_get_histories)
+    options = {"fast_window": 5, "slow_window": 20, "exit_mode": "cross"}
+
+    results = dict(backtest_ma_cross_many(["AAA", "BBB", "CCC"], workers=2, **options))
+
+    assert requests == [["AAA", "BBB", "CCC"]]
+    assert results["CCC"].history.empty
+    for ticker in ("AAA", "BBB"):
+        monkeypatch.setattr(
+            "stotify.backtest.get_history",
+            lambda *_args, ticker=ticker, **_kwargs: histories[ticker],
+        )
+        expected = backtest_ma_cross(ticker, **options)
+        assert results[ticker].trades == expected.trades
+
+
+def test_history_chunks_requests_consecutive_pages(monkeypatch):
+    calls = []
+
+    def fake_get_history(ticker, **kwargs):
+        calls.append((kwargs["start"], kwargs["end"]))
+        return make_history([1.0])
+
+    monkeypatch.setattr("stotify.backtest.get_history", fake_get_history)
+
+    chunks = list(
+        history_chunks("TEST", start="2020-01-01", end="2020-03-01", chunk_days=30)
+    )
+
+    assert len(chunks) == 2
+    assert calls == [("2020-01-01", "2020-01-31"), ("2020-01-31", "2020-03-01")]
+
+
+def test_signal_index_backtest_matches_recomputed(monkeypatch, tmp_path):
+    rng = np.random.default_rng(5)
+    history = make_history(100 + np.cumsum(rng.normal(0, 1, 800)))
+    monkeypatch.setattr(
+        "stotify.backtest.get_history",
+        lambda *_args, **_kwargs: history.iloc[300:],
+    )
+    index = CrossoverIndex(tmp_path / "crossovers.json")
+    index.update("TEST", history.iloc[:500], 5, 20)
+    index.save()
+
+    options = {"fast_window": 5, "slow_window": 20, "exit_mode": "cross"}
+    expected = backtest_ma_cross("TEST", **options)
+    result = backtest_ma_cross(
+        "TEST", signal_index=CrossoverIndex(tmp_path / "crossovers.json"), **options
+    )
+
+    assert result.trades == expected.trades
+    assert result.metrics == pytest.approx(expected.metrics)
+
+
+def test_crossover_index_queries_events_by_range():
+    history = make_history([3, 2, 1, 2, 3, 4, 3, 2, 1, 2, 3])
+    index = CrossoverIndex()
+    index.update("TEST", history.iloc[:6], 2, 3)
+    index.update("TEST", history.iloc[4:], 2, 3)
+
+    events = index.crossovers("TEST", 2, 3)
+    later = index.crossovers("TEST", 2, 3, start=history.index[5])
+
+    assert events["direction"].tolist() == ["cross_up", "cross_down", "cross_up"]
+    assert events["timestamp"].dt.tz_localize(None).tolist() == [
+        history.index[4],
+        history.index[7],
+        history.index[10],
+    ]
+    assert len(later) == 2
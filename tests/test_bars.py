@@ -0,0 +1,84 @@
+"""Tests for bars module."""
+
+from datetime import datetime
+
+import pandas as pd
+
+from stotify.bars import (
+    bar_end_times,
+    completed_bars,
+    intraday_period,
+    load_bars,
+    provider_interval,
+    resample_bars,
+)
+from stotify.market_hours import ET
+
+
+def make_session(freq="1h", periods=7):
+    index = pd.date_range("2024-01-10 09:30", periods=periods, freq=freq, tz=ET)
+    closes = [float(i) for i in range(1, periods + 1)]
+    return pd.DataFrame(
+        {
+            "Open": closes,
+            "High": [c + 0.5 for c in closes],
+            "Low": [c - 0.5 for c in closes],
+            "Close": closes,
+            "Volume": [100.0] * periods,
+        },
+        index=index,
+    )
+
+
+def test_provider_interval_resamples_unsupported_intervals():
+    assert provider_interval("15m") == "15m"
+    assert provider_interval("1d") == "1d"
+    assert provider_interval("6h") == "1h"
+    assert provider_interval("45m") == "15m"
+    assert intraday_period("1m") == "5d"
+    assert intraday_period("6h") == "6mo"
+
+
+def test_resample_bars_anchors_at_session_open():
+    history = make_session()
+
+    bars = resample_bars(history, "6h")
+
+    assert bars.index.tolist() == [
+        pd.Timestamp("2024-01-10 09:30", tz=ET),
+        pd.Timestamp("2024-01-10 15:30", tz=ET),
+    ]
+    assert bars["Open"].tolist() == [1.0, 7.0]
+    assert bars["High"].tolist() == [6.5, 7.5]
+    assert bars["Close"].tolist() == [6.0, 7.0]
+    assert bars["Volume"].tolist() == [600.0, 100.0]
+
+
+def test_load_bars_fetches_provider_interval():
+    calls = []
+
+    def fetch(ticker, **kwargs):
+        calls.append(kwargs)
+        return make_session()
+
+    bars = load_bars(fetch, "AAPL", "6h", period="6mo")
+
+    assert calls == [{"interval": "1h", "period": "6mo"}]
+    assert len(bars) == 2
+
+
+def test_bar_end_times_capped_at_session_close():
+    index = pd.DatetimeIndex([pd.Timestamp("2024-01-10 15:30", tz=ET)])
+
+    (end,) = bar_end_times(index, "1h")
+
+    assert end == pd.Timestamp("2024-01-10 16:00", tz=ET).value
+
+
+def test_completed_bars_drops_forming_bar():
+    history = make_session(freq="15min", periods=4)
+    now = ET.localize(datetime(2024, 1, 10, 10, 20))
+
+    bars = completed_bars(history, "15m", now)
+
+    assert bars.index[-1] == pd.Timestamp("2024-01-10 10:00", tz=ET)
@@ -0,0 +1,105 @@
+"""Tests for the TTL memoization cache."""
+
+import threading
+import time
+
+import pandas as pd
+
+from stotify.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_until_ttl_expires():
+    """Values should be served from cache until their TTL passes."""
+    clock = FakeClock()
+    cache = TTLCache(clock=clock)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_fetch("k", fetch, 30) == 1
+    clock.now = 29
+    assert cache.get_or_fetch("k", fetch, 30) == 1
+    clock.now = 31
+    assert cache.get_or_fetch("k", fetch, 30) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_none_results_are_not_cached():
+    """Failed fetches should be retried on the next request."""
+    cache = TTLCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+
+    cache.get_or_fetch("k", fetch, 30)
+    cache.get_or_fetch("k", fetch, 30)
+    assert len(calls) == 2
+
+
+def test_lru_eviction_by_entry_count():
+    """The least recently used entry should be evicted first."""
+    cache = TTLCache(max_entries=2)
+    cache.get_or_fetch("a", lambda: 1, 30)
+    cache.get_or_fetch("b", lambda: 2, 30)
+    cache.get_or_fetch("a", lambda: 0, 30)
+    cache.get_or_fetch("c", lambda: 3, 30)
+
+    assert cache.get_or_fetch("a", lambda: -1, 30) == 1
+    assert cache.get_or_fetch("b", lambda: -1, 30) == -1
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_eviction_by_bytes():
+    """Entries should be evicted once the byte budget is exceeded."""
+    frame = pd.DataFrame({"Close": range(1000)}, dtype=float)
+    size = int(frame.memory_usage(index=True).sum())
+    cache = TTLCache(max_bytes=int(size * 1.5))
+
+    cache.get_or_fetch("a", lambda: frame, 30)
+    cache.get_or_fetch("b", lambda: frame.copy(), 30)
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= size * 1.5
+
+
+def test_concurrent_requests_share_one_fetch():
+    """Concurrent misses for the same key should wait on a single fetch."""
+    cache = TTLCache()
+    calls = []
+    started = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+
+    def worker():
+        results.append(cache.get_or_fetch("k", fetch, 30))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["value"] * 8
+    assert cache.stats()["coalesced"] == 7
@@ -0,0 +1,45 @@
+"""Tests for downsample module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stotify.downsample import downsample, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.zeros(1000)
+    y[417] = 50.0
+    y[733] = -40.0
+
+    rows = lttb_indices(np.arange(1000), y, 20)
+
+    assert len(rows) == 20
+    assert rows[0] == 0 and rows[-1] == 999
+    assert np.all(np.diff(rows) > 0)
+    assert {417, 733} <= set(rows.tolist())
+
+
+def test_lttb_returns_everything_when_short():
+    assert lttb_indices(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+    with pytest.raises(ValueError):
+        lttb_indices(np.arange(5), np.arange(5), 2)
+
+
+def test_downsample_keeps_marker_rows_for_every_column():
+    index = pd.date_range("2020-01-01", periods=5000, freq="h")
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 1, 5000))
+    frame = pd.DataFrame(
+        {"Close": close, "fast_ma": pd.Series(close).rolling(10).mean().to_numpy()},
+        index=index,
+    )
+    markers = [index[1234], index[4321], pd.Timestamp("1999-01-01")]
+
+    result = downsample(frame, 300, keep=markers)
+
+    assert 300 <= len(result) <= 302
+    assert index[1234] in result.index and index[4321] in result.index
+    assert result.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(result, frame.loc[result.index])
+    assert len(downsample(frame.iloc[:100], 300)) == 100
@@ -0,0 +1,34 @@
+"""End-to-end notifier load tests against the ntfy stub."""
+
+from stotify.loadtest import run_load_test
+
+
+def test_delivers_thousands_of_signals():
+    """Every firing signal should reach the server exactly once."""
+    result = run_load_test(signals=2000, groups=4)
+
+    assert result.sent == result.accepted == 2000
+    assert result.failed == 0
+    assert result.statuses == {200: 2000}
+    assert result.per_second > 50
+    assert 0 < result.p50 <= result.p99
+
+
+def test_reports_throttled_and_failed_sends():
+    """429s and 5xx responses should count as failures, not deliveries."""
+    throttled = run_load_test(signals=300, rate_limit=100, window=60)
+    erroring = run_load_test(signals=300, error_every=10)
+
+    assert throttled.sent == throttled.accepted == 100
+    assert throttled.failed == throttled.statuses[429] == 200
+    assert erroring.sent == erroring.accepted == 270
+    assert erroring.failed == erroring.statuses[503] == 30
+
+
+def test_latency_shows_in_notify_percentiles():
+    result = run_load_test(signals=100, latency=0.02)
+
+    assert result.sent == 100
+    assert result.p50 >= 0.02
+    # Sent one at a time, 20ms apiece could not exceed 50 per second.
+    assert result.per_second > 50
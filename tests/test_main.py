@@ -1,12 +1,18 @@
 """Tests for main module."""
 
 import json
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
 from unittest.mock import patch
 
+import pandas as pd
 import pytest
 
-from stotify.main import check_alerts, load_config, main
-
+from stotify.main import _timed, check_alerts, load_config, main
+from stotify.market_hours import ET
+from stotify.report import RunReport
+from stotify.stock import SNAPSHOT, Quote
 
 # --- Fixtures ---
 
@@ -32,9 +38,23 @@ def mock_send_alert():
         yield mock
 
 
+@contextmanager
 def mock_price(price):
-    """Helper to mock get_price with a specific value."""
-    return patch("stotify.strategies.get_price", return_value=price)
+    """Helper to mock single and bulk quotes with a price, fresh as of now."""
+
+    def quote(ticker):
+        if price is None:
+            return None
+        return Quote(ticker, price, datetime.now(ET), SNAPSHOT)
+
+    with (
+        patch("stotify.strategies.get_quote", side_effect=quote),
+        patch(
+            "stotify.strategies.get_quotes",
+            side_effect=lambda tickers: {ticker: quote(ticker) for ticker in tickers},
+        ),
+    ):
+        yield
 
 
 def write_config(tmp_path, data):
@@ -411,7 +431,75 @@ class TestLoadConfig:
                 }
             },
         )
-        with pytest.raises(ValueError, match="cannot define both 'ticker' and 'tickers'"):
+        with pytest.raises(
+            ValueError, match="cannot define both 'ticker' and 'tickers'"
+        ):
+            load_config(config_file)
+
+    def test_accepts_indicator_strategies(self, tmp_path):
+        """Indicator strategies with valid params should load."""
+        config_file = write_config(
+            tmp_path,
+            {
+                "groups": {
+                    "portfolio": [
+                        {
+                            "ticker": "AAPL",
+                            "strategy": "rsi",
+                            "timeframe": "1d",
+                            "params": {"window": 14, "overbought": 75},
+                        },
+                        {
+                            "ticker": "AAPL",
+                            "strategy": "pct_move",
+                            "timeframe": "15m",
+                            "params": {"percent": 2.5},
+                        },
+                    ]
+                }
+            },
+        )
+        config = load_config(config_file)
+        assert len(config["groups"]["portfolio"]) == 2
+
+    def test_rejects_missing_pct_move_percent(self, tmp_path):
+        """pct_move alerts need a percent param."""
+        config_file = write_config(
+            tmp_path,
+            {
+                "groups": {
+                    "portfolio": [
+                        {
+                            "ticker": "AAPL",
+                            "strategy": "pct_move",
+                            "timeframe": "15m",
+                            "params": {},
+                        }
+                    ]
+                }
+            },
+        )
+        with pytest.raises(ValueError, match="missing 'percent' in params"):
+            load_config(config_file)
+
+    def test_rejects_out_of_range_rsi_bound(self, tmp_path):
+        """RSI bounds above 100 should error."""
+        config_file = write_config(
+            tmp_path,
+            {
+                "groups": {
+                    "portfolio": [
+                        {
+                            "ticker": "AAPL",
+                            "strategy": "rsi",
+                            "timeframe": "1d",
+                            "params": {"overbought": 120},
+                        }
+                    ]
+                }
+            },
+        )
+        with pytest.raises(ValueError, match="invalid 'overbought' value"):
             load_config(config_file)
 
 
@@ -652,7 +740,9 @@ class TestCheckAlerts:
         assert calls[0][0] == ("AAPL", 500.0, "high", 250, "portfolio")
         assert calls[1][0] == ("MSFT", 500.0, "high", 400, "portfolio")
 
-    def test_timeframe_filter_skips_non_matching(self, mock_market_open, mock_send_alert):
+    def test_timeframe_filter_skips_non_matching(
+        self, mock_market_open, mock_send_alert
+    ):
         """Alerts with different timeframe should be skipped when filtered."""
         config = {
             "groups": {
@@ -673,6 +763,34 @@ class TestCheckAlerts:
         assert sent == 0
         mock_send_alert.assert_not_called()
 
+    def test_cadence_skips_timeframes_not_due(self, mock_send_alert):
+        """With a cadence, only timeframes due at `now` should be evaluated."""
+        config = {
+            "groups": {
+                "portfolio": [
+                    {
+                        "ticker": "AAPL",
+                        "strategy": "threshold",
+                        "timeframe": "15m",
+                        "params": {"high": 250},
+                    },
+                    {
+                        "ticker": "MSFT",
+                        "strategy": "threshold",
+                        "timeframe": "1h",
+                        "params": {"high": 250},
+                    },
+                ]
+            }
+        }
+        now = pd.Timestamp("2024-01-10 11:30", tz="America/New_York").to_pydatetime()
+
+        with mock_price(260.0):
+            sent = check_alerts(config, now=now, cadence="15m")
+
+        assert sent == 1
+        assert mock_send_alert.call_args[0][0] == "AAPL"
+
     def test_threshold_with_multiple_tickers(self, mock_market_open, mock_send_alert):
         """Threshold strategy should evaluate multiple tickers."""
         config = {
@@ -727,6 +845,288 @@ class TestCheckAlerts:
         assert calls[0][0] == ("AAPL", 260.0, "high", 250, "portfolio")
         assert calls[1][0] == ("AAPL", 260.0, "high", 250, "tech-watch")
 
+    def test_threshold_quotes_are_fetched_in_one_bulk_request(
+        self, mock_market_open, mock_send_alert
+    ):
+        """Quotes of every evaluated threshold alert should come from one request."""
+        alert = {"strategy": "threshold", "timeframe": "15m"}
+        config = {
+            "groups": {
+                "portfolio": [
+                    {**alert, "tickers": ["AAPL", "MSFT"], "params": {"high": 250}},
+                    {
+                        **alert,
+                        "ticker": "TSLA",
+                        "timeframe": "1h",
+                        "params": {"low": 9},
+                    },
+                ],
+                "tech-watch": [{**alert, "ticker": "NVDA", "params": {"high": 250}}],
+            }
+        }
+
+        def quotes(tickers):
+            return {t: Quote(t, 260.0, datetime.now(ET), SNAPSHOT) for t in tickers}
+
+        with (
+            patch("stotify.strategies.get_quotes", side_effect=quotes) as bulk,
+            patch("stotify.strategies.get_quote") as single,
+        ):
+            sent = check_alerts(config, timeframe_filter="15m")
+
+        assert sent == 3
+        bulk.assert_called_once_with(["AAPL", "MSFT", "NVDA"])
+        single.assert_not_called()
+
+    def test_ma_cross_alerts_share_one_history_fetch(
+        self, mock_market_open, mock_send_alert
+    ):
+        """Several MA configs on one ticker should fetch its history once."""
+        history = pd.DataFrame({"Close": [float(v) for v in range(1, 61)]})
+        config = {
+            "groups": {
+                "portfolio": [
+                    {
+                        "ticker": "AAPL",
+                        "strategy": "ma_cross",
+                        "timeframe": "1d",
+                        "params": {"fast_window": 5, "slow_window": 20},
+                    }
+                ],
+                "tech-watch": [
+                    {
+                        "ticker": "AAPL",
+                        "strategy": "ma_cross",
+                        "timeframe": "1d",
+                        "params": {"fast_window": 10, "slow_window": 50},
+                    }
+                ],
+            }
+        }
+
+        with patch(
+            "stotify.strategies.get_history", return_value=history
+        ) as mock_history:
+            sent = check_alerts(config)
+
+        assert sent == 2
+        mock_history.assert_called_once()
+
+    def test_intraday_alert_in_two_groups_notifies_both(
+        self, mock_market_open, mock_send_alert, tmp_path, monkeypatch
+    ):
+        """The same intraday alert in two groups should fire in each group."""
+        monkeypatch.setenv("STOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+        index = pd.date_range("2024-01-10 14:30", periods=4, freq="15min", tz="UTC")
+        history = pd.DataFrame({"Close": [1.0, 2.0, 3.0, 4.0]}, index=index)
+        alert = {
+            "ticker": "AAPL",
+            "strategy": "ma_cross",
+            "timeframe": "15m",
+            "params": {"fast_window": 2, "slow_window": 3},
+        }
+        config = {"groups": {"a": [dict(alert)], "b": [dict(alert)]}}
+
+        with patch("stotify.strategies.get_history", return_value=history):
+            sent = check_alerts(config)
+
+        assert sent == 2
+        groups = [call[0][4] for call in mock_send_alert.call_args_list]
+        assert groups == ["a", "b"]
+
+    def test_matrix_mode_fetches_all_tickers_in_one_request(
+        self, mock_market_open, mock_send_alert
+    ):
+        """Matrix mode should bulk-fetch every daily ma_cross ticker once."""
+        index = pd.date_range("2024-01-01", periods=60, freq="D")
+        closes = [float(v) for v in range(1, 61)]
+        rising = pd.DataFrame({"Close": closes}, index=index)
+        falling = pd.DataFrame({"Close": closes[::-1]}, index=index)
+        histories = {"AAPL": rising, "MSFT": falling, "NVDA": rising}
+        config = {
+            "groups": {
+                "portfolio": [
+                    {
+                        "tickers": ["AAPL", "MSFT"],
+                        "strategy": "ma_cross",
+                        "timeframe": "1d",
+                        "params": {"fast_window": 5, "slow_window": 20},
+                    }
+                ],
+                "tech-watch": [
+                    {
+                        "tickers": ["MSFT", "NVDA"],
+                        "strategy": "ma_cross",
+                        "timeframe": "1d",
+                        "params": {"fast_window": 10, "slow_window": 50},
+                    }
+                ],
+            }
+        }
+
+        with (
+            patch(
+                "stotify.price_matrix.get_histories",
+                side_effect=lambda tickers, **_: {t: histories[t] for t in tickers},
+            ) as mock_histories,
+            patch("stotify.strategies.get_history") as mock_history,
+        ):
+            sent = check_alerts(config, matrix=True)
+
+        assert sent == 2
+        mock_histories.assert_called_once()
+        assert mock_histories.call_args[0][0] == ["AAPL", "MSFT", "NVDA"]
+        mock_history.assert_not_called()
+        tickers = [call[0][0] for call in mock_send_alert.call_args_list]
+        assert tickers == ["AAPL", "NVDA"]
+
+    def test_matrix_mode_after_single_ticker_fetch_of_same_ticker(
+        self, mock_market_open, mock_send_alert
+    ):
+        """A ticker fetched alone and in bulk should align in the matrix."""
+        index = pd.date_range("2024-01-01", periods=60, freq="D")
+        closes = [float(v) for v in range(1, 61)]
+        single = pd.DataFrame({"Close": closes}, index=index.tz_localize(ET))
+        columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Close"]])
+        bulk = pd.DataFrame(
+            [[close, close] for close in closes], index=index, columns=columns
+        )
+        config = {
+            "groups": {
+                "portfolio": [
+                    {
+                        "ticker": "AAPL",
+                        "strategy": "rsi",
+                        "timeframe": "1d",
+                        "params": {"window": 14},
+                    },
+                    {
+                        "tickers": ["AAPL", "MSFT"],
+                        "strategy": "ma_cross",
+                        "timeframe": "1d",
+                        "params": {"fast_window": 5, "slow_window": 20},
+                    },
+                ]
+            }
+        }
+
+        with (
+            patch("stotify.stock.yf.Ticker") as ticker_cls,
+            patch("stotify.stock.yf.download", return_value=bulk),
+        ):
+            ticker_cls.return_value.history.return_value = single
+            check_alerts(config, matrix=True)
+
+        ticker_cls.assert_called_once_with("AAPL")
+        signals = [(call[0][0], call[0][2]) for call in mock_send_alert.call_args_list]
+        assert ("AAPL", "ma_cross") in signals
+        assert ("MSFT", "ma_cross") in signals
+
+    def test_reports_data_unavailable_on_fetch_failure(
+        self, mock_market_open, mock_send_alert, capsys
+    ):
+        """Provider failures should be reported distinctly from no signal."""
+        config = {
+            "groups": {
+                "portfolio": [
+                    {
+                        "ticker": "AAPL",
+                        "strategy": "threshold",
+                        "timeframe": "15m",
+                        "params": {"high": 250},
+                    }
+                ]
+            }
+        }
+
+        with patch("stotify.stock.yf.download", side_effect=Exception("API error")):
+            sent = check_alerts(config)
+
+        assert sent == 0
+        output = capsys.readouterr().out
+        assert "reason=data unavailable" in output
+        assert "API error" in output
+
+    def test_report_records_each_alert_outcome(self, mock_market_open):
+        """Every alert should get one outcome with timing and freshness."""
+        alert = {"strategy": "threshold", "timeframe": "15m"}
+        config = {
+            "groups": {
+                "portfolio": [
+                    {**alert, "ticker": "AAPL", "params": {"high": 250}},
+                    {**alert, "ticker": "MSFT", "params": {"high": 250}},
+                    {**alert, "ticker": "NVDA", "params": {"low": 100}},
+                    {
+                        **alert,
+                        "ticker": "TSLA",
+                        "timeframe": "1d",
+                        "params": {"high": 1},
+                    },
+                ]
+            }
+        }
+        report = RunReport()
+
+        with (
+            mock_price(260.0),
+            patch("stotify.main.send_alert", side_effect=[True, False]),
+        ):
+            sent = check_alerts(config, timeframe_filter="15m", report=report)
+
+        assert sent == 1
+        assert [(o.tickers, o.outcome) for o in report.outcomes] == [
+            (("AAPL",), "fired"),
+            (("MSFT",), "notify_failed"),
+            (("NVDA",), "not_met"),
+            (("TSLA",), "skipped_timeframe"),
+        ]
+        assert report.outcomes[0].data_as_of is not None
+        assert report.outcomes[0].staleness < 60
+        assert report.outcomes[3].seconds == 0.0
+        assert report.counts()["fired"] == 1
+
+    def test_report_records_freshness_of_daily_ma_cross(self, mock_market_open):
+        """Daily ma_cross outcomes should carry the time of their last bar."""
+        index = pd.date_range("2024-03-01", periods=30, freq="D", tz=ET)
+        history = pd.DataFrame({"Close": [float(v) for v in range(30)]}, index=index)
+        config = {
+            "groups": {
+                "portfolio": [
+                    {
+                        "ticker": "AAPL",
+                        "strategy": "ma_cross",
+                        "timeframe": "1d",
+                        "params": {"fast_window": 5, "slow_window": 20},
+                    }
+                ]
+            }
+        }
+        report = RunReport()
+        now = index[-1] + pd.Timedelta(hours=12)
+
+        with (
+            patch("stotify.strategies.get_history", return_value=history),
+            patch("stotify.main.send_alert", return_value=True),
+        ):
+            check_alerts(config, now=now, report=report)
+
+        (outcome,) = report.outcomes
+        assert outcome.outcome == "fired"
+        assert outcome.data_as_of == index[-1].isoformat()
+        assert outcome.staleness == 12 * 3600
+
+    def test_failed_send_future_resolves_with_its_error(self):
+        """A send that fails should fail its timed future and still be timed."""
+        report = RunReport()
+        sent = Future()
+        timed = _timed(sent, report, started=0.0)
+
+        error = RuntimeError("backend crashed")
+        sent.set_exception(error)
+
+        assert timed.exception(timeout=1) is error
+        assert len(report.notify_seconds) == 1
+
 
 # --- CLI Entry Point ---
 
@@ -764,6 +1164,33 @@ class TestMain:
         """Main should return 1 when config file doesn't exist."""
         assert main("/nonexistent/path.json") == 1
 
+    def test_plan_returns_exit_code_without_running(self, tmp_path, capsys):
+        """--plan should print due timeframes and signal when nothing is due."""
+        config_file = write_config(
+            tmp_path,
+            {
+                "groups": {
+                    "portfolio": [
+                        {
+                            "ticker": "AAPL",
+                            "strategy": "threshold",
+                            "timeframe": "15m",
+                            "params": {"high": 250},
+                        }
+                    ]
+                }
+            },
+        )
+
+        with (
+            patch("stotify.schedule.is_market_open", return_value=False),
+            patch("stotify.main.check_alerts") as mock_check,
+        ):
+            assert main(str(config_file), plan=True) == 3
+
+        mock_check.assert_not_called()
+        assert json.loads(capsys.readouterr().out)["skipped"] == ["15m"]
+
     def test_returns_1_on_invalid_timeframe_filter(self, tmp_path):
         """Main should return 1 when timeframe filter is invalid."""
         config_file = write_config(
@@ -783,3 +1210,98 @@ class TestMain:
         )
 
         assert main(str(config_file), timeframe_filter="15minutes") == 1
+
+    def test_shards_evaluate_disjoint_tickers_and_write_reports(self, tmp_path):
+        """Each shard should run only its tickers and report what it ran."""
+        tickers = [f"T{index}" for index in range(40)]
+        config_file = write_config(
+            tmp_path,
+            {
+                "groups": {
+                    "portfolio": [
+                        {
+                            "tickers": tickers,
+                            "strategy": "threshold",
+                            "timeframe": "1d",
+                            "params": {"high": 250},
+                        }
+                    ]
+                }
+            },
+        )
+
+        seen = []
+        for index in (1, 2, 3):
+            report = tmp_path / f"shard-{index}.json"
+            with patch("stotify.main.check_alerts", return_value=0) as mock_check:
+                assert (
+                    main(str(config_file), shard=f"{index}/3", report_path=str(report))
+                    == 0
+                )
+            config = mock_check.call_args.args[0]
+            shard_tickers = config["groups"]["portfolio"][0]["tickers"]
+            assert json.loads(report.read_text())["shard"] == f"{index}/3"
+            seen.extend(shard_tickers)
+
+        assert sorted(seen) == sorted(tickers)
+        assert main(str(config_file), shard="4/3") == 1
+
+    def test_profile_writes_pstats_with_strategy_sections(self, tmp_path):
+        """--profile should profile the checks and time each strategy."""
+        config_file = write_config(
+            tmp_path,
+            {
+                "groups": {
+                    "portfolio": [
+                        {
+                            "ticker": "AAPL",
+                            "strategy": "threshold",
+                            "timeframe": "1d",
+                            "params": {"high": 250},
+                        }
+                    ]
+                }
+            },
+        )
+
+        with mock_price(200.0):
+            assert (
+                main(
+                    str(config_file),
+                    skip_market_check=True,
+                    profile_path=str(tmp_path / "profiles" / "run"),
+                )
+                == 0
+            )
+
+        assert (tmp_path / "profiles" / "run.pstats").exists()
+        sections = json.loads((tmp_path / "profiles" / "run.sections.json").read_text())
+        assert sections["strategy:threshold"]["calls"] == 1
+
+    def test_routes_alerts_to_configured_notifiers(self, tmp_path, capsys):
+        """Groups should be delivered through the notifiers they are routed to."""
+        log = tmp_path / "alerts.jsonl"
+        config = {
+            "groups": {
+                "portfolio": [
+                    {
+                        "ticker": "AAPL",
+                        "strategy": "threshold",
+                        "timeframe": "1d",
+                        "params": {"high": 250},
+                    }
+                ]
+            },
+            "notifiers": {
+                "log": {"type": "file", "path": str(log)},
+                "stdout": {"type": "file"},
+            },
+            "routes": {"portfolio": ["log", "stdout"]},
+        }
+
+        with mock_price(260.0):
+            assert check_alerts(config, skip_market_check=True) == 1
+
+        (delivered,) = [json.loads(line) for line in log.read_text().splitlines()]
+        assert delivered["message"] == "[portfolio] AAPL is $260.00 (above $250.00)"
+        assert '"ticker": "AAPL"' in capsys.readouterr().out
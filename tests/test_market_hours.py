@@ -4,7 +4,7 @@ from datetime import datetime
 
 import pytz
 
-from stotify.market_hours import is_market_open, ET
+from stotify.market_hours import ET, is_market_open, next_bar_close
 
 
 def test_market_open_midday_weekday():
@@ -55,3 +55,21 @@ def test_other_timezone_converted():
     # 17:00 UTC = 12:00 ET (winter)
     dt = utc.localize(datetime(2024, 1, 10, 17, 0))
     assert is_market_open(dt) is True
+
+
+def test_next_bar_close_intraday_aligned_to_open():
+    """15m bars should close on the quarter hour counted from 9:30 ET."""
+    dt = ET.localize(datetime(2024, 1, 10, 9, 31))
+    assert next_bar_close("15m", dt) == ET.localize(datetime(2024, 1, 10, 9, 45))
+
+
+def test_next_bar_close_last_hour_bar_capped_at_close():
+    """The last hourly bar of the session should close at 16:00 ET."""
+    dt = ET.localize(datetime(2024, 1, 10, 15, 45))
+    assert next_bar_close("1h", dt) == ET.localize(datetime(2024, 1, 10, 16, 0))
+
+
+def test_next_bar_close_daily_after_friday_close():
+    """A daily bar requested after Friday's close should close on Monday."""
+    dt = ET.localize(datetime(2024, 1, 12, 17, 0))  # Friday
+    assert next_bar_close("1d", dt) == ET.localize(datetime(2024, 1, 15, 16, 0))
@@ -1,9 +1,22 @@
 """Tests for notifier module."""
 
+import json
+import time
 from unittest.mock import Mock, patch
 
-
-from stotify.notifier import get_channel, send_alert
+from stotify.notifier import (
+    Backend,
+    Dispatcher,
+    EmailBackend,
+    FileBackend,
+    Notification,
+    NtfyBackend,
+    SlackBackend,
+    WebhookBackend,
+    create_backend,
+    get_channel,
+    send_alert,
+)
 
 
 class TestGetChannel:
@@ -42,7 +55,7 @@ class TestSendAlert:
         mock_response.raise_for_status = Mock()
 
         with patch(
-            "stotify.notifier.requests.post", return_value=mock_response
+            "stotify.notifier.requests.Session.post", return_value=mock_response
         ) as mock_post:
             result = send_alert("AAPL", 255.50, "high", 250, "portfolio")
 
@@ -60,7 +73,7 @@ class TestSendAlert:
         mock_response.raise_for_status = Mock()
 
         with patch(
-            "stotify.notifier.requests.post", return_value=mock_response
+            "stotify.notifier.requests.Session.post", return_value=mock_response
         ) as mock_post:
             send_alert("AAPL", 175.00, "low", 180, "portfolio")
 
@@ -76,7 +89,7 @@ class TestSendAlert:
         mock_response.raise_for_status = Mock()
 
         with patch(
-            "stotify.notifier.requests.post", return_value=mock_response
+            "stotify.notifier.requests.Session.post", return_value=mock_response
         ) as mock_post:
             send_alert("GOOGL", 340.25, "high", 340, "tech-watch")
 
@@ -92,7 +105,7 @@ class TestSendAlert:
         mock_response.raise_for_status = Mock()
 
         with patch(
-            "stotify.notifier.requests.post", return_value=mock_response
+            "stotify.notifier.requests.Session.post", return_value=mock_response
         ) as mock_post:
             send_alert("AAPL", 255.50, "high", 250, "portfolio")
             url1 = mock_post.call_args[0][0]
@@ -108,11 +121,14 @@ class TestSendAlert:
 
     def test_send_alert_failure(self):
         """Should return False and log on error."""
-        with patch(
-            "stotify.notifier.requests.post", side_effect=Exception("Network error")
+        with (
+            patch(
+                "stotify.notifier.requests.Session.post",
+                side_effect=Exception("Network error"),
+            ),
+            patch("stotify.notifier.logger.error") as mock_log,
         ):
-            with patch("stotify.notifier.logger.error") as mock_log:
-                result = send_alert("AAPL", 255.50, "high", 250, "portfolio")
+            result = send_alert("AAPL", 255.50, "high", 250, "portfolio")
 
         assert result is False
         mock_log.assert_called_once()
@@ -123,7 +139,7 @@ class TestSendAlert:
         mock_response.raise_for_status = Mock()
 
         with patch(
-            "stotify.notifier.requests.post", return_value=mock_response
+            "stotify.notifier.requests.Session.post", return_value=mock_response
         ) as mock_post:
             result = send_alert(
                 "AAPL",
@@ -137,3 +153,148 @@ class TestSendAlert:
         assert result is True
         call_args = mock_post.call_args
         assert "[portfolio] AAPL 50d MA above 200d MA" in call_args[1]["data"]
+
+
+class SlowBackend(Backend):
+    pool_size = 2
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+
+    def send(self, notification):
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("unreachable")
+        self.sent.append(notification)
+
+
+class TestBackends:
+    def test_ntfy_self_hosted_with_token(self):
+        """ntfy should post to a self-hosted server with a bearer token."""
+        backend = NtfyBackend(
+            base_url="https://ntfy.example.com/", prefix="p", token="t"
+        )
+        with patch("stotify.notifier.requests.Session.post") as mock_post:
+            backend.send(Notification("portfolio", "AAPL", "[portfolio] hi"))
+
+        assert mock_post.call_args[0][0] == "https://ntfy.example.com/p-portfolio"
+        assert mock_post.call_args[1]["data"] == "[portfolio] hi"
+        assert backend.session.headers["Authorization"] == "Bearer t"
+
+    def test_webhook_and_slack_payloads(self):
+        """Webhooks get the notification as JSON; Slack gets a text field."""
+        notification = Notification("portfolio", "AAPL", "[portfolio] hi", 1.5)
+        with patch("stotify.notifier.requests.Session.post") as mock_post:
+            WebhookBackend("https://hooks.example.com/a").send(notification)
+            SlackBackend("https://hooks.slack.com/b").send(notification)
+
+        webhook, slack = mock_post.call_args_list
+        assert webhook[1]["json"] == {
+            "group_name": "portfolio",
+            "ticker": "AAPL",
+            "message": "[portfolio] hi",
+            "price": 1.5,
+        }
+        assert slack[0][0] == "https://hooks.slack.com/b"
+        assert slack[1]["json"] == {"text": "[portfolio] hi"}
+
+    def test_email_reuses_smtp_connection(self):
+        """Email should log in once and send every message on one connection."""
+        backend = EmailBackend(
+            "smtp.example.com",
+            "alerts@example.com",
+            ["me@example.com"],
+            username="user",
+            password="secret",
+        )
+        with patch("stotify.notifier.smtplib.SMTP") as mock_smtp:
+            backend.send(Notification("portfolio", "AAPL", "first"))
+            backend.send(Notification("portfolio", "MSFT", "second"))
+            backend.close()
+
+        mock_smtp.assert_called_once_with("smtp.example.com", 587, timeout=10.0)
+        smtp = mock_smtp.return_value
+        smtp.login.assert_called_once_with("user", "secret")
+        subjects = [
+            call.args[0]["Subject"] for call in smtp.send_message.call_args_list
+        ]
+        assert subjects == ["[portfolio] AAPL alert", "[portfolio] MSFT alert"]
+        smtp.quit.assert_called_once()
+
+    def test_file_backend_writes_json_lines(self, tmp_path):
+        path = tmp_path / "alerts.jsonl"
+        backend = FileBackend(str(path))
+        backend.send(Notification("portfolio", "AAPL", "one"))
+        backend.send(Notification("portfolio", "MSFT", "two"))
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["ticker"] for line in lines] == ["AAPL", "MSFT"]
+
+    def test_create_backend_expands_environment(self, monkeypatch):
+        monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.slack.com/secret")
+        backend = create_backend({"type": "slack", "url": "${SLACK_WEBHOOK_URL}"})
+
+        assert isinstance(backend, SlackBackend)
+        assert backend.url == "https://hooks.slack.com/secret"
+
+
+class TestDispatcher:
+    def test_fans_out_concurrently(self):
+        """Delivery should take as long as the slowest backend, not the sum."""
+        backends = {name: SlowBackend(delay=0.2) for name in ("a", "b", "c")}
+        with Dispatcher(backends) as dispatcher:
+            started = time.perf_counter()
+            assert dispatcher.send_alert("AAPL", 1.0, None, None, "g", message="hi")
+            elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.4
+        assert all(len(backend.sent) == 1 for backend in backends.values())
+        assert backends["a"].sent[0].message == "[g] hi"
+
+    def test_routes_groups_to_backends(self):
+        backends = {name: SlowBackend() for name in ("phone", "team", "log")}
+        routes = {"portfolio": ["phone", "team"], "*": ["log"]}
+        with Dispatcher(backends, routes) as dispatcher:
+            dispatcher.send_alert("AAPL", 1.0, "high", 0.5, "portfolio")
+            dispatcher.send_alert("MSFT", 1.0, "high", 0.5, "watch")
+
+        assert [n.ticker for n in backends["phone"].sent] == ["AAPL"]
+        assert [n.ticker for n in backends["team"].sent] == ["AAPL"]
+        assert [n.ticker for n in backends["log"].sent] == ["MSFT"]
+
+    def test_reports_failure_when_any_backend_fails(self):
+        backends = {"ok": SlowBackend(), "down": SlowBackend(fail=True)}
+        with (
+            Dispatcher(backends) as dispatcher,
+            patch("stotify.notifier.logger.error") as mock_log,
+        ):
+            notification = Notification("g", "AAPL", "hi")
+            assert dispatcher.deliver(notification) == {"ok": True, "down": False}
+            assert not dispatcher.send_alert("AAPL", 1.0, None, None, "g", "hi")
+
+        assert "down" in mock_log.call_args[0][0]
+        assert len(backends["ok"].sent) == 2
+
+    def test_submitted_alerts_share_the_backend_pool(self):
+        """Queued alerts should be delivered pool_size at a time."""
+        backends = {"a": SlowBackend(delay=0.2), "down": SlowBackend(fail=True)}
+        routes = {"g": ["a"], "*": ["a", "down"]}
+        with (
+            Dispatcher(backends, routes) as dispatcher,
+            patch("stotify.notifier.logger.error"),
+        ):
+            started = time.perf_counter()
+            futures = [
+                dispatcher.submit_alert(ticker, 1.0, None, None, "g", message="hi")
+                for ticker in ("AAPL", "MSFT", "NVDA", "TSLA")
+            ]
+            results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+            failed = dispatcher.submit_alert("AAPL", 1.0, None, None, "other", "hi")
+            assert failed.result() is False
+
+        assert results == [True] * 4
+        assert 0.4 <= elapsed < 0.6
+        assert len(backends["a"].sent) == 5
@@ -0,0 +1,37 @@
+"""Tests for ntfy_stub module."""
+
+import json
+
+import requests
+
+from stotify.notifier import Notification, NtfyBackend
+from stotify.ntfy_stub import NtfyStub
+
+
+def test_records_published_messages_per_topic():
+    with NtfyStub() as stub:
+        backend = NtfyBackend(base_url=stub.url, prefix="stotify")
+        backend.send(Notification("portfolio", "AAPL", "[portfolio] first"))
+        backend.send(Notification("watch", "MSFT", "[watch] second"))
+        response = requests.get(f"{stub.url}/stotify-portfolio/json?poll=1", timeout=5)
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["message"] for event in events] == ["[portfolio] first"]
+    assert events[0]["event"] == "message"
+    assert [message.topic for message in stub.messages] == [
+        "stotify-portfolio",
+        "stotify-watch",
+    ]
+
+
+def test_injects_errors_and_throttles():
+    with NtfyStub(rate_limit=2, window=60, error_every=3) as stub:
+        responses = [
+            requests.post(f"{stub.url}/topic", data=str(index), timeout=5)
+            for index in range(5)
+        ]
+
+    assert [response.status_code for response in responses] == [200, 200, 503, 429, 429]
+    assert int(responses[3].headers["Retry-After"]) > 1
+    assert [message.message for message in stub.messages] == ["0", "1"]
+    assert stub.statuses == {200: 2, 503: 1, 429: 2}
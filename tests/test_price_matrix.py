@@ -0,0 +1,111 @@
+"""Tests for price_matrix module."""
+
+import numpy as np
+import pandas as pd
+
+from stotify.market_hours import ET
+from stotify.price_matrix import (
+    PriceMatrices,
+    build_price_matrix,
+    last_valid,
+    right_align,
+)
+
+
+def history(closes, start="2024-01-01"):
+    index = pd.date_range(start, periods=len(closes), freq="D")
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+def test_build_aligns_tickers_on_union_of_bar_times():
+    histories = {
+        "AAA": history([1.0, 2.0, 3.0]),
+        "BBB": history([10.0, 11.0], start="2024-01-02"),
+        "NOPE": None,
+    }
+    calls = []
+
+    def fetch(tickers, **kwargs):
+        calls.append((tickers, kwargs))
+        return {ticker: histories[ticker] for ticker in tickers}
+
+    matrix = build_price_matrix(
+        ["AAA", "BBB", "NOPE", "AAA"], period="1y", interval="1d", fetch=fetch
+    )
+
+    assert calls == [(["AAA", "BBB", "NOPE"], {"period": "1y", "interval": "1d"})]
+    assert matrix.tickers == ("AAA", "BBB", "NOPE")
+    assert list(matrix.index) == list(histories["AAA"].index.tz_localize(ET))
+    np.testing.assert_array_equal(
+        matrix.closes,
+        [[1.0, np.nan, np.nan], [2.0, 10.0, np.nan], [3.0, 11.0, np.nan]],
+    )
+
+
+def test_build_aligns_histories_with_different_index_tz():
+    """Naive and tz-aware histories of the same bars should share rows."""
+    aware = history([1.0, 2.0, 3.0])
+    aware.index = aware.index.tz_localize(ET)
+    utc = history([4.0, 5.0, 6.0])
+    utc.index = utc.index.tz_localize(ET).tz_convert("UTC")
+    histories = {"AAA": aware, "BBB": history([7.0, 8.0, 9.0]), "CCC": utc}
+
+    matrix = build_price_matrix(
+        list(histories), period="1y", interval="1d", fetch=lambda *_a, **_k: histories
+    )
+
+    assert str(matrix.index.tz) == str(ET)
+    np.testing.assert_array_equal(
+        matrix.closes, [[1.0, 7.0, 4.0], [2.0, 8.0, 5.0], [3.0, 9.0, 6.0]]
+    )
+
+
+def test_columns_are_views_when_adjacent():
+    matrix = build_price_matrix(
+        ["A", "B", "C"],
+        period="1y",
+        interval="1d",
+        fetch=lambda tickers, **_: {ticker: history([1.0, 2.0]) for ticker in tickers},
+    )
+
+    assert np.shares_memory(matrix.columns(["B", "C"]), matrix.closes)
+    assert not np.shares_memory(matrix.columns(["C", "A"]), matrix.closes)
+    assert matrix.columns(["C", "A"]).shape == (2, 2)
+
+
+def test_right_align_and_last_valid_skip_missing_bars():
+    closes = np.array(
+        [
+            [1.0, np.nan, np.nan],
+            [np.nan, 5.0, np.nan],
+            [3.0, 6.0, np.nan],
+            [4.0, np.nan, np.nan],
+        ]
+    )
+
+    aligned, counts = right_align(closes)
+    rows, valid = last_valid(closes)
+
+    np.testing.assert_array_equal(counts, [3, 2, 0])
+    np.testing.assert_array_equal(aligned[-2:, :2], [[3.0, 5.0], [4.0, 6.0]])
+    np.testing.assert_array_equal(aligned[-3:, 0], [1.0, 3.0, 4.0])
+    np.testing.assert_array_equal(rows, [3, 2, -1])
+    np.testing.assert_array_equal(valid, counts)
+
+
+def test_price_matrices_build_once_per_bar_request():
+    calls = []
+
+    def fetch(tickers, **kwargs):
+        calls.append(kwargs)
+        return {ticker: history([1.0]) for ticker in tickers}
+
+    matrices = PriceMatrices(["A", "B"], fetch=fetch)
+    first = matrices.get("1y", "1d")
+
+    assert matrices.get("1y", "1d") is first
+    matrices.get("5y", "1wk")
+    assert calls == [
+        {"period": "1y", "interval": "1d"},
+        {"period": "5y", "interval": "1wk"},
+    ]
@@ -0,0 +1,74 @@
+"""Tests for profiling module."""
+
+import json
+import pstats
+import time
+
+import pytest
+
+from stotify import profiling
+from stotify.profiling import profiled, section
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_cprofile_writes_pstats_and_section_timings(tmp_path):
+    with profiled(tmp_path / "run") as profile:
+        with section("work"):
+            _busy(0.01)
+        with section("work"):
+            pass
+
+    assert profile.files == [tmp_path / "run.pstats", tmp_path / "run.sections.json"]
+    stats = pstats.Stats(str(tmp_path / "run.pstats"))
+    assert any(name == "_busy" for _, _, name in stats.stats)
+    sections = json.loads((tmp_path / "run.sections.json").read_text())
+    assert sections["work"]["calls"] == 2
+    assert sections["work"]["seconds"] >= 0.01
+
+
+def test_sampler_writes_collapsed_stacks_with_section_frames(tmp_path):
+    with (
+        profiled(tmp_path / "run", mode="sample", interval=0.001) as profile,
+        section("fit"),
+    ):
+        _busy(0.1)
+
+    assert profile.files[0] == tmp_path / "run.collapsed"
+    lines = (tmp_path / "run.collapsed").read_text().splitlines()
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    busy = [
+        stack
+        for stack in stacks
+        if stack.endswith(";[fit];_busy (test_profiling.py:13)")
+    ]
+    assert busy
+    assert "test_sampler_writes_collapsed_stacks_with_section_frames" in busy[0]
+    assert sum(stacks[stack] for stack in busy) > 10
+
+
+def test_sections_and_nested_profiles_are_noops(tmp_path):
+    with section("idle"):
+        pass
+    assert profiling._timings is None
+
+    with (
+        profiled(tmp_path / "outer") as outer,
+        profiled(tmp_path / "inner") as inner,
+        section("inner"),
+    ):
+        pass
+
+    assert inner.files == []
+    assert "inner" in outer.sections
+    assert not (tmp_path / "inner.pstats").exists()
+    assert profiling._timings is None
+
+
+def test_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError), profiled(tmp_path / "run", mode="perf"):
+        pass
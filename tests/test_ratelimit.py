@@ -0,0 +1,157 @@
+"""Tests for rate limiting, circuit breaking and retries."""
+
+import pytest
+
+from stotify.ratelimit import (
+    AdaptiveTokenBucket,
+    CircuitBreaker,
+    CircuitOpenError,
+    ProviderError,
+    RateLimitedError,
+    call_with_retry,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_limiter(clock):
+    return AdaptiveTokenBucket(
+        rate=2.0, capacity=2.0, min_rate=0.5, clock=clock, sleep=clock.sleep
+    )
+
+
+def test_token_bucket_waits_when_empty():
+    """Requests beyond the burst capacity should wait for refills."""
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_token_bucket_backs_off_on_rate_limit_and_recovers():
+    """A 429 should halve the rate; successes should grow it back."""
+    limiter = make_limiter(FakeClock())
+
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    limiter.on_rate_limited()
+    assert limiter.rate == 0.5
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 2.0
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    """The circuit should open after repeated failures and allow one trial later."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def run(fn, clock, breaker=None, retryable=True):
+    return call_with_retry(
+        fn,
+        limiter=make_limiter(clock),
+        breaker=breaker or CircuitBreaker(clock=clock),
+        is_rate_limited=lambda exc: "429" in str(exc),
+        is_retryable=lambda exc: retryable and isinstance(exc, OSError),
+        retries=2,
+        backoff=1.0,
+        sleep=clock.sleep,
+    )
+
+
+def test_retries_transient_errors_with_backoff():
+    """Network errors should be retried until the call succeeds."""
+    clock = FakeClock()
+    attempts = []
+
+    def fetch():
+        attempts.append(clock.now)
+        if len(attempts) < 3:
+            raise ConnectionError("reset")
+        return "ok"
+
+    assert run(fetch, clock) == "ok"
+    assert len(attempts) == 3
+    assert attempts[2] - attempts[1] > attempts[1] - attempts[0] - 1e-9
+
+
+def test_non_retryable_error_raises_provider_error_immediately():
+    """Unexpected errors should surface as ProviderError without retrying."""
+    clock = FakeClock()
+    attempts = []
+
+    def fetch():
+        attempts.append(1)
+        raise ValueError("bad payload")
+
+    with pytest.raises(ProviderError, match="bad payload"):
+        run(fetch, clock)
+    assert len(attempts) == 1
+
+
+def test_non_retryable_errors_leave_the_circuit_closed():
+    """Errors the provider answered with should not trip the breaker."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, clock=clock)
+
+    def fetch():
+        raise ValueError("unknown ticker")
+
+    for _ in range(5):
+        with pytest.raises(ProviderError):
+            run(fetch, clock, breaker=breaker)
+    assert breaker.state == "closed"
+
+    def unreachable():
+        raise ConnectionError("reset")
+
+    with pytest.raises(ProviderError):
+        run(unreachable, clock, breaker=breaker)
+    assert breaker.state == "open"
+
+
+def test_rate_limited_after_retries():
+    """Persistent 429s should surface as RateLimitedError."""
+    clock = FakeClock()
+
+    def fetch():
+        raise RuntimeError("429 Too Many Requests")
+
+    with pytest.raises(RateLimitedError):
+        run(fetch, clock)
+
+
+def test_open_circuit_fails_fast():
+    """An open circuit should not call the provider at all."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        run(lambda: pytest.fail("provider called"), clock, breaker=breaker)
@@ -0,0 +1,175 @@
+"""Tests for historical replay."""
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from stotify.main import replay_alerts
+from stotify.market_hours import ET
+
+
+def make_intraday(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="15min", tz=ET)
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+def make_daily(closes, start="2023-12-01"):
+    index = pd.date_range(start, periods=len(closes), freq="D", tz=ET)
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+def test_replay_records_threshold_alerts_bar_by_bar(monkeypatch):
+    """Threshold alerts should fire on each completed bar above the bound."""
+    intraday = make_intraday([100.0, 105.0, 111.0, 112.0, 104.0])
+    monkeypatch.setattr(
+        "stotify.replay.get_history", lambda *_args, **_kwargs: intraday
+    )
+    config = {
+        "groups": {
+            "portfolio": [
+                {
+                    "ticker": "AAPL",
+                    "strategy": "threshold",
+                    "timeframe": "15m",
+                    "params": {"high": 110},
+                }
+            ]
+        }
+    }
+
+    notifications = replay_alerts(
+        config, datetime(2024, 1, 2), datetime(2024, 1, 3), interval="15m"
+    )
+
+    assert [n.price for n in notifications] == [111.0, 112.0]
+    assert notifications[0].timestamp == intraday.index[3].to_pydatetime()
+    assert all(n.group_name == "portfolio" for n in notifications)
+
+
+def test_replay_only_sees_bars_completed_by_simulated_clock(monkeypatch):
+    """Daily MA cross should not read the close of a bar that is still open."""
+    intraday = make_intraday([10.0] * 26)
+    daily = make_daily([3.0, 2.0, 1.0, 1.0] + [1.0] * 28 + [5.0])
+
+    def fake_get_history(_ticker, interval="1d", **_kwargs):
+        return intraday if interval == "15m" else daily
+
+    monkeypatch.setattr("stotify.replay.get_history", fake_get_history)
+    config = {
+        "groups": {
+            "portfolio": [
+                {
+                    "ticker": "AAPL",
+                    "strategy": "ma_cross",
+                    "timeframe": "1d",
+                    "params": {"fast_window": 2, "slow_window": 3},
+                }
+            ]
+        }
+    }
+
+    notifications = replay_alerts(
+        config, datetime(2024, 1, 2), datetime(2024, 1, 3), interval="15m"
+    )
+
+    # The 2024-01-02 daily bar (close 5.0) completes at 16:00, which is the
+    # last replay step; earlier steps still see the flat 1.0 closes.
+    assert len(notifications) == 1
+    assert notifications[0].timestamp.hour == 16
+    assert notifications[0].price == 5.0
+
+
+def make_sessions(start, end, seed=0):
+    """Return 15m bars for every weekday session between start and end."""
+    days = pd.bdate_range(start, end)
+    offsets = pd.timedelta_range("9h30min", periods=26, freq="15min")
+    index = pd.DatetimeIndex(
+        (days.values[:, None] + offsets.values[None, :]).ravel()
+    ).tz_localize(ET)
+    steps = np.random.default_rng(seed).normal(0, 0.002, len(index))
+    return pd.DataFrame({"Close": 100 * np.exp(np.cumsum(steps))}, index=index)
+
+
+def test_replay_evaluates_each_alert_once_per_bar_of_its_timeframe(monkeypatch):
+    """1h alerts fire on the hour and 1d alerts once per session, not every 15m."""
+    intraday = make_sessions("2024-01-02", "2024-01-03")
+    intraday["Close"] = 200.0
+    monkeypatch.setattr(
+        "stotify.replay.get_history", lambda *_args, **_kwargs: intraday
+    )
+    config = {
+        "groups": {
+            "portfolio": [
+                {
+                    "ticker": ticker,
+                    "strategy": "threshold",
+                    "timeframe": timeframe,
+                    "params": {"high": 110},
+                }
+                for ticker, timeframe in (("M15", "15m"), ("H1", "1h"), ("D1", "1d"))
+            ]
+        }
+    }
+
+    notifications = replay_alerts(
+        config, datetime(2024, 1, 2), datetime(2024, 1, 4), interval="15m"
+    )
+
+    times = {ticker: [] for ticker in ("M15", "H1", "D1")}
+    for notification in notifications:
+        times[notification.ticker].append(notification.timestamp)
+    # Steps are bar completions 09:45 … 16:00; 16:00 is after the session.
+    assert len(times["M15"]) == 2 * 25
+    assert len(times["H1"]) == 2 * 6
+    assert all(timestamp.minute == 0 for timestamp in times["H1"])
+    assert [timestamp.hour for timestamp in times["D1"]] == [16, 16]
+    assert [n.timestamp for n in notifications] == sorted(
+        n.timestamp for n in notifications
+    )
+
+
+def test_replay_year_of_bars_for_hundreds_of_alerts_under_a_minute(monkeypatch):
+    """A year of 15m steps × 200 alerts should replay in under a minute."""
+    tickers = [f"T{index:02d}" for index in range(30)]
+    histories = {
+        ticker: make_sessions("2023-01-02", "2023-12-29", seed=index)
+        for index, ticker in enumerate(tickers)
+    }
+    monkeypatch.setattr(
+        "stotify.replay.get_history",
+        lambda ticker, *_args, **_kwargs: histories[ticker],
+    )
+    alerts = []
+    for index in range(200):
+        ticker = tickers[index % len(tickers)]
+        kind = index % 3
+        if kind == 0:
+            alerts.append(
+                {
+                    "ticker": ticker,
+                    "strategy": "threshold",
+                    "timeframe": "15m",
+                    "params": {"high": 110 + index % 7, "low": 90 - index % 5},
+                }
+            )
+        else:
+            alerts.append(
+                {
+                    "ticker": ticker,
+                    "strategy": "ma_cross",
+                    "timeframe": "1h" if kind == 1 else "1d",
+                    "params": {"fast_window": 5 + index % 4, "slow_window": 20},
+                }
+            )
+    config = {"groups": {"load": alerts}}
+
+    started = time.perf_counter()
+    notifications = replay_alerts(
+        config, datetime(2023, 1, 2), datetime(2023, 12, 30), interval="15m"
+    )
+    elapsed = time.perf_counter() - started
+
+    assert notifications
+    assert elapsed < 60
@@ -0,0 +1,75 @@
+"""Tests for report module."""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from stotify.market_hours import ET
+from stotify.report import AlertOutcome, RunReport, data_freshness
+
+
+def make_report(started_at, outcome="fired"):
+    report = RunReport(started_at)
+    report.add(AlertOutcome("g", "threshold", "15m", ("AAPL",), outcome, seconds=0.1))
+    report.summary = {"duration": 1.5, "sent": 1}
+    return report
+
+
+def test_data_freshness_uses_oldest_time():
+    now = ET.localize(datetime(2024, 1, 10, 12, 0))
+    times = [
+        pd.Timestamp("2024-01-10 11:45", tz=ET),
+        pd.Timestamp("2024-01-10 11:30"),
+    ]
+
+    as_of, staleness = data_freshness(times, now)
+
+    assert as_of.startswith("2024-01-10T11:30:00")
+    assert staleness == 1800.0
+    assert data_freshness([], now) == (None, None)
+
+
+def test_write_json_report(tmp_path):
+    report = make_report(datetime(2024, 1, 10, tzinfo=UTC))
+    path = tmp_path / "reports" / "run.json"
+
+    report.write(path)
+
+    data = json.loads(path.read_text())
+    assert data["counts"]["fired"] == 1
+    assert data["outcomes"][0]["tickers"] == ["AAPL"]
+    assert data["duration"] == 1.5
+
+
+def test_write_parquet_report(tmp_path):
+    pytest.importorskip("pyarrow")
+    report = make_report(datetime(2024, 1, 10, tzinfo=UTC))
+
+    report.write(tmp_path / "run.parquet")
+
+    frame = pd.read_parquet(tmp_path / "run.parquet")
+    assert frame["outcome"].tolist() == ["fired"]
+
+
+def test_history_appends_summaries_and_drops_old_runs(tmp_path):
+    path = tmp_path / "history.jsonl"
+    now = datetime(2024, 6, 1, tzinfo=UTC)
+    for days in (120, 10, 0):
+        make_report(now - timedelta(days=days)).append_history(path)
+
+    runs = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert [run["started_at"][:10] for run in runs] == ["2024-05-22", "2024-06-01"]
+    assert "outcomes" not in runs[0]
+    assert runs[0]["counts"]["fired"] == 1
+
+
+def test_notify_latency_percentiles():
+    report = RunReport()
+    assert report.notify_latency() == {}
+
+    report.notify_seconds.extend([0.01] * 99 + [1.0])
+
+    assert report.notify_latency() == {"p50": 0.01, "p99": 0.0199, "max": 1.0}
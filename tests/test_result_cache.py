@@ -0,0 +1,99 @@
+"""Tests for result_cache module."""
+
+import numpy as np
+import pandas as pd
+
+from stotify import backtest
+from stotify.backtest import backtest_metrics, backtest_strategy
+from stotify.result_cache import CachedRun, ResultCache, fingerprint
+
+
+def make_history(periods=300):
+    index = pd.date_range("2021-01-01", periods=periods, freq="D")
+    closes = 100 + np.cumsum(np.random.default_rng(1).normal(0, 1, periods))
+    return pd.DataFrame({"Close": closes}, index=index)
+
+
+def counting_series(monkeypatch):
+    calls = []
+    series = backtest.get_series("ma_cross")
+
+    def counted(history, params):
+        calls.append(len(history))
+        return series(history, params)
+
+    monkeypatch.setattr(backtest, "get_series", lambda _strategy: counted)
+    return calls
+
+
+PARAMS = {"fast_window": 5, "slow_window": 20}
+
+
+def test_repeated_backtest_is_served_from_cache(monkeypatch):
+    history = make_history()
+    monkeypatch.setattr("stotify.backtest.get_history", lambda *_a, **_k: history)
+    calls = counting_series(monkeypatch)
+    cache = ResultCache()
+
+    first = backtest_strategy("TEST", "ma_cross", PARAMS, cache=cache)
+    second = backtest_strategy("TEST", "ma_cross", PARAMS, cache=cache)
+
+    assert calls == [300]
+    assert second.metrics == first.metrics
+    assert second.trades == first.trades
+    pd.testing.assert_series_equal(second.equity, first.equity)
+    pd.testing.assert_frame_equal(second.history, first.history)
+    assert cache.stats()["hits"] == 1
+
+    metrics = backtest_metrics("TEST", "ma_cross", PARAMS, cache=cache)
+    assert metrics == first.metrics
+    assert calls == [300]
+
+
+def test_new_bars_and_other_params_miss(monkeypatch):
+    history = make_history()
+    current = {"history": history.iloc[:-1]}
+    monkeypatch.setattr(
+        "stotify.backtest.get_history", lambda *_a, **_k: current["history"]
+    )
+    calls = counting_series(monkeypatch)
+    cache = ResultCache()
+
+    backtest_metrics("TEST", "ma_cross", PARAMS, cache=cache)
+    current["history"] = history
+    backtest_metrics("TEST", "ma_cross", PARAMS, cache=cache)
+    backtest_metrics("TEST", "ma_cross", PARAMS, exit_mode="cross", cache=cache)
+
+    assert calls == [299, 300, 300]
+    assert fingerprint(history) != fingerprint(history.iloc[:-1])
+
+
+def test_disk_entries_survive_a_new_process(monkeypatch, tmp_path):
+    history = make_history()
+    monkeypatch.setattr("stotify.backtest.get_history", lambda *_a, **_k: history)
+    calls = counting_series(monkeypatch)
+
+    first = backtest_strategy("TEST", "ma_cross", PARAMS, cache=ResultCache(tmp_path))
+    fresh = ResultCache(tmp_path)
+    second = backtest_strategy("TEST", "ma_cross", PARAMS, cache=fresh)
+
+    assert calls == [300]
+    assert fresh.stats()["disk_hits"] == 1
+    assert second.trades == first.trades
+    assert second.metrics == first.metrics
+    pd.testing.assert_frame_equal(second.history, first.history)
+
+
+def test_disk_size_cap_evicts_least_recently_used(tmp_path):
+    run = CachedRun({"sharpe": 1.0}, np.arange(10_000), np.arange(10_000))
+    cache = ResultCache(tmp_path, max_disk_bytes=1)
+    cache.get_or_run("a", lambda: run)
+    cache.get_or_run("b", lambda: run)
+
+    assert [path.name for path in tmp_path.glob("*.npz")] == []
+    assert cache.stats()["disk_evictions"] == 2
+
+    cache = ResultCache(tmp_path, max_disk_bytes=10**9)
+    cache.get_or_run("a", lambda: run)
+    (tmp_path / "a.npz").write_bytes(b"corrupt")
+    assert ResultCache(tmp_path).get_or_run("a", lambda: run) is run
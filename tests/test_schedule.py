@@ -0,0 +1,103 @@
+"""Tests for schedule module."""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from stotify.market_hours import ET
+from stotify.schedule import (
+    NOTHING_DUE_EXIT_CODE,
+    due_timeframes,
+    is_due,
+    main,
+    plan_run,
+    timeframe_minutes,
+)
+from stotify.validation import is_valid_timeframe
+
+
+def at(hour, minute, day=10):
+    """Return a time on Wednesday 2024-01-10 (or another January day) in ET."""
+    return ET.localize(datetime(2024, 1, day, hour, minute))
+
+
+def test_timeframe_minutes():
+    assert timeframe_minutes("15m") == 15
+    assert timeframe_minutes("6h") == 360
+    assert timeframe_minutes("1d") == 1440
+
+
+@pytest.mark.parametrize("timeframe", ["0m", "0h", "0d", "00m"])
+def test_zero_length_timeframes_are_rejected(timeframe):
+    with pytest.raises(ValueError):
+        timeframe_minutes(timeframe)
+    assert not is_valid_timeframe(timeframe)
+
+
+def test_hourly_due_only_on_the_hour():
+    assert is_due("1h", at(11, 0)) is True
+    assert is_due("1h", at(11, 7)) is True  # delayed cron tick
+    assert is_due("1h", at(11, 15)) is False
+    assert is_due("1h", at(11, 45)) is False
+
+
+def test_six_hour_due_only_at_slot():
+    assert is_due("6h", at(12, 0)) is True
+    assert is_due("6h", at(13, 0)) is False
+
+
+def test_intraday_not_due_when_market_closed():
+    assert is_due("15m", at(17, 0)) is False
+    assert is_due("15m", at(17, 0), skip_market_check=True) is True
+
+
+def test_daily_due_in_first_tick_after_close():
+    assert is_due("1d", at(15, 45)) is False
+    assert is_due("1d", at(16, 0)) is True
+    assert is_due("1d", at(16, 15)) is False
+    assert is_due("1d", at(17, 0), cadence="1d") is True
+
+
+def test_daily_not_due_on_weekend():
+    assert is_due("1d", at(16, 0, day=13)) is False
+
+
+def test_multi_day_due_every_n_sessions():
+    due = [is_due("2d", at(16, 0, day=day)) for day in (8, 9, 10, 11, 12)]
+    assert sum(due) in (2, 3)
+    assert due[0] != due[1]
+
+
+def test_due_timeframes_sorted_shortest_first():
+    assert due_timeframes({"1d", "1h", "15m", "6h"}, at(12, 0)) == ["15m", "1h", "6h"]
+
+
+def test_plan_run_splits_due_and_skipped():
+    config = {
+        "groups": {
+            "a": [{"timeframe": "15m"}, {"timeframe": "1h"}],
+            "b": [{"timeframe": "1d"}],
+        }
+    }
+
+    result = plan_run(config, at(11, 30))
+
+    assert result["due"] == ["15m"]
+    assert result["skipped"] == ["1h", "1d"]
+
+
+def test_main_exit_code_and_github_output(tmp_path, monkeypatch, capsys):
+    config_file = tmp_path / "alerts.json"
+    config_file.write_text(json.dumps({"groups": {"a": [{"timeframe": "1h"}]}}))
+    output = tmp_path / "output"
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+
+    code = main([str(config_file), "--now", "2024-01-10T11:30:00-05:00"])
+
+    assert code == NOTHING_DUE_EXIT_CODE
+    assert json.loads(capsys.readouterr().out)["due"] == []
+    assert output.read_text() == "due=false\ntimeframes=\n"
+
+    assert main([str(config_file), "--now", "2024-01-10T11:00:00-05:00"]) == 0
+    assert "due=true\ntimeframes=1h\n" in output.read_text()
@@ -0,0 +1,69 @@
+"""Tests for shard module."""
+
+import json
+
+import pytest
+
+from stotify.shard import main, merge_reports, parse_shard, shard_config, shard_of
+
+
+def test_parse_shard():
+    assert parse_shard("2/4") == (2, 4)
+    for value in ("0/4", "5/4", "2", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shard_of_is_balanced_and_consistent():
+    tickers = [f"T{index}" for index in range(2000)]
+    four = [shard_of(ticker, 4) for ticker in tickers]
+    five = [shard_of(ticker, 5) for ticker in tickers]
+
+    assert set(four) == {1, 2, 3, 4}
+    assert min(four.count(shard) for shard in range(1, 5)) > 300
+    # Adding a shard only moves tickers onto the new shard.
+    moved = [(a, b) for a, b in zip(four, five, strict=True) if a != b]
+    assert all(b == 5 for _, b in moved)
+    assert len(moved) < len(tickers) / 3
+
+
+def test_shard_config_keeps_tickers_together_across_groups():
+    config = {
+        "groups": {
+            "a": [
+                {"tickers": ["AAPL", "MSFT", "NVDA"], "strategy": "rsi"},
+                {"ticker": "AAPL", "strategy": "threshold"},
+            ],
+            "b": [{"ticker": "MSFT", "strategy": "threshold"}],
+        }
+    }
+    owners = {ticker: shard_of(ticker, 2) for ticker in ("AAPL", "MSFT", "NVDA")}
+
+    for shard in (1, 2):
+        part = shard_config(config, shard, 2)
+        for alerts in part["groups"].values():
+            for alert in alerts:
+                tickers = alert.get("tickers") or [alert["ticker"]]
+                assert {owners[ticker] for ticker in tickers} == {shard}
+
+
+def test_merge_reports_sums_counts_and_lists_missing(tmp_path, capsys):
+    reports = [
+        {"shard": "1/3", "alerts": 2, "sent": 1, "duration": 4.0, "cache": {"hits": 3}},
+        {"shard": "3/3", "alerts": 5, "sent": 0, "duration": 6.5, "cache": {"hits": 1}},
+    ]
+
+    merged = merge_reports(reports)
+
+    assert merged["alerts"] == 7 and merged["sent"] == 1
+    assert merged["duration"] == 6.5
+    assert merged["cache"] == {"hits": 4}
+    assert merged["missing"] == ["2/3"]
+
+    paths = []
+    for index, report in enumerate(reports):
+        path = tmp_path / f"{index}.json"
+        path.write_text(json.dumps(report))
+        paths.append(str(path))
+    assert main(paths) == 1
+    assert json.loads(capsys.readouterr().out)["shards"] == ["1/3", "3/3"]
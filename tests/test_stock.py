@@ -1,50 +1,101 @@
 """Tests for stock module."""
 
+from datetime import UTC, datetime
 from unittest.mock import Mock, patch
 
 import pandas as pd
 
-from stotify.stock import get_history, get_price
-
-
-def test_get_price_from_fast_info():
-    """Should return price from fast_info."""
-    mock_ticker = Mock()
-    mock_ticker.fast_info.get.return_value = 150.50
-
-    with patch("stotify.stock.yf.Ticker", return_value=mock_ticker):
-        price = get_price("AAPL")
-
-    assert price == 150.50
-
-
-def test_get_price_fallback_to_info():
-    """Should fallback to info if fast_info has no price."""
+from stotify.market_hours import ET
+from stotify.stock import (
+    INFO,
+    SNAPSHOT,
+    cache_stats,
+    failure_count,
+    get_histories,
+    get_history,
+    get_price,
+    get_quote,
+    get_quotes,
+    last_failure,
+    quote_stats,
+)
+
+
+def minute_bars(prices):
+    """Build a bulk download frame of one-minute bars per ticker."""
+    index = pd.date_range("2024-01-10 15:57", periods=3, freq="1min", tz="UTC")
+    columns = pd.MultiIndex.from_product([list(prices), ["Close", "Volume"]])
+    rows = [
+        [value for ticker in prices for value in (prices[ticker][i], 100)]
+        for i in range(3)
+    ]
+    return pd.DataFrame(rows, index=index, columns=columns)
+
+
+def test_get_quote_reads_latest_minute_bar():
+    """Quotes should carry the last bar's price, time, volume and source."""
+    frame = minute_bars({"AAPL": [150.0, 150.25, 150.5]})
+
+    with patch("stotify.stock.yf.download", return_value=frame):
+        quote = get_quote("AAPL")
+
+    assert quote.price == 150.5
+    assert quote.source == SNAPSHOT
+    assert quote.timestamp == datetime(2024, 1, 10, 16, 0, tzinfo=UTC)
+    assert quote.volume == 300
+    assert quote.staleness > 0
+    assert quote.age(datetime(2024, 1, 10, 16, 1, tzinfo=UTC)) == 60
+    assert get_price("AAPL") == 150.5
+
+
+def test_get_quotes_bulk_fetches_without_info_fallback():
+    """One snapshot should serve every ticker; missing ones stay None."""
+    frame = minute_bars({"AAPL": [1.0, 2.0, 3.0], "MSFT": [None, None, None]})
+
+    with (
+        patch("stotify.stock.yf.download", return_value=frame) as download,
+        patch("stotify.stock.yf.Ticker") as ticker_cls,
+    ):
+        quotes = get_quotes(["AAPL", "MSFT"])
+        assert get_quote("AAPL").price == 3.0
+
+    download.assert_called_once()
+    ticker_cls.assert_not_called()
+    assert quotes["AAPL"].price == 3.0
+    assert quotes["MSFT"] is None
+    assert quote_stats()["snapshots"] == 1
+    assert quote_stats()["fallbacks"] == 0
+
+
+def test_info_fallback_is_opt_in_and_measured(monkeypatch):
+    """The heavy info endpoint should only be used when asked for."""
     mock_ticker = Mock()
-    mock_ticker.fast_info.get.return_value = None
-    mock_ticker.info.get.return_value = 200.00
+    mock_ticker.info = {
+        "currentPrice": 200.0,
+        "bid": 199.9,
+        "ask": 200.1,
+        "regularMarketTime": 1704902400,
+    }
 
-    with patch("stotify.stock.yf.Ticker", return_value=mock_ticker):
-        price = get_price("GOOGL")
+    with (
+        patch("stotify.stock.yf.download", return_value=pd.DataFrame()),
+        patch("stotify.stock.yf.Ticker", return_value=mock_ticker) as ticker_cls,
+    ):
+        assert get_price("GOOGL") is None
+        ticker_cls.assert_not_called()
 
-    assert price == 200.00
+        monkeypatch.setenv("STOTIFY_QUOTE_FALLBACK", "1")
+        quote = get_quotes(["GOOGL"])["GOOGL"]
 
-
-def test_get_price_returns_none_on_no_data():
-    """Should return None if no price available."""
-    mock_ticker = Mock()
-    mock_ticker.fast_info.get.return_value = None
-    mock_ticker.info.get.return_value = None
-
-    with patch("stotify.stock.yf.Ticker", return_value=mock_ticker):
-        price = get_price("INVALID")
-
-    assert price is None
+    assert (quote.price, quote.bid, quote.ask) == (200.0, 199.9, 200.1)
+    assert quote.source == INFO
+    assert quote.timestamp == datetime(2024, 1, 10, 16, 0, tzinfo=UTC)
+    assert quote_stats()["fallbacks"] == 1
 
 
 def test_get_price_returns_none_on_exception():
     """Should return None on any exception."""
-    with patch("stotify.stock.yf.Ticker", side_effect=Exception("API error")):
+    with patch("stotify.stock.yf.download", side_effect=Exception("API error")):
         price = get_price("AAPL")
 
     assert price is None
@@ -80,3 +131,91 @@ def test_get_history_returns_none_on_exception():
         result = get_history("AAPL")
 
     assert result is None
+
+
+def test_get_price_is_memoized():
+    """Repeated quotes within the TTL should not hit Yahoo again."""
+    frame = minute_bars({"AAPL": [150.0, 150.25, 150.5]})
+
+    with patch("stotify.stock.yf.download", return_value=frame) as download:
+        assert get_price("AAPL") == 150.50
+        assert get_price("AAPL") == 150.50
+
+    download.assert_called_once()
+    assert cache_stats()["hits"] == 1
+
+
+def test_get_history_is_memoized_per_request():
+    """Identical history requests should share one fetch."""
+    mock_ticker = Mock()
+    mock_ticker.history.return_value = pd.DataFrame({"Close": [1.0, 2.0]})
+
+    with patch("stotify.stock.yf.Ticker", return_value=mock_ticker):
+        get_history("AAPL", period="1mo")
+        get_history("AAPL", period="1mo")
+        get_history("AAPL", period="3mo")
+
+    assert mock_ticker.history.call_count == 2
+
+
+def test_failed_requests_are_counted():
+    """Provider errors should be recorded, not just turned into None."""
+    with (
+        patch("stotify.stock.yf.download", side_effect=Exception("API error")),
+        patch("stotify.stock.yf.Ticker", side_effect=Exception("API error")),
+    ):
+        assert get_price("AAPL") is None
+        assert get_history("AAPL") is None
+
+    assert failure_count() == 2
+    assert "API error" in last_failure()
+
+
+def test_get_histories_bulk_fetches_and_memoizes_each_ticker():
+    """One download should serve later single-ticker requests."""
+    index = pd.date_range("2024-01-01", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Close", "Volume"]])
+    frame = pd.DataFrame(
+        [[1.0, 10, 5.0, 50], [2.0, 20, None, None], [3.0, 30, 6.0, 60]],
+        index=index,
+        columns=columns,
+    )
+
+    with (
+        patch("stotify.stock.yf.download", return_value=frame) as download,
+        patch("stotify.stock.yf.Ticker") as ticker_cls,
+    ):
+        histories = get_histories(["AAPL", "MSFT", "NOPE"], period="1mo")
+        single = get_history("MSFT", period="1mo")
+
+    download.assert_called_once()
+    ticker_cls.assert_not_called()
+    assert histories["AAPL"]["Close"].tolist() == [1.0, 2.0, 3.0]
+    assert len(histories["MSFT"]) == 2
+    assert histories["NOPE"] is None
+    assert single is histories["MSFT"]
+
+
+def test_bulk_and_single_histories_share_one_index_tz():
+    """Bulk downloads should be indexed in ET like Ticker.history frames."""
+    naive = pd.date_range("2024-01-02", periods=3, freq="D")
+    columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], ["Close"]])
+    frame = pd.DataFrame([[1.0, 5.0], [2.0, 6.0], [3.0, 7.0]], naive, columns)
+    mock_ticker = Mock()
+    mock_ticker.history.return_value = pd.DataFrame(
+        {"Close": [1.0, 2.0, 3.0]}, index=naive.tz_localize(ET)
+    )
+
+    with (
+        patch("stotify.stock.yf.Ticker", return_value=mock_ticker),
+        patch("stotify.stock.yf.download", return_value=frame),
+    ):
+        single = get_history("AAPL", period="1mo")
+        histories = get_histories(["AAPL", "MSFT"], period="1mo")
+
+    assert histories["AAPL"] is single
+    assert str(histories["MSFT"].index.tz) == str(single.index.tz)
+    aligned = pd.DataFrame(
+        {ticker: history["Close"] for ticker, history in histories.items()}
+    )
+    assert aligned.shape == (3, 2)
@@ -1,15 +1,38 @@
 """Tests for strategy implementations."""
 
+import json
+import math
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
+import pytest
 
-from stotify.strategies import moving_average_cross_strategy, threshold_strategy
+from stotify.indicators import IndicatorCache, RollingMeans, rolling_means
+from stotify.market_hours import ET
+from stotify.price_matrix import PriceMatrices
+from stotify.stock import SNAPSHOT, Quote
+from stotify.strategies import (
+    INCREMENTAL,
+    IncrementalStrategy,
+    get_series,
+    get_strategy,
+    moving_average_cross_strategy,
+    save_state,
+    signal_columns,
+    threshold_strategy,
+    use_price_matrices,
+    use_timeframe,
+)
 
 
 def test_threshold_strategy_triggers_for_multiple_tickers():
     """Threshold strategy should emit signals per ticker."""
-    with patch("stotify.strategies.get_price", return_value=260.0):
+    with patch(
+        "stotify.strategies.get_quote",
+        side_effect=lambda ticker: Quote(ticker, 260.0, datetime.now(ET), SNAPSHOT),
+    ):
         signals = threshold_strategy(["AAPL", "MSFT"], {"high": 250})
 
     assert len(signals) == 2
@@ -31,3 +54,279 @@ def test_moving_average_cross_strategy_triggers_when_fast_above_slow():
     signal = signals[0]
     assert signal.ticker == "AAPL"
     assert "MA" in signal.message
+
+
+def test_ma_cross_series_flags_fast_above_slow():
+    """Series function should flag bars where the fast MA is above the slow MA."""
+    history = pd.DataFrame({"Close": [3.0, 2.0, 1.0, 2.0, 3.0]})
+    params = {"fast_window": 2, "slow_window": 3}
+
+    frame = get_series("ma_cross")(history, params)
+
+    assert signal_columns(frame) == ["ma_cross"]
+    assert frame["ma_cross"].tolist() == [False, False, False, False, True]
+
+
+def test_threshold_series_flags_high_and_low():
+    """Threshold series should emit one signal column per configured bound."""
+    history = pd.DataFrame({"Close": [5.0, 10.0, 15.0]})
+
+    frame = get_series("threshold")(history, {"high": 15, "low": 5})
+
+    assert frame["high"].tolist() == [False, False, True]
+    assert frame["low"].tolist() == [True, False, False]
+
+
+def make_ohlcv(length=120, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-02 09:30", periods=length, freq="2h", tz="UTC")
+    close = 100 + np.cumsum(rng.normal(0, 1, length))
+    spread = rng.uniform(0.1, 1.0, length)
+    return pd.DataFrame(
+        {
+            "Open": close + rng.normal(0, 0.5, length),
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000, 10_000, length).astype(float),
+        },
+        index=index,
+    )
+
+
+INCREMENTAL_CASES = [
+    ("ma_cross", {"fast_window": 5, "slow_window": 20}),
+    ("ema_cross", {"fast_span": 5, "slow_span": 12}),
+    ("rsi", {"window": 14, "overbought": 60, "oversold": 40}),
+    ("bollinger", {"window": 10, "num_std": 1.5}),
+    ("pct_move", {"percent": 1.0}),
+    ("volume_spike", {"window": 10, "multiplier": 1.5}),
+    ("vwap_breakout", {"band_pct": 0.2}),
+]
+
+
+@pytest.mark.parametrize(("name", "params"), INCREMENTAL_CASES)
+def test_incremental_matches_series_and_resumes(name, params):
+    """Incremental evaluation should reproduce the series, even after resuming."""
+    history = make_ohlcv()
+    frame = get_series(name)(history, params)
+    bars = [
+        {"timestamp": timestamp, **row}
+        for timestamp, row in zip(history.index, history.to_dict("records"))
+    ]
+
+    evaluator = INCREMENTAL[name](params)
+    rows = [evaluator.update(bar) for bar in bars[:60]]
+    state = json.loads(json.dumps(evaluator.to_state()))
+    resumed = INCREMENTAL[name](params, state)
+    rows += [resumed.update(bar) for bar in bars[60:]]
+
+    for column in frame.columns:
+        expected = frame[column].to_numpy()
+        actual = np.array([row[column] for row in rows], dtype=expected.dtype)
+        if expected.dtype == bool:
+            assert actual.tolist() == expected.tolist(), column
+        else:
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, err_msg=column)
+
+
+def test_incremental_strategy_without_to_state_fails_on_creation():
+    """A subclass missing an abstract method should not get as far as a run."""
+
+    class Partial(IncrementalStrategy):
+        def update(self, bar):
+            return {}
+
+    with pytest.raises(TypeError, match="to_state"):
+        Partial({})
+
+
+def test_incremental_strategy_fetches_only_new_bars(tmp_path, monkeypatch):
+    """With a state store, later runs should fetch from the last persisted bar."""
+    monkeypatch.setenv("STOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+    history = make_ohlcv(length=40)
+    params = {"fast_span": 3, "slow_span": 8, "interval": "1h"}
+    calls = []
+
+    def fake_get_history(_ticker, **kwargs):
+        calls.append(kwargs)
+        if "start" in kwargs:
+            return history[history.index.normalize() >= kwargs["start"]]
+        return history.iloc[:30]
+
+    strategy = get_strategy("ema_cross")
+    with patch("stotify.strategies.get_history", side_effect=fake_get_history):
+        strategy(["AAPL"], params)
+        save_state()
+        signals = strategy(["AAPL"], params)
+
+    assert "period" in calls[0]
+    assert calls[1]["start"] == str(history.index[28].date())
+    expected = get_series("ema_cross")(history, params)["ema_cross"].iloc[-1]
+    assert bool(signals) == bool(expected)
+
+
+def test_intraday_timeframe_evaluates_completed_bars(tmp_path, monkeypatch):
+    """Sub-daily alerts should use bars of their timeframe, minus the forming bar."""
+    monkeypatch.setenv("STOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+    tomorrow = pd.Timestamp.now(tz=ET).normalize() + pd.Timedelta(days=1, hours=10)
+    index = pd.date_range("2024-01-10 14:30", periods=4, freq="15min", tz="UTC")
+    history = pd.DataFrame(
+        {"Close": [1.0, 2.0, 3.0, 4.0, 0.5]},
+        index=index.append(pd.DatetimeIndex([tomorrow.tz_convert("UTC")])),
+    )
+    params = {"fast_window": 2, "slow_window": 3}
+
+    with (
+        patch("stotify.strategies.get_history", return_value=history) as mock,
+        use_timeframe("15m"),
+    ):
+        signals = moving_average_cross_strategy(["AAPL"], params)
+        save_state()
+
+    assert mock.call_args.kwargs["interval"] == "15m"
+    assert [signal.price for signal in signals] == [4.0]
+    assert "2x15m MA" in signals[0].message
+    state = json.loads((tmp_path / "state.json").read_text())
+    (saved,) = state.values()
+    assert saved["last_bar"] == "2024-01-10T15:15:00+00:00"
+
+
+def test_intraday_rerun_without_new_bars_reuses_last_row(tmp_path, monkeypatch):
+    """A second evaluation within the same bar should return the saved row."""
+    monkeypatch.setenv("STOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+    index = pd.date_range("2024-01-10 14:30", periods=4, freq="15min", tz="UTC")
+    history = pd.DataFrame({"Close": [1.0, 2.0, 3.0, 4.0]}, index=index)
+    params = {"fast_window": 2, "slow_window": 3}
+
+    with (
+        patch("stotify.strategies.get_history", return_value=history),
+        use_timeframe("15m"),
+    ):
+        first = moving_average_cross_strategy(["AAPL"], params)
+        second = moving_average_cross_strategy(["AAPL"], params)
+        save_state()
+
+    assert [signal.price for signal in first] == [4.0]
+    assert second == first
+
+
+def test_threshold_on_close_uses_last_completed_bar():
+    """`on_close` threshold alerts should read the bar close, not the quote."""
+    history = pd.DataFrame(
+        {"Close": [240.0, 260.0]},
+        index=pd.date_range("2024-01-10 14:30", periods=2, freq="1h", tz="UTC"),
+    )
+
+    with (
+        patch("stotify.strategies.get_history", return_value=history),
+        patch("stotify.strategies.get_quote") as mock_quote,
+        use_timeframe("1h"),
+    ):
+        signals = threshold_strategy(["AAPL"], {"high": 250, "on_close": True})
+
+    mock_quote.assert_not_called()
+    assert [(signal.price, signal.alert_type) for signal in signals] == [
+        (260.0, "high")
+    ]
+
+
+def test_threshold_skips_quotes_older_than_max_age():
+    """Stale quotes should be ignored when the alert sets max_age."""
+    traded = datetime.now(ET) - timedelta(minutes=10)
+
+    with patch(
+        "stotify.strategies.get_quote",
+        side_effect=lambda ticker: Quote(ticker, 260.0, traded, SNAPSHOT),
+    ):
+        stale = threshold_strategy(["AAPL"], {"high": 250, "max_age": 60})
+        fresh = threshold_strategy(["AAPL"], {"high": 250, "max_age": 3600})
+
+    assert stale == []
+    assert [signal.ticker for signal in fresh] == ["AAPL"]
+
+
+def test_indicator_cache_sma_matches_pandas_rolling():
+    """Cumulative-sum SMAs should match pandas rolling means."""
+    history = make_ohlcv(length=300)
+    cache = IndicatorCache()
+    calls = []
+
+    def fetch(ticker, **kwargs):
+        calls.append((ticker, kwargs))
+        return history
+
+    with patch.object(
+        RollingMeans, "prefixes", autospec=True, side_effect=RollingMeans.prefixes
+    ) as prefixes:
+        for window in (5, 20, 50, 400):
+            values = cache.sma("AAPL", "1y", "1d", window, fetch)
+            expected = history["Close"].rolling(window).mean().to_numpy()
+            np.testing.assert_allclose(values, expected, rtol=1e-10)
+
+    assert len(calls) == 1
+    # One prefix-sum pass serves every window.
+    assert prefixes.call_count == 1
+
+
+def test_rolling_means_streamed_in_chunks_match_pandas():
+    """Chunked rolling means should match a single pandas pass."""
+    closes = make_ohlcv(length=1000)["Close"]
+    windows = [1, 5, 20, 200]
+    kernel = RollingMeans(windows, block_size=64)
+
+    chunks = [kernel.update(chunk) for chunk in np.array_split(closes.to_numpy(), 7)]
+
+    for window in windows:
+        actual = np.concatenate([chunk[window] for chunk in chunks])
+        expected = closes.rolling(window).mean().to_numpy()
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+
+def test_rolling_means_do_not_drift_on_long_series():
+    """Window means should stay exact-to-rounding far into a long series."""
+    rng = np.random.default_rng(1)
+    values = 1e6 + rng.normal(0, 1, 1_000_000)
+
+    means = rolling_means(values, [10])[10]
+
+    assert means[-1] == pytest.approx(math.fsum(values[-10:]) / 10, abs=1e-9)
+
+
+def test_ma_cross_matrix_matches_per_ticker_evaluation():
+    """One 2-D evaluation should match evaluating each ticker's own history."""
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2024-01-01", periods=260, freq="D")
+    histories = {}
+    for number in range(40):
+        closes = 100 + np.cumsum(rng.normal(0, 1, len(index)))
+        keep = rng.random(len(index)) > 0.1
+        keep[: number * 5] = False
+        histories[f"T{number:02d}"] = pd.DataFrame(
+            {"Close": closes[keep]}, index=index[keep]
+        )
+    tickers = list(histories)
+    params = {"fast_window": 10, "slow_window": 50}
+    fetches = []
+
+    def fetch(tickers, **kwargs):
+        fetches.append(tickers)
+        return {ticker: histories[ticker] for ticker in tickers}
+
+    with patch(
+        "stotify.strategies.get_history",
+        side_effect=lambda ticker, **_: histories[ticker],
+    ):
+        expected = moving_average_cross_strategy(tickers, params)
+    with use_price_matrices(PriceMatrices(tickers, fetch=fetch)):
+        actual = moving_average_cross_strategy(tickers, params)
+
+    assert len(fetches) == 1
+    assert 0 < len(actual) < len(tickers)
+    assert [signal.ticker for signal in actual] == [
+        signal.ticker for signal in expected
+    ]
+    assert [signal.message for signal in actual] == [
+        signal.message for signal in expected
+    ]
+    assert [signal.price for signal in actual] == [signal.price for signal in expected]
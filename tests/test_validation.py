@@ -0,0 +1,110 @@
+"""Tests for validation module."""
+
+import json
+
+import pytest
+
+from stotify.strategies import PARAM_SCHEMAS, STRATEGIES, Param, register_strategy
+from stotify.validation import ConfigError, config_issues, load_config, member
+
+
+def test_reports_every_problem_with_its_path():
+    config = {
+        "groups": {
+            "portfolio": [
+                {
+                    "ticker": "AAPL",
+                    "strategy": "ma_cross",
+                    "timeframe": "15m",
+                    "params": {"fast_window": 0},
+                },
+                {"ticker": "MSFT", "strategy": "nope", "timeframe": "1w", "params": {}},
+            ],
+            "tech watch": [
+                {"tickers": [], "strategy": "rsi", "timeframe": "1d", "params": {}}
+            ],
+        }
+    }
+
+    issues = config_issues(config)
+
+    assert [issue.path for issue in issues] == [
+        "$.groups.portfolio[0].params.fast_window",
+        "$.groups.portfolio[0].params",
+        "$.groups.portfolio[1].timeframe",
+        "$.groups.portfolio[1].strategy",
+        '$.groups["tech watch"]',
+        '$.groups["tech watch"][0].tickers',
+    ]
+    assert [issue.message for issue in issues] == [
+        "Alert in group 'portfolio' has invalid 'fast_window' value",
+        "Alert in group 'portfolio' missing 'slow_window' in params",
+        "Alert in group 'portfolio' has invalid timeframe",
+        "Alert in group 'portfolio' has invalid strategy 'nope'",
+        (
+            "Group name 'tech watch' contains invalid characters "
+            "(only a-z, A-Z, 0-9, -, _ allowed)"
+        ),
+        "Alert in group 'tech watch' has invalid 'tickers'",
+    ]
+
+
+def test_load_config_raises_config_error_with_all_issues(tmp_path):
+    path = tmp_path / "alerts.json"
+    alert = {"ticker": "AAPL", "strategy": "pct_move", "timeframe": "1d"}
+    path.write_text(json.dumps({"groups": {"a": [alert, {**alert, "params": {}}]}}))
+
+    with pytest.raises(ConfigError) as excinfo:
+        load_config(path)
+
+    assert [issue.path for issue in excinfo.value.issues] == [
+        "$.groups.a[0].params",
+        "$.groups.a[1].params",
+    ]
+    assert "missing 'percent' in params" in str(excinfo.value)
+
+
+def test_strategies_declare_their_own_params(monkeypatch):
+    monkeypatch.setitem(STRATEGIES, "custom", None)
+    monkeypatch.setitem(PARAM_SCHEMAS, "custom", None)
+    register_strategy(
+        "custom",
+        params={"lookback": Param(int, required=True), "mode": Param(str)},
+    )(lambda tickers, params: [])
+    alert = {"ticker": "AAPL", "strategy": "custom", "timeframe": "1d"}
+
+    valid = {"groups": {"g": [{**alert, "params": {"lookback": 5, "mode": "x"}}]}}
+    invalid = {"groups": {"g": [{**alert, "params": {"lookback": 1.5, "mode": 3}}]}}
+
+    assert config_issues(valid) == []
+    assert [issue.path for issue in config_issues(invalid)] == [
+        "$.groups.g[0].params.lookback",
+        "$.groups.g[0].params.mode",
+    ]
+
+
+def test_member_quotes_non_identifier_keys():
+    assert member("$", "groups") == "$.groups"
+    assert member("$.groups", "tech-watch") == '$.groups["tech-watch"]'
+    assert member("$.groups.a", 3) == "$.groups.a[3]"
+
+
+def test_notifier_backends_and_routes_are_checked():
+    alert = {"ticker": "AAPL", "strategy": "pct_move", "timeframe": "1d"}
+    config = {
+        "groups": {"a": [{**alert, "params": {"percent": 5}}]},
+        "notifiers": {
+            "team": {"type": "slack", "channel": "#x"},
+            "pager": {"type": "sms"},
+            "log": {"type": "file", "path": "alerts.jsonl"},
+        },
+        "routes": {"a": ["log", "phone"], "b": ["log"], "*": ["log"]},
+    }
+
+    assert [str(issue) for issue in config_issues(config)] == [
+        "$.notifiers.team.channel: Notifier 'team' has unknown option 'channel'",
+        "$.notifiers.team: Notifier 'team' missing 'url'",
+        "$.notifiers.pager.type: Notifier 'pager' has invalid type 'sms'",
+        "$.routes.a: Route for 'a' must list configured notifiers",
+        "$.routes.b: Route for unknown group 'b'",
+    ]
@@ -0,0 +1,120 @@
+"""Tests for watch module."""
+
+import json
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from stotify.indicators import StateStore
+from stotify.market_hours import ET
+from stotify.strategies import state_key
+from stotify.watch import ConfigWatcher, prune_state, watch
+
+
+def make_alert(ticker, high=250):
+    return {
+        "ticker": ticker,
+        "strategy": "threshold",
+        "timeframe": "15m",
+        "params": {"high": high},
+    }
+
+
+def write(path, groups, stamp):
+    path.write_text(json.dumps({"groups": groups}))
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_reload_validates_only_changed_alerts(tmp_path):
+    path = tmp_path / "alerts.json"
+    tickers = [f"T{index}" for index in range(50)]
+    write(
+        path,
+        {"big": [make_alert(t) for t in tickers], "small": [make_alert("AAPL")]},
+        1,
+    )
+    watcher = ConfigWatcher(path)
+
+    with patch("stotify.watch.alert_issues", return_value=[]) as validate:
+        first = watcher.poll()
+        assert validate.call_count == 51
+        assert watcher.poll() is None
+
+        small = watcher.config["groups"]["small"]
+        edited = [make_alert(t) for t in tickers]
+        edited[7] = make_alert("T7", high=300)
+        write(path, {"big": edited, "small": [make_alert("AAPL")]}, 2)
+        validate.reset_mock()
+        diff = watcher.poll()
+
+    assert first.added == 51
+    assert validate.call_count == 1
+    assert (diff.added, diff.removed, diff.unchanged) == (1, 1, 50)
+    assert diff.groups == ("big",)
+    assert watcher.config["groups"]["small"] is small
+
+
+def test_invalid_reload_keeps_previous_config(tmp_path):
+    path = tmp_path / "alerts.json"
+    write(path, {"portfolio": [make_alert("AAPL")]}, 1)
+    watcher = ConfigWatcher(path)
+    watcher.poll()
+    good = watcher.config
+
+    broken = make_alert("AAPL")
+    broken["timeframe"] = "soon"
+    write(path, {"portfolio": [broken]}, 2)
+    with pytest.raises(ValueError, match="invalid timeframe"):
+        watcher.poll()
+
+    assert watcher.config is good
+    assert watcher.poll() is None
+
+
+def test_prune_state_drops_removed_alerts(tmp_path, monkeypatch):
+    monkeypatch.setenv("STOTIFY_STATE_PATH", str(tmp_path / "state.json"))
+    store = StateStore(tmp_path / "state.json")
+    kept = state_key("rsi", "AAPL", "1d", {"window": 14})
+    dropped = state_key("rsi", "MSFT", "1d", {"window": 14})
+    store.set(kept, {})
+    store.set(dropped, {})
+    store.save()
+    config = {
+        "groups": {
+            "g": [
+                {
+                    "ticker": "AAPL",
+                    "strategy": "rsi",
+                    "timeframe": "1d",
+                    "params": {"window": 14},
+                }
+            ]
+        }
+    }
+
+    with patch("stotify.watch.get_state_store", return_value=store):
+        assert prune_state(config) == 1
+
+    assert store.get(kept) == {} and store.get(dropped) is None
+
+
+def test_watch_runs_once_per_slot_and_picks_up_edits(tmp_path):
+    path = tmp_path / "alerts.json"
+    write(path, {"portfolio": [make_alert("AAPL")]}, 1)
+    start = ET.localize(datetime(2024, 1, 10, 10, 0))
+    times = iter(start + timedelta(minutes=5 * step) for step in range(10))
+    seen = []
+
+    def fake_check(config, **kwargs):
+        seen.append((kwargs["now"].minute, list(config["groups"])))
+        return 0
+
+    def edit(_seconds):
+        write(path, {"watchlist": [make_alert("MSFT")]}, 2)
+
+    with patch("stotify.watch.check_alerts", side_effect=fake_check):
+        watch(path, cadence="15m", runs=2, clock=lambda: next(times), sleep=edit)
+
+    assert seen == [(0, ["portfolio"]), (15, ["watchlist"])]